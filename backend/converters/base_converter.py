@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Collection
 import os
 import logging
 
@@ -40,7 +40,7 @@ class BaseConverter(ABC):
         """
         pass
     
-    def _is_valid_input(self, input_path: str, expected_extensions: List[str]) -> bool:
+    def _is_valid_input(self, input_path: str, expected_extensions: Collection[str]) -> bool:
         """
         验证输入文件是否有效
         
@@ -60,25 +60,21 @@ class BaseConverter(ABC):
             
         return os.path.isdir(input_path)
     
-    def _get_files_by_extension(self, directory: str, extensions: List[str]) -> List[str]:
+    def _get_files_by_extension(self, directory: str, extensions: Collection[str]) -> List[str]:
         """
         获取目录下指定扩展名的所有文件
         
         Args:
             directory: 目录路径
-            extensions: 文件扩展名列表
+            extensions: 文件扩展名集合（建议传 frozenset，成员判断为 O(1)）
             
         Returns:
             List[str]: 匹配的文件路径列表
         """
-        files = []
-        for filename in os.listdir(directory):
-            filepath = os.path.join(directory, filename)
-            if os.path.isfile(filepath):
-                _, ext = os.path.splitext(filename.lower())
-                if ext in extensions:
-                    files.append(filepath)
-        return files
+        # scandir 复用目录项自带的类型信息，无需对每个文件再 stat 一次
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name.lower())[1] in extensions]
     
     def _generate_output_path(self, input_file: str, new_extension: str) -> str:
         """
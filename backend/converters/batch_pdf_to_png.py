@@ -2,13 +2,48 @@ import os
 import sys
 import argparse
 from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor
 try:
     from pdf2image import convert_from_path
 except ImportError:
     print("Error: pdf2image library is not installed. Please install it using 'pip install pdf2image'.")
     sys.exit(1)
 
-def batch_convert(directory, poppler_path=None):
+def _convert_one(pdf_file, poppler_path=None):
+    """Convert the first page of one PDF; returns (success, log lines)."""
+    lines = [f"Converting {pdf_file.name}..."]
+    try:
+        # Convert first page only (assuming single page figures)
+        images = convert_from_path(str(pdf_file), first_page=1, last_page=1, poppler_path=poppler_path)
+        
+        if images:
+            output_file = pdf_file.with_suffix('.png')
+            images[0].save(output_file, 'PNG')
+            lines.append(f"  -> Saved to {output_file.name}")
+            
+            # Delete original PDF if successful
+            try:
+                pdf_file.unlink()
+                lines.append(f"  -> Deleted original PDF: {pdf_file.name}")
+            except Exception as del_e:
+                lines.append(f"  -> Warning: Failed to delete PDF {pdf_file.name}: {del_e}")
+            return True, lines
+        
+        lines.append(f"  -> Warning: No images extracted from {pdf_file.name}")
+    except Exception as e:
+        lines.append(f"  -> Failed: {e}")
+    return False, lines
+
+def _submit(executor, pdf_file, poppler_path):
+    """Submit one file; a pool that is already broken yields a failed future instead of raising."""
+    try:
+        return executor.submit(_convert_one, pdf_file, poppler_path)
+    except Exception as e:
+        future = Future()
+        future.set_exception(e)
+        return future
+
+def batch_convert(directory, poppler_path=None, workers=None):
     directory = Path(directory)
     if not directory.exists() or not directory.is_dir():
         print(f"Error: Invalid directory '{directory}'")
@@ -24,32 +59,30 @@ def batch_convert(directory, poppler_path=None):
     success_count = 0
     fail_count = 0
 
-    for pdf_file in pdf_files:
-        try:
-            print(f"Converting {pdf_file.name}...")
-            # Convert first page only (assuming single page figures)
-            images = convert_from_path(str(pdf_file), first_page=1, last_page=1, poppler_path=poppler_path)
-            
-            if images:
-                output_file = pdf_file.with_suffix('.png')
-                images[0].save(output_file, 'PNG')
-                print(f"  -> Saved to {output_file.name}")
-                success_count += 1
-                
-                # Delete original PDF if successful
+    # Rasterising and PNG-encoding are CPU-bound, so spread files over worker
+    # processes; logs are printed by the parent in input order
+    workers = min(workers or os.cpu_count() or 1, len(pdf_files))
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        futures = [_submit(executor, pdf_file, poppler_path) for pdf_file in pdf_files] if executor else None
+        for index, pdf_file in enumerate(pdf_files):
+            if futures is None:
+                ok, lines = _convert_one(pdf_file, poppler_path)
+            else:
+                # A crashed worker (BrokenProcessPool) counts as a failure like any
+                # other error, so the rest of the batch and the summary still run
                 try:
-                    pdf_file.unlink()
-                    print(f"  -> Deleted original PDF: {pdf_file.name}")
-                except Exception as del_e:
-                    print(f"  -> Warning: Failed to delete PDF {pdf_file.name}: {del_e}")
-                    
+                    ok, lines = futures[index].result()
+                except Exception as e:
+                    ok, lines = False, [f"Converting {pdf_file.name}...", f"  -> Failed: {e}"]
+            print("\n".join(lines))
+            if ok:
+                success_count += 1
             else:
-                print(f"  -> Warning: No images extracted from {pdf_file.name}")
                 fail_count += 1
-                
-        except Exception as e:
-            print(f"  -> Failed: {e}")
-            fail_count += 1
+    finally:
+        if executor:
+            executor.shutdown()
 
     print(f"\nConversion Complete.")
     print(f"Success: {success_count}")
@@ -71,10 +104,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Batch convert single-page PDFs to PNG images.")
     parser.add_argument("directory", help="Directory containing PDF files")
     parser.add_argument("--poppler-path", help="Path to poppler bin folder (optional)", default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
     
     args = parser.parse_args()
     
     # Try to detect poppler path from env var if not provided
     poppler_path = args.poppler_path or os.environ.get('POPPLER_PATH')
     
-    batch_convert(args.directory, poppler_path)
+    batch_convert(args.directory, poppler_path, args.workers)
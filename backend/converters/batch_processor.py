@@ -3,10 +3,10 @@ import gc
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Callable, Optional, Tuple
+from typing import List, Dict, Any, Callable, NamedTuple, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait as wait_futures
 from concurrent.futures._base import CANCELLED
 import psutil
 import threading
@@ -42,8 +42,8 @@ class FileTask:
         return None
 
 
-@dataclass
-class ProgressInfo:
+class ProgressInfo(NamedTuple):
+    """进度快照：每处理完一个文件生成一个且创建后不再修改，用 NamedTuple 省去实例 __dict__"""
     current_file: str
     file_index: int
     total_files: int
@@ -76,7 +76,8 @@ class ProgressCallback:
     def report(self, info: ProgressInfo):
         with self._lock:
             if self._cancelled:
-                info.is_cancelled = True
+                # ProgressInfo 不可修改，生成一个带取消标记的副本
+                info = info._replace(is_cancelled=True)
         self.callback_fn(info)
 
     def cancel(self):
@@ -89,17 +90,26 @@ class ProgressCallback:
 
 
 class MemoryMonitor:
-    def __init__(self, threshold_percent: float = 70.0):
+    def __init__(self, threshold_percent: float = 70.0, sample_interval: int = 16):
         self.threshold_percent = threshold_percent
+        self.sample_interval = max(1, sample_interval)
         self.process = psutil.Process(os.getpid())
         self.peak_memory = 0
         self._high_memory_count = 0
         self._lock = threading.Lock()
+        self._calls = 0
+        self._last_memory_mb = 0.0
 
-    def get_current_memory_mb(self) -> float:
+    def get_current_memory_mb(self, force: bool = False) -> float:
+        # 每 sample_interval 次调用才真正读取一次 RSS，其余返回上次采样值
+        with self._lock:
+            self._calls += 1
+            if not force and (self._calls - 1) % self.sample_interval:
+                return self._last_memory_mb
         memory_info = self.process.memory_info()
         current_mb = memory_info.rss / (1024 * 1024)
         with self._lock:
+            self._last_memory_mb = current_mb
             if current_mb > self.peak_memory:
                 self.peak_memory = current_mb
         return current_mb
@@ -126,7 +136,7 @@ class MemoryMonitor:
 
     def get_stats(self) -> Dict[str, float]:
         return {
-            'current_memory_mb': self.get_current_memory_mb(),
+            'current_memory_mb': self.get_current_memory_mb(force=True),
             'peak_memory_mb': self.peak_memory,
             'memory_percent': self.get_memory_percent(),
             'threshold_percent': self.threshold_percent
@@ -150,7 +160,8 @@ class BatchProcessor:
         enable_parallel: bool = True,
         memory_threshold: float = 70.0,
         max_retries: int = 2,
-        page_flush_interval: int = 50
+        page_flush_interval: int = 50,
+        gc_interval: int = 16
     ):
         if max_workers is None:
             max_workers = max(1, os.cpu_count() // 2)
@@ -160,12 +171,28 @@ class BatchProcessor:
         self.memory_threshold = memory_threshold
         self.max_retries = max_retries
         self.page_flush_interval = page_flush_interval
+        self.gc_interval = max(1, gc_interval)
         
         self.memory_monitor = MemoryMonitor(threshold_percent=memory_threshold)
         self.logger = logging.getLogger(self.__class__.__name__)
-        self._current_tasks: Dict[str, FileTask] = {}
         self._lock = threading.Lock()
         self._cancelled = False
+        # 线程池在多次 process_files 之间复用，首次并行处理时创建，由 shutdown() 释放
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='batch-worker'
+                )
+            return self._executor
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
 
     def process_files(
         self,
@@ -187,7 +214,6 @@ class BatchProcessor:
         os.makedirs(output_dir, exist_ok=True)
         
         tasks = self._prepare_tasks(files, extensions)
-        total_duration = time.time()
         start_time = time.time()
 
         for task in tasks:
@@ -262,57 +288,58 @@ class BatchProcessor:
         completed = 0
         total = len(tasks)
         start_time = time.time()
-        tasks_lock = threading.Lock()
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_task = {}
-            
-            for task in tasks:
-                output_path = self._generate_output_path(task.file_path, output_dir)
-                future = executor.submit(
-                    self._convert_single_file,
-                    task, converter, output_path, tasks_lock
-                )
-                future_to_task[future] = task
+        # 计数器只在本线程（消费 as_completed 的循环）中更新；工作线程只写各自任务的状态，
+        # 因此整个结果汇总过程无需加锁
+        executor = self._get_executor()
+        future_to_task = {}
 
+        for task in tasks:
+            output_path = self._generate_output_path(task.file_path, output_dir)
+            future = executor.submit(
+                self._convert_single_file,
+                task, converter, output_path
+            )
+            future_to_task[future] = task
+
+        try:
             for future in as_completed(future_to_task):
                 if self._cancelled:
-                    executor.shutdown(wait=False, cancel_futures=True)
                     break
 
                 task = future_to_task[future]
                 try:
                     success, error_msg = future.result()
                     
-                    with tasks_lock:
-                        if success:
-                            task.status = ProcessingStatus.COMPLETED
-                            success_count += 1
-                        elif task.status == ProcessingStatus.SKIPPED:
-                            skipped_count += 1
-                        else:
-                            task.status = ProcessingStatus.FAILED
-                            task.error_message = error_msg
-                            failed_count += 1
-                        
-                        completed += 1
-                        elapsed = time.time() - start_time
-                        avg_time = elapsed / completed if completed > 0 else 0
-                        remaining = avg_time * (total - completed)
-                        
-                        self._report_progress(
-                            progress_callback, task.file_path, completed, total,
-                            remaining, task.status == ProcessingStatus.COMPLETED
-                        )
-                        
-                        gc.collect()
-                        
-                except Exception as e:
-                    with tasks_lock:
+                    if success:
+                        task.status = ProcessingStatus.COMPLETED
+                        success_count += 1
+                    elif task.status == ProcessingStatus.SKIPPED:
+                        skipped_count += 1
+                    else:
                         task.status = ProcessingStatus.FAILED
-                        task.error_message = str(e)
+                        task.error_message = error_msg
                         failed_count += 1
-                        completed += 1
+                    
+                    completed += 1
+                    self._report_progress(
+                        progress_callback, task.file_path, completed, total,
+                        start_time, task.status == ProcessingStatus.COMPLETED
+                    )
+                    
+                    if completed % self.gc_interval == 0:
+                        gc.collect()
+                    
+                except Exception as e:
+                    task.status = ProcessingStatus.FAILED
+                    task.error_message = str(e)
+                    failed_count += 1
+                    completed += 1
+        finally:
+            # 线程池是共享的，不能关闭：只取消本批尚未开始的任务，并等待正在执行的任务结束
+            for future in future_to_task:
+                future.cancel()
+            wait_futures(future_to_task)
 
         return success_count, failed_count, skipped_count, tasks
 
@@ -347,16 +374,13 @@ class BatchProcessor:
                 task.error_message = error_msg
                 failed_count += 1
 
-            elapsed = time.time() - start_time
-            avg_time = elapsed / (idx + 1) if idx + 1 > 0 else 0
-            remaining = avg_time * (total - idx - 1)
-
             self._report_progress(
-                progress_callback, task.file_path, idx + 1, total, remaining,
+                progress_callback, task.file_path, idx + 1, total, start_time,
                 task.status == ProcessingStatus.COMPLETED
             )
 
-            gc.collect()
+            if (idx + 1) % self.gc_interval == 0:
+                gc.collect()
 
         return success_count, failed_count, skipped_count, tasks
 
@@ -364,24 +388,14 @@ class BatchProcessor:
         self,
         task: FileTask,
         converter: FileConverter,
-        output_path: str,
-        lock: Optional[threading.Lock] = None
+        output_path: str
     ) -> Tuple[bool, Optional[str]]:
         if self._cancelled:
-            if lock:
-                with lock:
-                    task.status = ProcessingStatus.CANCELLED
-            else:
-                task.status = ProcessingStatus.CANCELLED
+            task.status = ProcessingStatus.CANCELLED
             return False, "Cancelled"
 
         task.start_time = time.time()
-        
-        if lock:
-            with lock:
-                task.status = ProcessingStatus.PROCESSING
-        else:
-            task.status = ProcessingStatus.PROCESSING
+        task.status = ProcessingStatus.PROCESSING
 
         try:
             success, message = converter.convert(task.file_path, output_path)
@@ -411,10 +425,13 @@ class BatchProcessor:
         current_file: str,
         completed: int,
         total: int,
-        remaining_time: float,
+        start_time: float,
         is_success: bool
     ):
+        # 没有进度回调时不计时、不估算剩余时间
         if progress_callback:
+            elapsed = time.time() - start_time
+            remaining_time = elapsed / completed * (total - completed) if completed > 0 else 0
             info = ProgressInfo(
                 current_file=current_file,
                 file_index=completed,
@@ -495,9 +512,10 @@ class StreamingFileHandler:
     @staticmethod
     def safe_delete(file_path: str) -> bool:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                return True
+            os.remove(file_path)
+            return True
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Failed to delete {file_path}: {e}")
         return False
@@ -1,5 +1,8 @@
 from typing import List, Optional, Dict, Any
 import os
+import atexit
+import hashlib
+import shlex
 import subprocess
 import tempfile
 import shutil
@@ -8,8 +11,141 @@ from pathlib import Path
 from dataclasses import dataclass, field
 import re
 import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from .base_converter import BaseConverter
+from .dep_check import find_command
+
+
+# 依赖检查结果跨实例缓存，避免每次构造转换器都启动 java 子进程、查找JAR
+# (配置的JAR路径, BATIK_JAR环境变量) -> (检查时间, BatikDependencyStatus)
+_DEPENDENCY_CACHE: Dict[tuple, tuple] = {}
+_DEPENDENCY_CACHE_TTL = 300  # 缓存有效期（秒）
+_DEPENDENCY_CACHE_LOCK = threading.Lock()
+
+# 原生渲染器命令 -> 查找结果（进程内只查找一次PATH）
+_WHICH_CACHE: Dict[str, Optional[str]] = {}
+
+
+def _which(command: str) -> Optional[str]:
+    """带进程级缓存的 shutil.which，未安装的渲染器只需查一次 PATH 文件名快照"""
+    if command not in _WHICH_CACHE:
+        _WHICH_CACHE[command] = find_command(command)
+    return _WHICH_CACHE[command]
+
+
+# Batik 不支持的 SVG 2.0 语法及其 SVG 1.1 等价写法，合并成一个正则一次扫描完成
+# 新的修复规则只需在此追加一个命名分组
+# 直接在原始字节上匹配，SVG无需解码再编码，也不受文件声明的字符编码影响
+_SVG2_FIXUP_RE = re.compile(
+    rb'(?P<orient>\borient=(?P<q>["\'])auto-start-reverse(?P=q))'
+)
+
+
+def _fix_svg2_syntax(match: re.Match) -> bytes:
+    if match.lastgroup == 'orient':
+        quote = match.group('q')
+        return b'orient=' + quote + b'auto' + quote
+    return match.group(0)
+
+
+# SVG内容摘要缓存：(绝对路径, mtime_ns, 大小) -> BLAKE2b 摘要
+# 同一文件以不同DPI/尺寸多次渲染时只读取、哈希一次；文件被修改后键随之变化
+_DIGEST_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_DIGEST_CACHE_SIZE = 256
+_DIGEST_CACHE_LOCK = threading.Lock()
+_DIGEST_CHUNK_SIZE = 256 * 1024
+
+
+def _svg_content_digest(path: str) -> Optional[bytes]:
+    """返回SVG文件内容的BLAKE2b摘要，读取失败时返回None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _DIGEST_CACHE_LOCK:
+        digest = _DIGEST_CACHE.get(key)
+        if digest is not None:
+            _DIGEST_CACHE.move_to_end(key)
+            return digest
+    # 分块读取并更新哈希，大SVG也只占用一个固定大小的缓冲区
+    hasher = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(min(_DIGEST_CHUNK_SIZE, st.st_size) or 1)
+    view = memoryview(buffer)
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+    except OSError:
+        return None
+    digest = hasher.digest()
+    with _DIGEST_CACHE_LOCK:
+        _DIGEST_CACHE[key] = digest
+        if len(_DIGEST_CACHE) > _DIGEST_CACHE_SIZE:
+            _DIGEST_CACHE.popitem(last=False)
+    return digest
+
+
+# 预处理后SVG的临时文件槽位：进程内复用固定的几个文件名，
+# 每次转换只覆盖写入，不再逐个创建、删除临时文件
+_TEMP_SVG_POOL_SIZE = 8
+_TEMP_SVG_POOL: deque = deque()
+_TEMP_SVG_POOL_LOCK = threading.Lock()
+_temp_svg_pool_dir: Optional[str] = None
+
+
+def _acquire_temp_svg() -> Optional[str]:
+    """
+    取出一个空闲的临时SVG槽位
+    
+    Returns:
+        Optional[str]: 槽位文件路径，槽位全部占用时返回None（调用方改用一次性临时文件）
+    """
+    global _temp_svg_pool_dir
+    with _TEMP_SVG_POOL_LOCK:
+        if _temp_svg_pool_dir is None:
+            _temp_svg_pool_dir = tempfile.mkdtemp(prefix='batik_svg_')
+            _TEMP_SVG_POOL.extend(
+                os.path.join(_temp_svg_pool_dir, f'slot_{i}.svg') for i in range(_TEMP_SVG_POOL_SIZE)
+            )
+            atexit.register(shutil.rmtree, _temp_svg_pool_dir, True)
+        return _TEMP_SVG_POOL.popleft() if _TEMP_SVG_POOL else None
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    把 src 放到 dst：同一文件系统上建立硬链接（不复制文件内容），否则回退为复制
+    
+    dst 已存在时先删除，避免原地覆盖写入与之共享inode的其他文件
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _release_temp_svg(path: str) -> bool:
+    """
+    归还临时SVG槽位
+    
+    Returns:
+        bool: path 是否为槽位文件（否则需要调用方自行删除）
+    """
+    if _temp_svg_pool_dir is None or os.path.dirname(path) != _temp_svg_pool_dir:
+        return False
+    with _TEMP_SVG_POOL_LOCK:
+        _TEMP_SVG_POOL.append(path)
+    return True
 
 
 @dataclass
@@ -22,6 +158,10 @@ class BatikConfig:
     batik_jar_path: Optional[str] = None
     java_options: List[str] = field(default_factory=list)
     timeout: int = 60  # 转换超时时间（秒）
+    renderer: str = 'auto'  # 'auto' 优先使用已安装的原生渲染器（resvg、rsvg-convert），'batik' 始终使用Batik
+    jvm_profile: str = 'auto'  # 未指定java_options时追加短命JVM调优参数：'auto' 或 'none'
+    max_workers: Optional[int] = None  # 目录批量转换的并发数，默认 min(文件数, CPU 核数)
+    cache_dir: Optional[str] = None  # PNG结果缓存目录，默认为输出目录下的 .svgcache；空字符串表示禁用
 
 
 @dataclass
@@ -45,18 +185,40 @@ class BatikConverter(BaseConverter):
     """
     
     # 支持的文件扩展名
-    SUPPORTED_EXTENSIONS = ['.svg']
+    SUPPORTED_EXTENSIONS = frozenset({'.svg'})
     
     # Batik JAR文件名
     BATIK_ALL_JAR_NAME = 'batik-all.jar'
     BATIK_LIB_DIR_NAME = 'batik-lib'
     
+    # 原生SVG渲染器（按速度排列），无需启动JVM
+    NATIVE_RENDERERS = ('resvg', 'rsvg-convert')
+    
     # 默认配置
     DEFAULT_CONFIG = {
         'dpi': 300,
         'quality': 1.0,
         'timeout': 60
     }
+    
+    # 常见错误模式：一条预编译的交替正则，命中的分组名即错误类型
+    _ERROR_MESSAGES = {
+        'classnotfound': '找不到必要的类，请检查jar包依赖',
+        'oom': '内存不足，请增加Java堆内存',
+        'filenotfound': '文件未找到',
+        'accessdenied': '文件访问权限不足',
+        'svg': 'SVG文件格式错误或不支持',
+        'transcoder': 'SVG转换过程中发生错误',
+    }
+    _ERROR_RE = re.compile(
+        r'(?P<classnotfound>ClassNotFoundException)'
+        r'|(?P<oom>OutOfMemoryError)'
+        r'|(?P<filenotfound>FileNotFoundException)'
+        r'|(?P<accessdenied>AccessDeniedException)'
+        r'|(?P<svg>SVGException)'
+        r'|(?P<transcoder>TranscoderException)',
+        re.IGNORECASE
+    )
 
     def __init__(self, output_dir: str, **kwargs):
         super().__init__(output_dir, **kwargs)
@@ -64,7 +226,7 @@ class BatikConverter(BaseConverter):
         # 过滤BatikConfig支持的参数
         batik_config_keys = {
             'dpi', 'width', 'height', 'quality', 'batik_jar_path', 
-            'java_options', 'timeout'
+            'java_options', 'timeout', 'renderer', 'jvm_profile', 'max_workers', 'cache_dir'
         }
         
         # 合并默认配置，只包含BatikConfig支持的参数
@@ -75,13 +237,23 @@ class BatikConverter(BaseConverter):
         
         self.batik_config = BatikConfig(**config)
         
+        # 按SVG内容寻址的PNG缓存，跨运行保留，相同SVG不再重复启动JVM渲染
+        if self.batik_config.cache_dir is None:
+            self._cache_dir: Optional[str] = os.path.join(output_dir, '.svgcache')
+        else:
+            self._cache_dir = self.batik_config.cache_dir or None
+        self._cache_dir_ready = False
+        
         # 依赖状态缓存
         self._dependency_status: Optional[BatikDependencyStatus] = None
         self._jar_path_cache: Optional[str] = None
         self._lib_path_cache: Optional[str] = None
+        # 不含输入输出的Batik命令行，首次使用时构建
+        self._base_command: Optional[tuple] = None
         
         # 检查依赖
         self._check_dependencies()
+        self._native_renderer = self._find_native_renderer()
 
     def convert(self, input_path: str) -> List[str]:
         """
@@ -98,7 +270,7 @@ class BatikConverter(BaseConverter):
             raise ValueError(f"无效的输入文件或目录: {input_path}")
         
         # 检查依赖是否就绪
-        if not self._dependency_status or not self._dependency_status.is_ready:
+        if not self._renderer_ready():
             raise RuntimeError("Batik转换依赖未就绪，请检查Java环境和Batik JAR包")
         
         output_files = []
@@ -111,14 +283,10 @@ class BatikConverter(BaseConverter):
         else:
             # 目录批量转换
             svg_files = self._get_files_by_extension(input_path, self.SUPPORTED_EXTENSIONS)
-            for file_path in svg_files:
-                try:
-                    result = self._convert_single_file(file_path)
-                    if result:
-                        output_files.append(result)
-                except Exception as e:
-                    self.logger.error(f"转换文件 {file_path} 失败: {e}")
-                    continue
+            # 先用一个JVM批量渲染，剩下的（失败或无法批量的）再逐个并发处理
+            results = self._convert_files_batch(svg_files, input_path)
+            results.update(self._convert_files_parallel([f for f in svg_files if f not in results]))
+            output_files = [results[file_path] for file_path in svg_files if file_path in results]
         
         self.logger.info(f"Batik转换完成，共生成 {len(output_files)} 个文件")
         return output_files
@@ -137,7 +305,7 @@ class BatikConverter(BaseConverter):
         """
         try:
             # 检查依赖是否就绪
-            if not self._dependency_status or not self._dependency_status.is_ready:
+            if not self._renderer_ready():
                 return False, "Batik转换依赖未就绪，请检查Java环境和Batik JAR包"
             
             # 验证输入文件
@@ -149,30 +317,163 @@ class BatikConverter(BaseConverter):
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
             
-            # 预处理SVG文件，修复Batik不兼容的语法
-            processed_svg_path = self._preprocess_svg_for_batik(input_path)
+            cache_path = self._get_cache_path(input_path)
+            if cache_path and self._restore_from_cache(cache_path, output_path):
+                return True, f"转换成功（缓存）: {input_path} -> {output_path}"
             
-            try:
-                # 执行转换
-                success = self._execute_batik_command(processed_svg_path, output_path)
-                
-                if success:
-                    return True, f"转换成功: {input_path} -> {output_path}"
-                else:
-                    return False, f"转换失败: {input_path}"
-            finally:
-                # 清理临时文件
-                if processed_svg_path != input_path and os.path.exists(processed_svg_path):
-                    try:
-                        os.unlink(processed_svg_path)
-                    except:
-                        pass
+            # 执行转换
+            if self._render_svg(input_path, output_path):
+                if cache_path:
+                    self._store_in_cache(output_path, cache_path)
+                return True, f"转换成功: {input_path} -> {output_path}"
+            else:
+                return False, f"转换失败: {input_path}"
                 
         except Exception as e:
             error_msg = f"转换过程中发生错误: {str(e)}"
             self.logger.error(error_msg)
             return False, error_msg
 
+    def _convert_files_batch(self, svg_files: List[str], source_directory: str) -> Dict[str, str]:
+        """
+        在一个Batik JVM中批量渲染多个SVG文件
+        
+        Batik的 -d 指定为目录时，每个输入都输出为 目录/<文件名>.png，
+        与 _generate_output_path 的命名一致，因此N个文件只需一次JVM启动。
+        已安装原生渲染器时每个文件的启动开销很小，不走批量
+        
+        Args:
+            svg_files: SVG文件路径列表
+            source_directory: SVG文件所在目录（作为Batik的工作目录，保证相对引用可解析）
+            
+        Returns:
+            Dict[str, str]: 输入文件路径 -> 成功生成的输出文件路径
+        """
+        results: Dict[str, str] = {}
+        if self._native_renderer or not self._dependency_status or not self._dependency_status.is_ready:
+            return results
+        
+        # 先用缓存，剩下的才需要渲染；同名（仅扩展名大小写不同）的文件留给逐个转换
+        pending: Dict[str, tuple] = {}
+        stems = set()
+        for file_path in svg_files:
+            output_file = self._generate_output_path(file_path, '.png')
+            cache_path = self._get_cache_path(file_path)
+            if cache_path and self._restore_from_cache(cache_path, output_file):
+                results[file_path] = output_file
+                continue
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            if stem in stems:
+                continue
+            stems.add(stem)
+            pending[file_path] = (output_file, cache_path)
+        
+        if len(pending) < 2:
+            return results
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        fixed_dir = None
+        try:
+            inputs = []
+            for file_path, (output_file, _) in pending.items():
+                # 输出可能是缓存文件的硬链接，先删除；同时避免把旧文件误判为本次输出
+                try:
+                    os.unlink(output_file)
+                except FileNotFoundError:
+                    pass
+                try:
+                    svg_content = self._fix_svg_content(file_path)
+                except Exception as e:
+                    self.logger.warning(f"SVG预处理失败，使用原文件: {e}")
+                    svg_content = None
+                if svg_content is None:
+                    inputs.append(file_path)
+                    continue
+                # 修复后的内容以原文件名写入临时目录，输出文件名保持不变
+                if fixed_dir is None:
+                    fixed_dir = tempfile.mkdtemp(prefix='batik_batch_')
+                fixed_path = os.path.join(fixed_dir, os.path.basename(file_path))
+                with open(fixed_path, 'wb') as f:
+                    f.write(svg_content)
+                inputs.append(fixed_path)
+            
+            command = self._build_batik_base_command() + ['-d', self.output_dir] + inputs
+            self.logger.info(f"Batik批量转换 {len(inputs)} 个SVG文件")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"执行Batik命令: {shlex.join(command)}")
+            try:
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.batik_config.timeout * len(inputs),
+                    cwd=source_directory
+                )
+                if result.returncode != 0:
+                    # 部分文件失败时Batik仍会渲染其余文件，按输出文件逐个判断
+                    self.logger.warning(f"Batik批量转换存在失败: {self._parse_batik_error(result.stderr or result.stdout)}")
+            except subprocess.TimeoutExpired:
+                # 被中断时最后一个文件可能只写了一半，无法区分完整与否：
+                # 删除本批所有输出且不写缓存，全部交给逐个转换
+                self.logger.warning("Batik批量转换超时，本批文件将逐个重试")
+                for output_file, _ in pending.values():
+                    try:
+                        os.unlink(output_file)
+                    except FileNotFoundError:
+                        pass
+                return results
+            except OSError as e:
+                self.logger.warning(f"Batik批量转换失败: {e}")
+                return results
+        finally:
+            if fixed_dir:
+                shutil.rmtree(fixed_dir, ignore_errors=True)
+        
+        for file_path, (output_file, cache_path) in pending.items():
+            try:
+                if os.path.getsize(output_file) == 0:
+                    continue
+            except OSError:
+                continue
+            if cache_path:
+                self._store_in_cache(output_file, cache_path)
+            self.logger.info(f"Batik转换成功: {output_file}")
+            results[file_path] = output_file
+        
+        return results
+    
+    def _convert_files_parallel(self, svg_files: List[str]) -> Dict[str, str]:
+        """
+        并发转换多个SVG文件
+        
+        每个文件都由独立的java子进程渲染，线程在等待子进程时会释放GIL，
+        因此使用线程池即可让多个JVM同时运行
+        
+        Args:
+            svg_files: SVG文件路径列表
+            
+        Returns:
+            Dict[str, str]: 输入文件路径 -> 成功生成的输出文件路径
+        """
+        if not svg_files:
+            return {}
+        
+        max_workers = self.batik_config.max_workers or (os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, len(svg_files)))
+        
+        def convert(file_path: str) -> Optional[str]:
+            try:
+                return self._convert_single_file(file_path)
+            except Exception as e:
+                self.logger.error(f"转换文件 {file_path} 失败: {e}")
+                return None
+        
+        # executor.map 按输入顺序返回结果，无需维护 future -> 文件 的映射表
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(convert, svg_files))
+        
+        return {file_path: output for file_path, output in zip(svg_files, outputs) if output}
+    
     def _convert_single_file(self, file_path: str) -> Optional[str]:
         """
         转换单个SVG文件
@@ -189,40 +490,224 @@ class BatikConverter(BaseConverter):
             
             self.logger.info(f"开始转换SVG文件: {input_file} -> {output_file}")
             
-            # 预处理SVG文件
-            processed_svg_path = self._preprocess_svg_for_batik(str(input_file))
+            cache_path = self._get_cache_path(file_path)
+            if cache_path and self._restore_from_cache(cache_path, str(output_file)):
+                self.logger.info(f"Batik转换成功（缓存）: {output_file}")
+                return str(output_file)
             
-            try:
-                # 执行转换
-                success = self._execute_batik_command(processed_svg_path, str(output_file))
-                
-                if success and output_file.exists():
-                    self.logger.info(f"Batik转换成功: {output_file}")
-                    return str(output_file)
-                else:
-                    self.logger.error(f"Batik转换失败: {input_file}")
-                    return None
-            finally:
-                # 清理临时文件
-                if processed_svg_path != str(input_file) and os.path.exists(processed_svg_path):
-                    try:
-                        os.unlink(processed_svg_path)
-                    except:
-                        pass
+            # 执行转换
+            success = self._render_svg(file_path, str(output_file))
+            
+            if success and output_file.exists():
+                if cache_path:
+                    self._store_in_cache(str(output_file), cache_path)
+                self.logger.info(f"Batik转换成功: {output_file}")
+                return str(output_file)
+            else:
+                self.logger.error(f"Batik转换失败: {input_file}")
+                return None
                 
         except Exception as e:
             self._handle_conversion_error(e, file_path)
             return None
 
-    def _check_dependencies(self) -> BatikDependencyStatus:
+    def _renderer_ready(self) -> bool:
+        """是否有可用的渲染器（原生渲染器或完整的Batik环境）"""
+        if self._native_renderer:
+            return True
+        return bool(self._dependency_status and self._dependency_status.is_ready)
+    
+    def _find_native_renderer(self) -> Optional[str]:
+        """
+        查找可用的原生SVG渲染器
+        
+        Returns:
+            Optional[str]: 渲染器命令名，renderer 不为 'auto' 或均未安装时返回None
+        """
+        if self.batik_config.renderer != 'auto':
+            return None
+        for renderer in self.NATIVE_RENDERERS:
+            if _which(renderer):
+                self.logger.info(f"检测到原生SVG渲染器: {renderer}")
+                return renderer
+        return None
+    
+    def _render_svg(self, input_path: str, output_path: str) -> bool:
+        """
+        渲染单个SVG为PNG：优先使用原生渲染器，失败或不可用时回退到Batik
+        
+        Args:
+            input_path: SVG文件路径
+            output_path: 输出PNG文件路径
+            
+        Returns:
+            bool: 是否成功
+        """
+        # 输出路径可能是缓存文件的硬链接，先删除再写入，避免改写缓存内容
+        try:
+            os.unlink(output_path)
+        except FileNotFoundError:
+            pass
+        
+        if self._native_renderer and self._execute_native_command(input_path, output_path):
+            return True
+        
+        if not self._dependency_status or not self._dependency_status.is_ready:
+            return False
+        
+        # 预处理SVG文件，修复Batik不兼容的语法
+        processed_svg_path = self._preprocess_svg_for_batik(input_path)
+        try:
+            return self._execute_batik_command(processed_svg_path, output_path)
+        finally:
+            # 归还临时槽位；一次性临时文件直接删除
+            if processed_svg_path != input_path and not _release_temp_svg(processed_svg_path):
+                try:
+                    os.unlink(processed_svg_path)
+                except OSError:
+                    pass
+    
+    def _execute_native_command(self, input_file: str, output_file: str) -> bool:
+        """
+        使用原生渲染器（resvg / rsvg-convert）转换SVG
+        
+        Args:
+            input_file: 输入SVG文件路径
+            output_file: 输出PNG文件路径
+            
+        Returns:
+            bool: 转换是否成功
+        """
+        config = self.batik_config
+        if self._native_renderer == 'resvg':
+            command = ['resvg', '--dpi', str(config.dpi)]
+            if config.width:
+                command.extend(['-w', str(config.width)])
+            if config.height:
+                command.extend(['-h', str(config.height)])
+            command.extend([input_file, output_file])
+        else:
+            command = ['rsvg-convert', '-f', 'png', '-d', str(config.dpi), '-p', str(config.dpi)]
+            if config.width:
+                command.extend(['-w', str(config.width)])
+            if config.height:
+                command.extend(['-h', str(config.height)])
+            command.extend(['-o', output_file, input_file])
+        
+        try:
+            result = subprocess.run(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=config.timeout
+            )
+        except Exception as e:
+            self.logger.warning(f"{self._native_renderer} 转换失败，改用Batik: {e}")
+            return False
+        
+        if result.returncode != 0 or not os.path.isfile(output_file):
+            error_output = result.stderr.decode('utf-8', errors='replace').strip()
+            self.logger.warning(f"{self._native_renderer} 转换失败，改用Batik: {error_output}")
+            return False
+        return True
+    
+    def get_content_digest(self, svg_path: str) -> Optional[bytes]:
+        """
+        获取SVG文件内容的摘要（16字节原始摘要，可直接用作字典键；日志中用 .hex() 显示）
+        
+        摘要按 (路径, 修改时间, 大小) 在进程内缓存，与PNG缓存键共用，
+        调用方用它做去重时不会让同一文件被重复读取和哈希
+        
+        Args:
+            svg_path: SVG文件路径
+            
+        Returns:
+            Optional[bytes]: 内容摘要，读取失败时返回None
+        """
+        return _svg_content_digest(svg_path)
+    
+    def _get_cache_path(self, input_path: str) -> Optional[str]:
+        """
+        计算SVG对应的缓存PNG路径
+        
+        缓存键为SVG原始内容、渲染参数与首选渲染器的BLAKE2b哈希，预处理是确定性的，无需参与计算
+        
+        Args:
+            input_path: SVG文件路径
+            
+        Returns:
+            Optional[str]: 缓存文件路径，缓存禁用或读取失败时返回None
+        """
+        if not self._cache_dir:
+            return None
+        
+        content_digest = _svg_content_digest(input_path)
+        if content_digest is None:
+            return None
+        
+        config = self.batik_config
+        digest = hashlib.blake2b(content_digest, digest_size=16)
+        digest.update(repr((config.dpi, config.width, config.height, config.quality,
+                            self._native_renderer)).encode('ascii'))
+        return os.path.join(self._cache_dir, f"{digest.hexdigest()}.png")
+    
+    def _restore_from_cache(self, cache_path: str, output_path: str) -> bool:
+        """命中缓存时把缓存的PNG放到输出路径；不预先stat，缓存文件不存在时按未命中处理"""
+        try:
+            _link_or_copy(cache_path, output_path)
+        except OSError:
+            return False
+        self.logger.debug("SVG缓存命中: %s", cache_path)
+        return True
+    
+    def _store_in_cache(self, output_path: str, cache_path: str) -> None:
+        """把新生成的PNG写入缓存（先写临时文件再原子替换，避免并发时读到半个文件）"""
+        # 临时名按进程和线程区分，不会与其他写入者冲突，无需 mkstemp 先创建再删除
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not self._cache_dir_ready:
+                os.makedirs(self._cache_dir, exist_ok=True)
+                self._cache_dir_ready = True
+            try:
+                try:
+                    os.link(output_path, temp_path)
+                except OSError:
+                    shutil.copyfile(output_path, temp_path)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            self.logger.debug("写入SVG缓存失败: %s", e)
+    
+    def _check_dependencies(self, force_refresh: bool = False) -> BatikDependencyStatus:
         """
         检查Batik转换依赖
         
+        检查结果按JAR配置在进程内缓存（有效期 _DEPENDENCY_CACHE_TTL 秒），
+        同一进程内新建的转换器直接复用，不再重复启动子进程
+        
+        Args:
+            force_refresh: 忽略实例和进程级缓存，重新检查
+            
         Returns:
             BatikDependencyStatus: 依赖检查结果
         """
-        if self._dependency_status is not None:
+        if self._dependency_status is not None and not force_refresh:
             return self._dependency_status
+        # classpath依赖于检查结果，重新检查后需要重建命令行
+        self._base_command = None
+        
+        cache_key = (self.batik_config.batik_jar_path, os.environ.get('BATIK_JAR'))
+        if not force_refresh:
+            with _DEPENDENCY_CACHE_LOCK:
+                cached = _DEPENDENCY_CACHE.get(cache_key)
+            if cached and time.monotonic() - cached[0] < _DEPENDENCY_CACHE_TTL:
+                self._dependency_status = cached[1]
+                return self._dependency_status
         
         self.logger.info("检查Batik转换依赖...")
         
@@ -240,6 +725,9 @@ class BatikConverter(BaseConverter):
             batik_lib_path=batik_lib_path
         )
         
+        with _DEPENDENCY_CACHE_LOCK:
+            _DEPENDENCY_CACHE[cache_key] = (time.monotonic(), self._dependency_status)
+        
         # 记录依赖状态
         self._log_dependency_status(self._dependency_status)
         
@@ -364,16 +852,15 @@ class BatikConverter(BaseConverter):
             # 构建命令
             command = self._build_batik_command(input_file, output_file)
             
-            self.logger.debug(f"执行Batik命令: {' '.join(command)}")
+            self.logger.debug(f"执行Batik命令: {shlex.join(command)}")
             
-            # 执行命令
+            # 执行命令（列表形式直接传参，不经过shell，既省去一次shell进程启动，路径也无需转义）
             result = subprocess.run(
                 command,
                 capture_output=True,
                 text=True,
                 timeout=self.batik_config.timeout,
-                cwd=os.path.dirname(os.path.abspath(input_file)),
-                shell=True  # 在Windows上需要shell=True
+                cwd=os.path.dirname(os.path.abspath(input_file))
             )
             
             # 详细记录输出信息
@@ -384,72 +871,36 @@ class BatikConverter(BaseConverter):
                 self.logger.info(f"Batik错误输出: {result.stderr}")
             
             if result.returncode == 0:
-                # 检查输出文件是否实际生成
-                # Batik会在输出目录中生成与输入文件同名的PNG文件
-                input_filename = os.path.splitext(os.path.basename(input_file))[0] + '.png'
-                output_dir = os.path.dirname(output_file)
-                actual_output_file = os.path.join(output_dir, input_filename)
-                
-                # 如果输出目录不存在，创建它
-                if not os.path.exists(output_dir):
-                    os.makedirs(output_dir, exist_ok=True)
-                
-                # 检查输出文件是否生成
-                # Batik会在输出目录中生成与输入文件同名的PNG文件
-                input_basename = os.path.splitext(os.path.basename(input_file))[0]
-                expected_output_name = input_basename + '.png'
-                expected_output_path = os.path.join(output_dir, expected_output_name)
-                
-                self.logger.info(f"检查输出文件: {expected_output_path}")
-                
-                if os.path.exists(expected_output_path):
-                    file_size = os.path.getsize(expected_output_path)
-                    self.logger.info(f"找到输出文件: {expected_output_path}, 大小: {file_size} 字节")
-                    if file_size > 0:
-                        # 如果输出文件名与期望的不同，重命名它
-                        if expected_output_path != output_file:
-                            try:
-                                # 确保目标目录存在
-                                target_dir = os.path.dirname(output_file)
-                                if target_dir and not os.path.exists(target_dir):
-                                    os.makedirs(target_dir, exist_ok=True)
-                                
-                                # 移动文件到目标位置
-                                import shutil
-                                shutil.move(expected_output_path, output_file)
-                                self.logger.info(f"重命名输出文件: {expected_output_path} -> {output_file}")
-                            except Exception as e:
-                                self.logger.error(f"重命名文件失败: {e}")
-                                return False
-                        return True
-                    else:
-                        self.logger.error("输出文件为空")
-                        return False
-                elif os.path.exists(output_file):
+                # -d 指定的是输出文件，Batik直接写到目标位置；绝大多数情况一次stat即可确认
+                try:
                     file_size = os.path.getsize(output_file)
+                except OSError:
+                    file_size = None
+                if file_size is not None:
                     self.logger.info(f"输出文件: {output_file}, 大小: {file_size} 字节")
+                    if file_size == 0:
+                        self.logger.error("输出文件为空")
                     return file_size > 0
-                else:
-                    self.logger.error(f"输出文件未生成，期望: {expected_output_path} 或 {output_file}")
-                    # 列出输出目录的内容以便调试
-                    if os.path.exists(output_dir):
-                        files = os.listdir(output_dir)
-                        self.logger.error(f"输出目录内容: {files}")
-                        # 检查是否有任何PNG文件
-                        png_files = [f for f in files if f.endswith('.png')]
-                        if png_files:
-                            self.logger.info(f"发现PNG文件: {png_files}")
-                            # 尝试使用第一个PNG文件
-                            first_png = os.path.join(output_dir, png_files[0])
-                            if os.path.getsize(first_png) > 0:
-                                try:
-                                    import shutil
-                                    shutil.move(first_png, output_file)
-                                    self.logger.info(f"使用找到的PNG文件: {first_png} -> {output_file}")
-                                    return True
-                                except Exception as e:
-                                    self.logger.error(f"移动PNG文件失败: {e}")
-                    return False
+                
+                # 兼容旧版Batik：把 -d 当作目录，输出与输入文件同名的PNG
+                output_dir = os.path.dirname(output_file)
+                input_basename = os.path.splitext(os.path.basename(input_file))[0]
+                expected_output_path = os.path.join(output_dir, input_basename + '.png')
+                candidates = [expected_output_path]
+                if os.path.isdir(output_dir):
+                    files = os.listdir(output_dir)
+                    self.logger.error(f"输出文件未生成，期望: {output_file}，输出目录内容: {files}")
+                    candidates.extend(os.path.join(output_dir, f) for f in files if f.endswith('.png'))
+                for candidate in candidates:
+                    if os.path.isfile(candidate) and os.path.getsize(candidate) > 0:
+                        try:
+                            os.replace(candidate, output_file)
+                            self.logger.info(f"使用找到的PNG文件: {candidate} -> {output_file}")
+                            return True
+                        except OSError as e:
+                            self.logger.error(f"移动PNG文件失败: {e}")
+                            return False
+                return False
             else:
                 error_msg = self._parse_batik_error(result.stderr or result.stdout)
                 self.logger.error(f"Batik转换失败: {error_msg}")
@@ -469,6 +920,24 @@ class BatikConverter(BaseConverter):
         Returns:
             List[str]: 命令行参数列表
         """
+        return self._build_batik_base_command() + ['-d', output_file, input_file]
+
+    def _build_batik_base_command(self) -> List[str]:
+        """
+        构建不含输入输出的Batik命令行（JVM参数、classpath和渲染选项）
+        
+        配置和依赖路径在实例生命周期内不变，首次构建后缓存，
+        之后每次转换不再重复拼接参数、检查classpath中的JAR
+        
+        Returns:
+            List[str]: 命令行参数列表
+        """
+        if self._base_command is None:
+            self._base_command = tuple(self._assemble_batik_base_command())
+        return list(self._base_command)
+
+    def _assemble_batik_base_command(self) -> List[str]:
+        """拼接Batik基础命令行"""
         command = ['java']
         
         # 添加Java选项
@@ -477,6 +946,9 @@ class BatikConverter(BaseConverter):
         else:
             # 默认Java选项
             command.extend(['-Xmx1024m', '-Djava.awt.headless=true'])
+            if self.batik_config.jvm_profile != 'none':
+                # 每次转换都是一次性的短命JVM：只用C1编译器并使用串行GC以缩短预热
+                command.extend(['-XX:TieredStopAtLevel=1', '-XX:+UseSerialGC'])
         
         # 构建classpath，包含所有必要的jar包
         lib_path = self._dependency_status.batik_lib_path
@@ -493,10 +965,7 @@ class BatikConverter(BaseConverter):
         for jar_name in required_jars:
             jar_path = os.path.join(lib_path, jar_name)
             if os.path.isfile(jar_path):
-                if ' ' in jar_path:
-                    classpath_parts.append(f'"{jar_path}"')
-                else:
-                    classpath_parts.append(jar_path)
+                classpath_parts.append(jar_path)
         
         # 设置classpath
         classpath = os.pathsep.join(classpath_parts)
@@ -522,18 +991,6 @@ class BatikConverter(BaseConverter):
         if self.batik_config.quality != 1.0:
             command.extend(['-q', str(self.batik_config.quality)])
         
-        # 输出文件
-        if ' ' in output_file:
-            command.extend(['-d', f'"{output_file}"'])
-        else:
-            command.extend(['-d', output_file])
-        
-        # 输入文件
-        if ' ' in input_file:
-            command.append(f'"{input_file}"')
-        else:
-            command.append(input_file)
-        
         return command
 
     def _parse_batik_error(self, error_output: str) -> str:
@@ -549,19 +1006,9 @@ class BatikConverter(BaseConverter):
         if not error_output:
             return "未知错误"
         
-        # 常见错误模式
-        error_patterns = {
-            r'ClassNotFoundException': '找不到必要的类，请检查jar包依赖',
-            r'OutOfMemoryError': '内存不足，请增加Java堆内存',
-            r'FileNotFoundException': '文件未找到',
-            r'AccessDeniedException': '文件访问权限不足',
-            r'SVGException': 'SVG文件格式错误或不支持',
-            r'TranscoderException': 'SVG转换过程中发生错误',
-        }
-        
-        for pattern, friendly_msg in error_patterns.items():
-            if re.search(pattern, error_output, re.IGNORECASE):
-                return f"{friendly_msg}: {error_output.strip()}"
+        match = self._ERROR_RE.search(error_output)
+        if match:
+            return f"{self._ERROR_MESSAGES[match.lastgroup]}: {error_output.strip()}"
         
         return error_output.strip()
 
@@ -591,31 +1038,21 @@ class BatikConverter(BaseConverter):
             str: 处理后的SVG文件路径（可能是临时文件）
         """
         try:
-            # 读取SVG内容
-            with open(input_path, 'r', encoding='utf-8') as f:
-                svg_content = f.read()
-            
-            # 检查是否需要修复
-            needs_fix = False
-            original_content = svg_content
-            
-            # 修复 orient="auto-start-reverse" -> orient="auto"
-            if 'orient="auto-start-reverse"' in svg_content:
-                svg_content = svg_content.replace('orient="auto-start-reverse"', 'orient="auto"')
-                needs_fix = True
-                self.logger.info("修复了 orient='auto-start-reverse' 语法")
-            
-            # 修复其他可能的SVG 2.0不兼容语法
-            # 可以在这里添加更多的修复规则
+            svg_content = self._fix_svg_content(input_path)
             
             # 如果不需要修复，直接返回原文件路径
-            if not needs_fix:
+            if svg_content is None:
                 return input_path
             
-            # 创建临时文件保存修复后的SVG
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.svg', delete=False, encoding='utf-8') as f:
-                f.write(svg_content)
-                temp_path = f.name
+            # 写入空闲的临时槽位保存修复后的SVG，槽位用尽时才创建一次性临时文件
+            temp_path = _acquire_temp_svg()
+            if temp_path is None:
+                with tempfile.NamedTemporaryFile(mode='wb', suffix='.svg', delete=False) as f:
+                    f.write(svg_content)
+                    temp_path = f.name
+            else:
+                with open(temp_path, 'wb') as f:
+                    f.write(svg_content)
             
             self.logger.info(f"创建了预处理的临时SVG文件: {temp_path}")
             return temp_path
@@ -624,6 +1061,26 @@ class BatikConverter(BaseConverter):
             self.logger.warning(f"SVG预处理失败，使用原文件: {e}")
             return input_path
 
+    def _fix_svg_content(self, input_path: str) -> Optional[bytes]:
+        """
+        读取SVG并修复Batik不兼容的SVG 2.0语法
+        
+        Args:
+            input_path: 原始SVG文件路径
+            
+        Returns:
+            Optional[bytes]: 修复后的SVG内容，无需修复时返回None
+        """
+        with open(input_path, 'rb') as f:
+            svg_content = f.read()
+        
+        # 一次正则扫描完成全部SVG 2.0语法修复
+        svg_content, fix_count = _SVG2_FIXUP_RE.subn(_fix_svg2_syntax, svg_content)
+        if not fix_count:
+            return None
+        self.logger.info(f"修复了 {fix_count} 处Batik不兼容的SVG 2.0语法")
+        return svg_content
+
     def _log_dependency_status(self, status: BatikDependencyStatus) -> None:
         """记录依赖状态日志"""
         self.logger.info("=== Batik依赖检查结果 ===")
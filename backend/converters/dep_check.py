@@ -5,10 +5,11 @@
 """
 
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import shutil
 import logging
 import importlib
+import importlib.util
 import sys
 import os
 import subprocess
@@ -24,9 +25,12 @@ _LIB_CACHE: Dict[str, bool] = {}
 _LIB_ERROR_CACHE: Dict[str, str] = {}
 
 
-def lib_available(lib_name: str) -> bool:
-    """检查 Python 第三方库是否可导入。"""
-    return _check_lib(lib_name)[0]
+def lib_available(lib_name: str, quiet: bool = False) -> bool:
+    """
+    检查 Python 第三方库是否可导入。
+    quiet=True 用于可选的加速库：缺失是常态，失败只记 DEBUG 日志而不是 WARNING。
+    """
+    return _check_lib(lib_name, quiet)[0]
 
 
 def lib_error(lib_name: str) -> str:
@@ -37,7 +41,7 @@ def lib_error(lib_name: str) -> str:
     return _check_lib(lib_name)[1]
 
 
-def _check_lib(lib_name: str) -> Tuple[bool, str]:
+def _check_lib(lib_name: str, quiet: bool = False) -> Tuple[bool, str]:
     """
     检查 Python 第三方库是否可导入，并记录失败原因。
 
@@ -56,35 +60,107 @@ def _check_lib(lib_name: str) -> Tuple[bool, str]:
         import_name = lib_name.replace('-', '_')
 
     # 第一次尝试：直接导入（用户自己装的版本优先）
-    try:
-        importlib.import_module(import_name)
-        _LIB_CACHE[lib_name] = True
-        _LIB_ERROR_CACHE[lib_name] = ""
-        return True, ""
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {e}"
+    # 找不到模块时跳过导入，不必进入导入流程再捕获异常
+    if _spec_exists(import_name):
+        try:
+            importlib.import_module(import_name)
+            _LIB_CACHE[lib_name] = True
+            _LIB_ERROR_CACHE[lib_name] = ""
+            return True, ""
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {e}"
 
     # 第二次尝试：注入 vendor 路径后重试
     # 防止 cli.py 之外的入口忘记 init vendor，让 dep_check 自洽
     try:
         import vendor
         vendor.init_vendor_path()
+        if not _spec_exists(import_name):
+            raise ModuleNotFoundError(f"No module named '{import_name}'")
         importlib.import_module(import_name)
         _LIB_CACHE[lib_name] = True
         _LIB_ERROR_CACHE[lib_name] = ""
         return True, ""
     except Exception as e:
         error_msg = f"{type(e).__name__}: {e}"
-        logger.warning(f"依赖库加载失败: {lib_name} — {error_msg}")
+        if quiet:
+            logger.debug(f"可选依赖库不可用: {lib_name} — {error_msg}")
+        else:
+            logger.warning(f"依赖库加载失败: {lib_name} — {error_msg}")
         _LIB_CACHE[lib_name] = False
         _LIB_ERROR_CACHE[lib_name] = error_msg
     return False, error_msg
 
 
+def _spec_exists(import_name: str) -> bool:
+    """
+    只通过 find_spec 判断模块是否存在，不执行模块代码。
+    找到后仍需真正导入：DLL 加载失败、版本不兼容等问题只有导入时才会暴露。
+    """
+    if import_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 # ─────────────────────────────────────────
 # 外部命令可用性
 # ─────────────────────────────────────────
 
+# (PATH, 当前目录) -> PATH 各目录下的文件名集合；Windows 下为小写且包含当前目录
+_PATH_NAMES: Optional[Tuple[Tuple[str, str], frozenset]] = None
+
+
+def _path_names() -> frozenset:
+    """
+    一次列出 PATH 中所有目录的文件名。
+    PATH 或（Windows 下）当前目录变化时重新扫描。
+    """
+    global _PATH_NAMES
+    is_windows = sys.platform == "win32"
+    key = (os.environ.get("PATH", os.defpath), os.getcwd() if is_windows else "")
+    if _PATH_NAMES is not None and _PATH_NAMES[0] == key:
+        return _PATH_NAMES[1]
+
+    dirs = key[0].split(os.pathsep)
+    if is_windows:
+        # 与 shutil.which 一致：Windows 下先查当前目录
+        dirs.insert(0, os.curdir)
+    names = set()
+    for d in dirs:
+        if not d:
+            continue
+        try:
+            with os.scandir(d) as it:
+                names.update(entry.name for entry in it)
+        except OSError:
+            continue
+    if is_windows:
+        names = {name.lower() for name in names}
+    _PATH_NAMES = (key, frozenset(names))
+    return _PATH_NAMES[1]
+
+
+def find_command(cmd: str) -> Optional[str]:
+    """
+    与 shutil.which 结果相同，但先查 PATH 文件名快照：
+    命令不存在时无需逐个目录（Windows 下还要乘以 PATHEXT 扩展名）探测，
+    只有名字命中时才交给 shutil.which 确认可执行权限并返回路径。
+    """
+    if os.path.dirname(cmd):
+        return shutil.which(cmd)
+    names = _path_names()
+    if sys.platform == "win32":
+        lower = cmd.lower()
+        exts = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").lower().split(os.pathsep)
+        hit = lower in names or any(lower + ext in names for ext in exts if ext)
+    else:
+        hit = cmd in names
+    return shutil.which(cmd) if hit else None
+
+
 # cmd -> 实际可执行路径（PATH 命中时为 cmd 本身，常见路径命中时为绝对路径，都没找到时为 None）
 _CMD_PATH_CACHE: Dict[str, str] = {}
 # cmd -> 诊断信息（命令不可用时展示给用户）
@@ -132,7 +208,7 @@ def _check_command(cmd: str) -> Tuple[bool, str, str]:
         return bool(path), _CMD_INFO_CACHE.get(cmd, ""), path
 
     # 1. 先看 PATH
-    found_in_path = shutil.which(cmd)
+    found_in_path = find_command(cmd)
     if found_in_path:
         _CMD_PATH_CACHE[cmd] = cmd  # 用 cmd 本身即可，subprocess 会解析
         return True, "", cmd
@@ -312,9 +388,14 @@ def generator_ready(fmt: str) -> Tuple[bool, List[str], List[str]]:
     return (len(py_missing) == 0 and len(cmd_missing) == 0, py_missing, cmd_missing)
 
 
+# feature_snapshot 的结果（进程内只汇总一次，reset_cache / 安装新库后失效）
+_SNAPSHOT_CACHE: Optional[Dict[str, Dict]] = None
+
+
 def feature_snapshot() -> Dict[str, Dict]:
     """
     一次性返回所有功能的依赖状态，供前端展示。
+    结果在进程内缓存并共享，调用方不要修改返回的字典。
 
     Returns:
         {
@@ -323,6 +404,10 @@ def feature_snapshot() -> Dict[str, Dict]:
           ...
         }
     """
+    global _SNAPSHOT_CACHE
+    if _SNAPSHOT_CACHE is not None:
+        return _SNAPSHOT_CACHE
+
     snapshot: Dict[str, Dict] = {}
 
     # 入方向（Office -> MD）
@@ -354,11 +439,15 @@ def feature_snapshot() -> Dict[str, Dict]:
             "missing_cmds": cmd_miss,
         }
 
+    _SNAPSHOT_CACHE = snapshot
     return snapshot
 
 
 def reset_cache() -> None:
     """清空缓存，方便测试和热重载"""
+    global _SNAPSHOT_CACHE, _PATH_NAMES
+    _SNAPSHOT_CACHE = None
+    _PATH_NAMES = None
     _LIB_CACHE.clear()
     _LIB_ERROR_CACHE.clear()
     _CMD_PATH_CACHE.clear()
@@ -417,6 +506,8 @@ def try_install_lib(lib_name: str, timeout: int = 300) -> Tuple[bool, str]:
         return False, (result.stderr or result.stdout or "").strip()[-500:]
 
     # 安装后清缓存，让 _check_lib 能重新探测
+    global _SNAPSHOT_CACHE
+    _SNAPSHOT_CACHE = None
     _LIB_CACHE.pop(lib_name, None)
     _LIB_ERROR_CACHE.pop(lib_name, None)
 
@@ -1,12 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 import subprocess
-import tempfile
 import re
-import shutil
 from pathlib import Path
 
-from .dep_check import lib_available, command_available
+from .dep_check import lib_available, command_available, find_command
 from .base_converter import BaseConverter
 from .plantuml_converter import PlantUMLConverter
 from .batik_converter import BatikConverter
@@ -29,6 +27,11 @@ def _pil_available() -> bool:
     _resolve_pil()
     return _PIL_Image is not None
 
+
+# draw.io 可执行文件路径，进程内只查找一次
+_drawio_path: Optional[str] = None
+_drawio_resolved = False
+
 class DiagramToPngConverter(BaseConverter):
     """
     图表到 PNG 转换器
@@ -44,10 +47,14 @@ class DiagramToPngConverter(BaseConverter):
         super().__init__(output_dir, **kwargs)
         self.dpi = kwargs.get('dpi', self.DEFAULT_DPI)
         self.svg_conversion_method = 'batik'  # 使用默认值
+        # 输出PNG不比源文件旧时跳过转换（与PlantUMLConfig.incremental含义相同）
+        self.incremental = kwargs.get('incremental', True)
         self._check_dependencies()
         
         # 初始化Batik转换器
         self.batik_converter = BatikConverter(output_dir, **kwargs)
+        # 输出目录 -> PlantUML转换器，同一目录下的多张图复用同一实例
+        self._plantuml_converters: Dict[str, PlantUMLConverter] = {}
         
     def _check_dependencies(self):
         """检查依赖库和外部工具是否已安装"""
@@ -85,11 +92,19 @@ class DiagramToPngConverter(BaseConverter):
             self.logger.warning(f"以下依赖缺失，部分功能可能不可用: {', '.join(missing_deps)}")
     
     def _check_tool_availability(self, tool_name: str) -> bool:
-        """检查外部工具是否可用"""
-        return shutil.which(tool_name) is not None
+        """检查外部工具是否可用（走 dep_check 的进程级缓存）"""
+        return command_available(tool_name)
     
     def _find_drawio_executable(self) -> Optional[str]:
-        """查找draw.io桌面版可执行文件路径"""
+        """查找draw.io桌面版可执行文件路径（进程内只查找一次）"""
+        global _drawio_path, _drawio_resolved
+        if not _drawio_resolved:
+            _drawio_path = self._search_drawio_executable()
+            _drawio_resolved = True
+        return _drawio_path
+    
+    def _search_drawio_executable(self) -> Optional[str]:
+        """在PATH和常见安装路径中查找draw.io桌面版"""
         import platform
         
         # 常见的draw.io安装路径
@@ -120,9 +135,9 @@ class DiagramToPngConverter(BaseConverter):
             ]
         
         # 首先检查PATH中是否有drawio命令
-        if shutil.which("drawio"):
+        if find_command("drawio"):
             return "drawio"
-        if shutil.which("draw.io"):
+        if find_command("draw.io"):
             return "draw.io"
         
         # 检查常见安装路径
@@ -202,6 +217,12 @@ class DiagramToPngConverter(BaseConverter):
             
             output_file = output_path / f"{file_path_obj.stem}.png"
             
+            # Mermaid/draw.io 每次都要启动浏览器内核导出，源文件未改动时直接复用上次的PNG；
+            # SVG和PlantUML由各自的转换器处理缓存和增量
+            if file_type in ('mermaid', 'drawio') and self._is_up_to_date(file_path_obj, output_file):
+                self.logger.info(f"输出已是最新，跳过转换: {output_file}")
+                return str(output_file)
+            
             # 根据文件类型选择转换方法
             if file_type == 'svg':
                 success = self._convert_svg_to_png(file_path_obj, output_file)
@@ -226,6 +247,16 @@ class DiagramToPngConverter(BaseConverter):
             self.logger.error(f"处理文件 {file_path} 失败: {str(e)}")
             return None
     
+    def _is_up_to_date(self, source_file: Path, output_file: Path) -> bool:
+        """输出文件存在、非空且不比源文件旧时返回True（只需两次stat）"""
+        if not self.incremental:
+            return False
+        try:
+            output_stat = os.stat(output_file)
+            return output_stat.st_size > 0 and output_stat.st_mtime >= os.stat(source_file).st_mtime
+        except OSError:
+            return False
+    
     def _get_file_type(self, file_path: Path) -> Optional[str]:
         """
         检查文件是否为支持的格式
@@ -284,8 +315,11 @@ class DiagramToPngConverter(BaseConverter):
             bool: 转换是否成功
         """
         try:
-            # 创建PlantUML转换器实例
-            converter = PlantUMLConverter(str(output_file.parent), **self.config)
+            # 按输出目录复用PlantUML转换器实例（依赖检查结果、命令行、常驻JVM管道都随实例保留）
+            target_dir = str(output_file.parent)
+            converter = self._plantuml_converters.get(target_dir)
+            if converter is None:
+                converter = self._plantuml_converters[target_dir] = PlantUMLConverter(target_dir, **self.config)
             
             # 执行转换
             result = converter.convert(str(plantuml_file))
@@ -320,34 +354,26 @@ class DiagramToPngConverter(BaseConverter):
             return False
         
         try:
-            # 读取mermaid代码
-            with open(mermaid_file, 'r', encoding='utf-8') as f:
+            # 读取mermaid代码；按字节原样交给mmdc，无需解码后再编码
+            with open(mermaid_file, 'rb') as f:
                 mermaid_code = f.read().strip()
             
-            # 创建临时文件
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', encoding='utf-8', delete=False) as f:
-                f.write(mermaid_code)
-                temp_file = f.name
+            # 通过stdin把代码交给mmdc（-i -），无需写入再删除临时文件
+            cmd = [
+                "mmdc",
+                "-i", "-",
+                "-o", str(output_file),
+                "-t", "base",
+                "-b", "white"
+            ]
             
-            try:
-                # 使用mmdc转换
-                cmd = [
-                    "mmdc",
-                    "-i", temp_file,
-                    "-o", str(output_file),
-                    "-t", "base",
-                    "-b", "white"
-                ]
-                
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                return result.returncode == 0
-                
-            finally:
-                # 清理临时文件
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
+            result = subprocess.run(
+                cmd,
+                input=mermaid_code,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            return result.returncode == 0
                     
         except Exception as e:
             self.logger.error(f"转换Mermaid文件失败: {str(e)}")
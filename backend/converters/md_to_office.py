@@ -1,14 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import os
 from .base_converter import BaseConverter
 from .batik_converter import BatikConverter
 from .plantuml_converter import PlantUMLConverter
 from .dep_check import lib_available, lib_error, command_available, command_info, install_hint_for, resolve_command
+import atexit
 import json
 import subprocess
 import platform
 import re
 import shutil
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 import logging
@@ -85,6 +88,126 @@ def _win32com_available() -> bool:
     _resolve_win32()
     return _win32com_Dispatch is not None
 
+
+# ─────────────────────────────────────────
+# 预编译的Markdown解析正则（每篇文档、每行都会用到）
+# ─────────────────────────────────────────
+_HEADING_RE = re.compile(r'^(#+)\s+(.+)$', re.MULTILINE)
+# 标题与SVG/PNG图片引用的合并扫描：标题用零宽前瞻匹配，不会吞掉同一行中的图片引用；
+# 图片的说明文字和路径限制在一行内，孤立的 "![" 不会跨行吞掉后面的标题
+_HEADING_OR_IMAGE_RE = re.compile(
+    r'^(?=(?P<heading>(?P<hashes>#+)\s+(?P<heading_text>.+)$))'
+    r'|(?P<image>!\[(?P<alt>[^\]\n]*)\]\((?P<img_path>[^)\n]+\.(?:svg|png))\))',
+    re.MULTILINE | re.IGNORECASE
+)
+_PLANTUML_LINK_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+\.(?:puml|plantuml|pu))\)', re.IGNORECASE)
+_MERMAID_BLOCK_RE = re.compile(r'```mermaid\n(.*?)\n```', re.DOTALL)
+# 文档标题：YAML front matter 中的 title，其次是第一个一级标题
+_FRONT_MATTER_TITLE_RE = re.compile(r'^---\s*\ntitle:\s*(.+?)\n', re.DOTALL)
+_FIRST_H1_RE = re.compile(r'^#\s+(.+)', re.MULTILINE)
+# 幻灯片内容中的图片引用
+_SLIDE_IMAGE_RE = re.compile(r'!\[[^\]]*\]\(([^\)]+)\)')
+_FIRST_IMAGE_RE = re.compile(r'!\[[^\]]*\]\((.*?)\)')
+_NON_STANDARD_LIST_RE = re.compile(r'^(\s*)[•◦▪▫‣]\s+(.+)$')
+_NUMBERED_LIST_RE = re.compile(r'^(\s*)(\d+)\.\s+(.+)$')
+_TABLE_LIST_RE = re.compile(r'(<br>\s*)[•◦▪▫‣](\s+)')
+_LIST_ITEM_RE = re.compile(r'^\s*([-*+]|\d+\.)\s')
+_DEFINITION_LINE_RE = re.compile(r'^([^:\n]+):\s*(.+)$')
+# pipe table：表头行 + 分隔行 + 任意数据行
+_PIPE_TABLE_RE = re.compile(
+    r'(\|[^\n]+\|\n\|[-:\s|]+\|\n(?:\|[^\n]+\|\n?)*)',
+    re.MULTILINE
+)
+# 水平线：行首缩进只匹配不含换行的空白。若用 \s* 会在每个空行处吞下后续所有空行再逐个回溯，
+# 连续空行多时退化为平方级；前面的空行原样保留，替换结果不变
+_HORIZONTAL_RULE_RE = re.compile(
+    r'^([^\S\n]*)(-\s*-\s*-|\*\s*\*\s*\*|_\s*_\s_*)\s*$',
+    re.MULTILINE
+)
+# 不参与定义列表转换的行首：表格、标题、引用、代码围栏
+_DEFINITION_SKIP_PREFIXES = ('|', '#', '>', '```')
+# 标准无序列表标记；str.startswith 接受元组，一次调用即可匹配全部标记
+_LIST_MARKERS = ('- ', '* ', '+ ')
+_TOC_HEADING_RE = re.compile(r'^(#+)\s+(.*)')
+# 标题 -> HTML锚点ID
+_ANCHOR_STRIP_RE = re.compile(r'[^\w\s-]')
+_ANCHOR_SEP_RE = re.compile(r'[\s-]+')
+# docx XML 部件直接按字节匹配，无需整体解码/再编码
+_STYLE_ID_RE = re.compile(rb'w:styleId="([^"]+)"')
+_PSTYLE_REF_RE = re.compile(rb'w:pStyle w:val="([^"]+)"')
+
+
+# LaTeX 符号 -> Unicode 字符（公式文本可读化）
+_LATEX_SYMBOLS = {
+    # 希腊字母（常见的）
+    r'\\alpha': 'α', r'\\beta': 'β', r'\\gamma': 'γ', r'\\delta': 'δ',
+    r'\\epsilon': 'ε', r'\\zeta': 'ζ', r'\\eta': 'η', r'\\theta': 'θ',
+    r'\\lambda': 'λ', r'\\mu': 'μ', r'\\pi': 'π', r'\\rho': 'ρ',
+    r'\\sigma': 'σ', r'\\tau': 'τ', r'\\phi': 'φ', r'\\psi': 'ψ',
+    r'\\omega': 'ω', r'\\Gamma': 'Γ', r'\\Delta': 'Δ', r'\\Theta': 'Θ',
+    r'\\Lambda': 'Λ', r'\\Xi': 'Ξ', r'\\Pi': 'Π', r'\\Sigma': 'Σ',
+    r'\\Upsilon': 'Υ', r'\\Phi': 'Φ', r'\\Psi': 'Ψ', r'\\Omega': 'Ω',
+    # 数学运算符
+    r'\\times': '×', r'\\div': '÷', r'\\pm': '±', r'\\mp': '∓',
+    r'\\le': '≤', r'\\ge': '≥', r'\\neq': '≠', r'\\approx': '≈',
+    r'\\equiv': '≡', r'\\infty': '∞', r'\\partial': '∂',
+    r'\\nabla': '∇', r'\\sum': '∑', r'\\prod': '∏', r'\\int': '∫',
+    r'\\sqrt': '√', r'\\overline': '¯', r'\\vec': '→',
+    r'\\hat': '^', r'\\bar': '¯', r'\\dot': '˙', r'\\ddot': '¨',
+    # 逻辑符号
+    r'\\forall': '∀', r'\\exists': '∃', r'\\rightarrow': '→',
+    r'\\leftarrow': '←', r'\\leftrightarrow': '↔', r'\\Rightarrow': '⇒',
+    r'\\Leftarrow': '⇐', r'\\Leftrightarrow': '⇔', r'\\land': '∧',
+    r'\\lor': '∨', r'\\lnot': '¬', r'\\oplus': '⊕', r'\\otimes': '⊗',
+    # 集合符号
+    r'\\in': '∈', r'\\notin': '∉', r'\\ni': '∋', r'\\subset': '⊂',
+    r'\\subseteq': '⊆', r'\\cup': '∪', r'\\cap': '∩', r'\\emptyset': '∅',
+    r'\\mathbb\{N\}': 'ℕ', r'\\mathbb\{Z\}': 'ℤ', r'\\mathbb\{Q\}': 'ℚ',
+    r'\\mathbb\{R\}': 'ℝ', r'\\mathbb\{C\}': 'ℂ'
+}
+# 一次扫描完成全部替换；长的命令优先匹配，\\leftarrow 不会被 \\le 截断
+_LATEX_SYMBOL_RE = re.compile(
+    '|'.join(re.escape(latex) for latex in sorted(_LATEX_SYMBOLS, key=len, reverse=True))
+)
+
+# 每个转换器实例最多记住的已渲染SVG数量
+_RENDERED_SVG_LIMIT = 256
+
+# 后台删除目录的线程；退出前最多等待 _CLEANUP_JOIN_TIMEOUT 秒
+_CLEANUP_THREADS: List[threading.Thread] = []
+_CLEANUP_JOIN_TIMEOUT = 5.0
+
+
+def _remove_dir_in_background(path: Path) -> Path:
+    """
+    先把目录改名移开，再由后台线程递归删除，调用方无需等待逐个 unlink
+    
+    Args:
+        path: 待删除目录
+        
+    Returns:
+        Path: 实际被后台删除的目录（改名失败时为原目录）
+    """
+    trash = path.with_name(f"{path.name}.trash-{os.urandom(4).hex()}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        # 改名失败（例如跨设备或被占用）时直接同步删除
+        shutil.rmtree(path, ignore_errors=True)
+        return path
+    thread = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={'ignore_errors': True}, daemon=True)
+    thread.start()
+    _CLEANUP_THREADS[:] = [t for t in _CLEANUP_THREADS if t.is_alive()]
+    _CLEANUP_THREADS.append(thread)
+    return trash
+
+
+@atexit.register
+def _join_cleanup_threads():
+    for thread in _CLEANUP_THREADS:
+        thread.join(timeout=_CLEANUP_JOIN_TIMEOUT)
+
+
 class MdToOfficeConverter(BaseConverter):
     """
     This class encapsulates the logic from the original md_to_docx.py script,
@@ -124,8 +247,16 @@ class MdToOfficeConverter(BaseConverter):
         self.batik_converter = BatikConverter(
             output_dir=str(svg_temp_dir),
             dpi=kwargs.get('svg_dpi', 300),
-            timeout=kwargs.get('svg_timeout', 60)
+            timeout=kwargs.get('svg_timeout', 60),
+            # svg_temp每次转换后都会删除，缓存放在输出目录下才能跨运行复用
+            cache_dir=str(self.output_dir / '.svgcache')
         )
+        # 处理PlantUML文件链接时按需创建
+        self._plantuml_converter: Optional[PlantUMLConverter] = None
+        # (模板路径, 是否存在)：每个文档只stat一次模板文件
+        self._template_state: Optional[Tuple[Optional[str], bool]] = None
+        # SVG内容哈希 -> 已渲染的PNG路径；LRU顺序，超过上限时淘汰最久未用的条目
+        self._rendered_svgs: "OrderedDict[bytes, str]" = OrderedDict()
 
     def _resolve_template_path(self, provided_path: str, default_filename: str) -> str:
         """
@@ -206,6 +337,8 @@ class MdToOfficeConverter(BaseConverter):
         """
         Routes a single file to the correct conversion method based on output format.
         """
+        # 模板文件可能在两次转换之间被替换或删除，每个文档重新检查一次
+        self._template_state = None
         if not Path(input_file).exists():
             self.logger.error(f"Input file not found: {input_file}")
             return None
@@ -339,8 +472,9 @@ class MdToOfficeConverter(BaseConverter):
             # 清理临时文件
             for temp_file in temp_files:
                 try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
+                    os.remove(temp_file)
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
                     self.logger.warning(f"Failed to remove temp file {temp_file}: {e}")
     
@@ -394,8 +528,9 @@ class MdToOfficeConverter(BaseConverter):
             # 清理临时文件
             for temp_file in temp_files:
                 try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
+                    os.remove(temp_file)
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
                     self.logger.warning(f"Failed to remove temp file {temp_file}: {e}")
     
@@ -403,16 +538,29 @@ class MdToOfficeConverter(BaseConverter):
         """仅标题和SVG模式的解析（移植自MdToPptConverter）"""
         sections = []
         
-        # 提取所有标题和图片的位置信息
-        heading_pattern = re.compile(r'^(#+)\s+(.+)$', re.MULTILINE)
-        headings = list(heading_pattern.finditer(content))
-        
-        # 提取所有SVG图片引用（包括已转换的PNG）
-        svg_pattern = re.compile(r'!\[([^\]]*)\]\(([^\)]+\.(svg|png))\)', re.IGNORECASE)
-        svg_matches = list(svg_pattern.finditer(content))
+        # 一次扫描按文档顺序取出全部标题和SVG图片引用（包括已转换的PNG），无需再按位置排序
+        items = []
+        for match in _HEADING_OR_IMAGE_RE.finditer(content):
+            if match.lastgroup == 'heading':
+                items.append({
+                    'type': 'title',
+                    'level': len(match.group('hashes')),
+                    'title': match.group('heading_text').strip(),
+                    'position': match.start()
+                })
+            else:
+                alt_text = match.group('alt')
+                img_path = match.group('img_path')
+                items.append({
+                    'type': 'svg',
+                    'level': 2,
+                    'title': alt_text or f"图片: {os.path.basename(img_path)}",
+                    'content': [match.group('image')],  # 完整的图片markdown语法
+                    'position': match.start()
+                })
         
         # 添加文档标题作为第一页（只有当标题不为空且不与第一个标题重复时）
-        first_heading_title = headings[0].group(2).strip() if headings else None
+        first_heading_title = next((item['title'] for item in items if item['type'] == 'title'), None)
         if title and title != first_heading_title:
             sections.append({
                 'level': 1, 
@@ -422,35 +570,6 @@ class MdToOfficeConverter(BaseConverter):
                 'position': 0
             })
         
-        # 创建包含标题和图片位置信息的列表
-        items = []
-        
-        # 添加标题信息
-        for match in headings:
-            level = len(match.group(1))
-            heading_text = match.group(2).strip()
-            items.append({
-                'type': 'title',
-                'level': level,
-                'title': heading_text,
-                'position': match.start()
-            })
-        
-        # 添加图片信息
-        for match in svg_matches:
-            alt_text = match.group(1)
-            img_path = match.group(2)
-            items.append({
-                'type': 'svg',
-                'level': 2,
-                'title': alt_text or f"图片: {os.path.basename(img_path)}",
-                'content': [match.group(0)],  # 完整的图片markdown语法
-                'position': match.start()
-            })
-        
-        # 按位置排序
-        items.sort(key=lambda x: x['position'])
-        
         # 将图片放在其前面最近的标题后面
         current_title_sections = []
         if title and title != first_heading_title:
@@ -484,8 +603,7 @@ class MdToOfficeConverter(BaseConverter):
         sections = []
         
         # 提取所有标题行
-        heading_pattern = re.compile(r'^(#+)\s+(.+)$', re.MULTILINE)
-        headings = list(heading_pattern.finditer(content))
+        headings = list(_HEADING_RE.finditer(content))
         
         # 添加文档标题作为第一页（只有当标题不为空且不与第一个标题重复时）
         first_heading_title = headings[0].group(2).strip() if headings else None
@@ -548,9 +666,17 @@ class MdToOfficeConverter(BaseConverter):
         
         return sections
     
+    def _has_template(self) -> bool:
+        """模板路径已设置且文件存在时返回True；同一文档内复用首次检查结果"""
+        if not self.template_path:
+            return False
+        if self._template_state is None or self._template_state[0] != self.template_path:
+            self._template_state = (self.template_path, Path(self.template_path).exists())
+        return self._template_state[1]
+    
     def _create_presentation_from_template(self) -> 'Presentation':
         """根据模板创建演示文稿，如果未提供模板则创建空白演示文稿"""
-        if self.template_path and Path(self.template_path).exists():
+        if self._has_template():
             self.logger.info(f"正在加载模板: {self.template_path}")
             try:
                 prs = Presentation(self.template_path)
@@ -584,10 +710,8 @@ class MdToOfficeConverter(BaseConverter):
         slide = prs.slides.add_slide(layout_to_use)
         
         # 删除所有占位符形状
-        shapes_to_remove = []
-        for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                shapes_to_remove.append(shape)
+        shapes_to_remove = [shape for shape in slide.shapes
+                            if getattr(shape, 'is_placeholder', False)]
         
         for shape in shapes_to_remove:
             try:
@@ -640,7 +764,7 @@ class MdToOfficeConverter(BaseConverter):
     def _create_content_slide(self, prs: 'Presentation', section: dict, md_dir: Path):
         """创建内容幻灯片（包含标题、文本内容和图片）"""
         # 判断是否为纯标题页（没有内容）
-        is_title_only = not section.get('content') or not any(content.strip() for content in section['content'])
+        is_title_only = not section.get('content') or not any(content and not content.isspace() for content in section['content'])
         
         if is_title_only:
             # 纯标题页：使用标题页布局
@@ -681,10 +805,8 @@ class MdToOfficeConverter(BaseConverter):
         slide = prs.slides.add_slide(layout_to_use)
         
         # 删除所有占位符形状
-        shapes_to_remove = []
-        for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                shapes_to_remove.append(shape)
+        shapes_to_remove = [shape for shape in slide.shapes
+                            if getattr(shape, 'is_placeholder', False)]
         
         for shape in shapes_to_remove:
             try:
@@ -725,17 +847,19 @@ class MdToOfficeConverter(BaseConverter):
                 content_text = '\n'.join(section['content'])
                 
                 # 检查是否包含图片
-                img_matches = list(re.finditer(r'!\[[^\]]*\]\(([^\)]+)\)', content_text))
+                img_matches = list(_SLIDE_IMAGE_RE.finditer(content_text))
                 
                 if img_matches:
                     # 包含图片的情况：分别处理文本和图片
-                    text_content = content_text
-                    
-                    # 移除图片引用，只保留文本
-                    for match in reversed(img_matches):  # 从后往前删除，避免位置偏移
-                        text_content = text_content[:match.start()] + text_content[match.end():]
+                    # 移除图片引用，只保留文本：按位置顺序收集图片之间的文本片段，最后一次拼接
+                    text_parts = []
+                    cursor = 0
+                    for match in img_matches:
+                        text_parts.append(content_text[cursor:match.start()])
+                        cursor = match.end()
+                    text_parts.append(content_text[cursor:])
                     
-                    text_content = text_content.strip()
+                    text_content = ''.join(text_parts).strip()
                     
                     # 添加文本内容（如果有）
                     if text_content:
@@ -863,10 +987,8 @@ class MdToOfficeConverter(BaseConverter):
         slide = prs.slides.add_slide(layout_to_use)
         
         # 删除所有占位符形状
-        shapes_to_remove = []
-        for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                shapes_to_remove.append(shape)
+        shapes_to_remove = [shape for shape in slide.shapes
+                            if getattr(shape, 'is_placeholder', False)]
         
         for shape in shapes_to_remove:
             try:
@@ -956,10 +1078,8 @@ class MdToOfficeConverter(BaseConverter):
         slide = prs.slides.add_slide(layout_to_use)
         
         # 删除所有占位符形状
-        shapes_to_remove = []
-        for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                shapes_to_remove.append(shape)
+        shapes_to_remove = [shape for shape in slide.shapes
+                            if getattr(shape, 'is_placeholder', False)]
         
         for shape in shapes_to_remove:
             try:
@@ -1000,30 +1120,10 @@ class MdToOfficeConverter(BaseConverter):
                     self.logger.warning(f"SVG文件未找到: {img_path}")
                     return
                 
-                # 使用Batik转换器直接转换SVG文件
-                try:
-                    svg_temp_dir = self.output_dir / 'svg_temp'
-                    svg_temp_dir.mkdir(exist_ok=True)
-                    
-                    # 读取SVG内容
-                    with open(img_path, 'r', encoding='utf-8') as f:
-                        svg_content = f.read()
-                    
-                    # 生成PNG文件名
-                    png_filename = f"{Path(img_path).stem}.png"
-                    png_path = svg_temp_dir / png_filename
-                    
-                    # 转换SVG到PNG
-                    success, message = self.batik_converter.convert_to_file(img_path, str(png_path))
-                    if success and png_path.exists():
-                        img_path = str(png_path)
-                        self.logger.info(f"SVG转换成功: {img_path}")
-                    else:
-                        self.logger.warning(f"SVG转换失败，跳过图片: {img_path}")
-                        return
-                except Exception as e:
-                    self.logger.warning(f"SVG转换过程中出错: {e}，跳过图片")
+                png_file = self._convert_slide_svg(img_path)
+                if png_file is None:
                     return
+                img_path = png_file
             else:
                 # 非SVG文件，直接检查是否存在
                 if not os.path.exists(img_path):
@@ -1059,6 +1159,47 @@ class MdToOfficeConverter(BaseConverter):
             import traceback
             self.logger.error(traceback.format_exc())
 
+    def _convert_slide_svg(self, svg_path: str) -> Optional[str]:
+        """
+        将幻灯片中的SVG转换为PNG，同一文档中内容相同的SVG只渲染一次
+        
+        Args:
+            svg_path: SVG文件路径
+            
+        Returns:
+            Optional[str]: 生成的PNG路径，失败时返回None
+        """
+        try:
+            svg_temp_dir = self.output_dir / 'svg_temp'
+            svg_temp_dir.mkdir(exist_ok=True)
+            
+            # 按内容哈希去重（同一个Logo、模板图可能在多页中重复出现）
+            # 摘要与Batik的PNG缓存共用，每个文件只读取、哈希一次
+            digest = self.batik_converter.get_content_digest(svg_path)
+            # 条目只会因svg_temp被删除而失效，删除时会一并清空映射，命中时无需再stat
+            rendered = self._rendered_svgs.get(digest) if digest else None
+            if rendered:
+                self._rendered_svgs.move_to_end(digest)
+                self.logger.info(f"复用已渲染的SVG: {svg_path} ({digest.hex()[:12]})")
+                return rendered
+            
+            # 文件名带上内容摘要：不同目录下同名的SVG不会写到同一个PNG，覆盖已缓存的结果
+            stem = Path(svg_path).stem
+            png_path = svg_temp_dir / (f"{stem}-{digest.hex()[:12]}.png" if digest else f"{stem}.png")
+            success, message = self.batik_converter.convert_to_file(svg_path, str(png_path))
+            if success and png_path.exists():
+                if digest:
+                    self._rendered_svgs[digest] = str(png_path)
+                    self._rendered_svgs.move_to_end(digest)
+                    if len(self._rendered_svgs) > _RENDERED_SVG_LIMIT:
+                        self._rendered_svgs.popitem(last=False)
+                self.logger.info(f"SVG转换成功: {png_path}")
+                return str(png_path)
+            self.logger.warning(f"SVG转换失败，跳过图片: {svg_path}")
+        except Exception as e:
+            self.logger.warning(f"SVG转换过程中出错: {e}，跳过图片")
+        return None
+    
     def _create_svg_slide(self, prs: 'Presentation', section: dict, md_dir: Path):
         """创建SVG图片幻灯片（保留用于title_and_svg模式）"""
         # 优先使用内容页布局（Blank布局），如果没有则使用占位符最少的布局
@@ -1082,10 +1223,8 @@ class MdToOfficeConverter(BaseConverter):
         slide = prs.slides.add_slide(layout_to_use)
         
         # 删除所有占位符形状
-        shapes_to_remove = []
-        for shape in slide.shapes:
-            if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-                shapes_to_remove.append(shape)
+        shapes_to_remove = [shape for shape in slide.shapes
+                            if getattr(shape, 'is_placeholder', False)]
         
         for shape in shapes_to_remove:
             try:
@@ -1120,7 +1259,7 @@ class MdToOfficeConverter(BaseConverter):
         try:
             # 提取图片路径
             content = section['content'][0] if section['content'] else ''
-            img_match = re.search(r'!\[[^\]]*\]\((.*?)\)', content)
+            img_match = _FIRST_IMAGE_RE.search(content)
             if not img_match:
                 self.logger.warning("未找到图片引用")
                 return
@@ -1137,30 +1276,10 @@ class MdToOfficeConverter(BaseConverter):
                     self.logger.warning(f"SVG文件未找到: {img_path}")
                     return
                 
-                # 使用Batik转换器直接转换SVG文件
-                try:
-                    svg_temp_dir = self.output_dir / 'svg_temp'
-                    svg_temp_dir.mkdir(exist_ok=True)
-                    
-                    # 读取SVG内容
-                    with open(img_path, 'r', encoding='utf-8') as f:
-                        svg_content = f.read()
-                    
-                    # 生成PNG文件名
-                    png_filename = f"{Path(img_path).stem}.png"
-                    png_path = svg_temp_dir / png_filename
-                    
-                    # 转换SVG到PNG
-                    success, message = self.batik_converter.convert_to_file(img_path, str(png_path))
-                    if success and png_path.exists():
-                        img_path = str(png_path)
-                        self.logger.info(f"SVG转换成功: {img_path}")
-                    else:
-                        self.logger.warning(f"SVG转换失败，跳过图片: {img_path}")
-                        return
-                except Exception as e:
-                    self.logger.warning(f"SVG转换过程中出错: {e}，跳过图片")
+                png_file = self._convert_slide_svg(img_path)
+                if png_file is None:
                     return
+                img_path = png_file
             else:
                 # 非SVG文件，直接检查是否存在
                 if not os.path.exists(img_path):
@@ -1207,12 +1326,12 @@ class MdToOfficeConverter(BaseConverter):
         """从原始内容中提取标题（在任何处理之前）"""
         try:
             # 首先尝试从YAML front matter提取
-            pandoc_title_match = re.search(r'^---\s*\ntitle:\s*(.+?)\n', content, re.DOTALL)
+            pandoc_title_match = _FRONT_MATTER_TITLE_RE.search(content)
             if pandoc_title_match:
                 return pandoc_title_match.group(1).strip()
             
             # 然后尝试提取第一个一级标题
-            first_heading_match = re.search(r'^#\s+(.+)', content, re.MULTILINE)
+            first_heading_match = _FIRST_H1_RE.search(content)
             if first_heading_match:
                 return first_heading_match.group(1).strip()
         except Exception as e:
@@ -1223,17 +1342,17 @@ class MdToOfficeConverter(BaseConverter):
     def _get_title_from_md(self, content: str, fallback_path: Path) -> str:
         """Extracts title from Markdown content."""
         # 如果有模板且已保存原始标题，使用原始标题
-        has_template = self.template_path and Path(self.template_path).exists()
+        has_template = self._has_template()
         if has_template and hasattr(self, '_original_title') and self._original_title:
             return self._original_title
             
         # 否则从当前内容中提取标题
         try:
-            pandoc_title_match = re.search(r'^---\s*\ntitle:\s*(.+?)\n', content, re.DOTALL)
+            pandoc_title_match = _FRONT_MATTER_TITLE_RE.search(content)
             if pandoc_title_match:
                 return pandoc_title_match.group(1).strip()
             
-            first_heading_match = re.search(r'^#\s+(.+)', content, re.MULTILINE)
+            first_heading_match = _FIRST_H1_RE.search(content)
             if first_heading_match:
                 return first_heading_match.group(1).strip()
         except Exception as e:
@@ -1256,13 +1375,15 @@ class MdToOfficeConverter(BaseConverter):
         temp_files = []
         md_dir = Path(md_file_path).parent
         
-        # 在标题提级之前先保存原始标题（用于模板中的{{title}}）
-        self._original_title = self._extract_original_title(content)
+        # 在标题提级之前先保存原始标题（用于模板中的{{title}}）；
+        # 只有使用模板时 _get_title_from_md 才会读取它，无模板时省去这次扫描
+        self._original_title = self._extract_original_title(content) if self._has_template() else ""
 
         # 标题序号处理
         content = re.sub(r'^(#+)\s*(\d+(\.*\d+)*\s+)', r'\1 ', content, flags=re.MULTILINE)
         content = re.sub(r'^(#+)\s*(\d+(\.*\d+)*\.\s+)', r'\1 ', content, flags=re.MULTILINE)
-        content = re.sub(r'(!\[)(fig:.*?)(\])', r'\1\3', content)
+        if '![fig:' in content:
+            content = re.sub(r'(!\[)(fig:.*?)(\])', r'\1\3', content)
         
         # 自定义标题提级处理：二级标题提为一级，一级标题保持一级
         if self.promote_headings:
@@ -1294,8 +1415,8 @@ class MdToOfficeConverter(BaseConverter):
         except Exception as e:
             self.logger.error(f"PlantUML文件链接处理失败: {e}")
 
-        # Mermaid图表处理
-        if self._check_tool_availability("mmdc"):
+        # Mermaid图表处理（文档中没有mermaid代码块时直接跳过，不做正则扫描和工具检测）
+        if '```mermaid' in content and self._check_tool_availability("mmdc"):
             def replace_mermaid(match):
                 code = match.group(1)
                 img_path = md_dir / f"mermaid-generated-{os.urandom(4).hex()}.png"
@@ -1306,7 +1427,7 @@ class MdToOfficeConverter(BaseConverter):
                 except (subprocess.CalledProcessError, FileNotFoundError) as e:
                     self.logger.error(f"Mermaid conversion failed: {e.stderr if hasattr(e, 'stderr') else e}")
                     return f"```mermaid\n{code}\n```"
-            content = re.sub(r'```mermaid\n(.*?)\n```', replace_mermaid, content, flags=re.DOTALL)
+            content = _MERMAID_BLOCK_RE.sub(replace_mermaid, content)
 
         # 新增：将<br>替换为10个空格
         content = content.replace('<br>', '          ')
@@ -1347,11 +1468,11 @@ class MdToOfficeConverter(BaseConverter):
         """
         lines = content.split('\n')
         processed_lines = []
-        has_template = self.template_path and Path(self.template_path).exists()
+        has_template = self._has_template()
         
         for line in lines:
             # 匹配标题行
-            heading_match = re.match(r'^(#+)\s+(.+)$', line)
+            heading_match = _HEADING_RE.match(line)
             if heading_match:
                 heading_level = len(heading_match.group(1))
                 heading_text = heading_match.group(2)
@@ -1380,25 +1501,28 @@ class MdToOfficeConverter(BaseConverter):
     def _cleanup_temp_files(self, temp_files: List[str], processed_file: str = None, original_file: str = None, preserve_png_for_html: bool = False):
         """清理临时文件"""
         for temp_file in temp_files:
+            # HTML转换时保留PNG文件，删除SVG文件
+            if preserve_png_for_html:
+                if temp_file.lower().endswith('.png'):
+                    self.logger.info(f"HTML转换：保留PNG文件 {temp_file}")
+                    continue
+                elif temp_file.lower().endswith('.svg'):
+                    self.logger.info(f"HTML转换：删除SVG文件 {temp_file}")
+            
+            # 直接删除，不存在时忽略，省去一次 exists 检查
             try:
-                if os.path.exists(temp_file):
-                    # HTML转换时保留PNG文件，删除SVG文件
-                    if preserve_png_for_html:
-                        if temp_file.lower().endswith('.png'):
-                            self.logger.info(f"HTML转换：保留PNG文件 {temp_file}")
-                            continue
-                        elif temp_file.lower().endswith('.svg'):
-                            self.logger.info(f"HTML转换：删除SVG文件 {temp_file}")
-                    
-                    os.remove(temp_file)
+                os.remove(temp_file)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 self.logger.warning(f"无法删除临时文件 {temp_file}: {e}")
         
         # 清理处理过的文件（如果与原文件不同）
         if processed_file and original_file and processed_file != original_file:
             try:
-                if os.path.exists(processed_file):
-                    os.remove(processed_file)
+                os.remove(processed_file)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 self.logger.warning(f"无法删除临时文件 {processed_file}: {e}")
         
@@ -1406,8 +1530,10 @@ class MdToOfficeConverter(BaseConverter):
         if not preserve_png_for_html:
             try:
                 svg_temp_dir = self.output_dir / 'svg_temp'
-                if svg_temp_dir.exists() and svg_temp_dir.is_dir():
-                    shutil.rmtree(svg_temp_dir)
+                if svg_temp_dir.is_dir():
+                    # 改名后在后台删除，下一次转换可立即重建svg_temp
+                    _remove_dir_in_background(svg_temp_dir)
+                    self._rendered_svgs.clear()
                     self.logger.info(f"已删除svg_temp目录: {svg_temp_dir}")
             except Exception as e:
                 self.logger.warning(f"无法删除svg_temp目录: {e}")
@@ -1476,11 +1602,15 @@ class MdToOfficeConverter(BaseConverter):
             # 将公式转换为带标签的格式，便于Pandoc识别
             return f"\n\n<div class=\"math-block\">[公式块] {math_content}</div>\n\n"
 
+        # 以下每一步都先用子串查找确认定界符存在，没有公式的文档不进入正则扫描
+
         # 匹配 $$...$$ (支持跨行)
-        content = re.sub(r'\$\$\s*(.*?)\s*\$\$', replace_block_math, content, flags=re.DOTALL)
+        if '$$' in content:
+            content = re.sub(r'\$\$\s*(.*?)\s*\$\$', replace_block_math, content, flags=re.DOTALL)
 
         # 匹配 \[...\] 块级公式
-        content = re.sub(r'\\\[\s*(.*?)\s*\\]', replace_block_math, content, flags=re.DOTALL)
+        if '\\[' in content:
+            content = re.sub(r'\\\[\s*(.*?)\s*\\]', replace_block_math, content, flags=re.DOTALL)
 
         # 匹配 \begin{equation}...\end{equation} 环境
         def replace_equation_env(match):
@@ -1492,12 +1622,13 @@ class MdToOfficeConverter(BaseConverter):
             math_content = re.sub(r'\\label\{[^}]+\}', '', math_content).strip()
             return f"\n\n<div class=\"math-block\">[公式环境{label}] {math_content}</div>\n\n"
 
-        content = re.sub(
-            r'\\begin\{equation\}\s*(.*?)\s*\\end\{equation\}',
-            replace_equation_env,
-            content,
-            flags=re.DOTALL
-        )
+        if '\\begin{equation}' in content:
+            content = re.sub(
+                r'\\begin\{equation\}\s*(.*?)\s*\\end\{equation\}',
+                replace_equation_env,
+                content,
+                flags=re.DOTALL
+            )
 
         # 匹配 \begin{align}...\end{align} 环境（多行对齐）
         def replace_align_env(match):
@@ -1506,12 +1637,13 @@ class MdToOfficeConverter(BaseConverter):
             math_content = re.sub(r'\\\\', '\n', math_content)
             return f"\n\n<div class=\"math-block\">[多行公式] {math_content}</div>\n\n"
 
-        content = re.sub(
-            r'\\begin\{align(?:ed|at|gather)\*?\}\s*(.*?)\s*\\end\{align(?:ed|at|gather)\*?\}',
-            replace_align_env,
-            content,
-            flags=re.DOTALL
-        )
+        if '\\begin{align' in content:
+            content = re.sub(
+                r'\\begin\{align(?:ed|at|gather)\*?\}\s*(.*?)\s*\\end\{align(?:ed|at|gather)\*?\}',
+                replace_align_env,
+                content,
+                flags=re.DOTALL
+            )
 
         # 处理行内公式 $...$ 或 \(...\)
 
@@ -1520,88 +1652,50 @@ class MdToOfficeConverter(BaseConverter):
             return f" [公式: {math_content}] "
 
         # 匹配 $...$
-        content = re.sub(r'\$(.*?)\$', replace_inline_math, content, flags=re.DOTALL)
+        if '$' in content:
+            content = re.sub(r'\$(.*?)\$', replace_inline_math, content, flags=re.DOTALL)
 
         # 匹配 \(...\)
-        content = re.sub(r'\\\(\s*(.*?)\s*\\\)', replace_inline_math, content, flags=re.DOTALL)
+        if '\\(' in content:
+            content = re.sub(r'\\\(\s*(.*?)\s*\\\)', replace_inline_math, content, flags=re.DOTALL)
 
         # 处理常见的LaTeX数学符号和命令
         # 将常见的数学命令转换为更易读的格式
 
         # 处理分数 \frac{num}{den}
-        content = re.sub(
-            r'\\frac\{([^}]+)\}\{([^}]+)\}',
-            r'(\1)/(\2)',
-            content
-        )
+        if '\\frac{' in content:
+            content = re.sub(
+                r'\\frac\{([^}]+)\}\{([^}]+)\}',
+                r'(\1)/(\2)',
+                content
+            )
 
         # 处理上标 ^...
-        content = re.sub(
-            r'\^\{?([^}\s]+)\}?',
-            r'^\1',
-            content
-        )
+        if '^' in content:
+            content = re.sub(
+                r'\^\{?([^}\s]+)\}?',
+                r'^\1',
+                content
+            )
 
         # 处理下标 _...
-        content = re.sub(
-            r'_\{?([^}\s]+)\}?',
-            r'_\1',
-            content
-        )
-
-        # 处理希腊字母（常见的）
-        greek_map = {
-            r'\\alpha': 'α', r'\\beta': 'β', r'\\gamma': 'γ', r'\\delta': 'δ',
-            r'\\epsilon': 'ε', r'\\zeta': 'ζ', r'\\eta': 'η', r'\\theta': 'θ',
-            r'\\lambda': 'λ', r'\\mu': 'μ', r'\\pi': 'π', r'\\rho': 'ρ',
-            r'\\sigma': 'σ', r'\\tau': 'τ', r'\\phi': 'φ', r'\\psi': 'ψ',
-            r'\\omega': 'ω', r'\\Gamma': 'Γ', r'\\Delta': 'Δ', r'\\Theta': 'Θ',
-            r'\\Lambda': 'Λ', r'\\Xi': 'Ξ', r'\\Pi': 'Π', r'\\Sigma': 'Σ',
-            r'\\Upsilon': 'Υ', r'\\Phi': 'Φ', r'\\Psi': 'Ψ', r'\\Omega': 'Ω'
-        }
-
-        for latex, greek in greek_map.items():
-            content = content.replace(latex, greek)
-
-        # 处理数学运算符
-        math_ops = {
-            r'\\times': '×', r'\\div': '÷', r'\\pm': '±', r'\\mp': '∓',
-            r'\\le': '≤', r'\\ge': '≥', r'\\neq': '≠', r'\\approx': '≈',
-            r'\\equiv': '≡', r'\\infty': '∞', r'\\partial': '∂',
-            r'\\nabla': '∇', r'\\sum': '∑', r'\\prod': '∏', r'\\int': '∫',
-            r'\\sqrt': '√', r'\\overline': '¯', r'\\vec': '→',
-            r'\\hat': '^', r'\\bar': '¯', r'\\dot': '˙', r'\\ddot': '¨'
-        }
-
-        for latex, symbol in math_ops.items():
-            content = content.replace(latex, symbol)
-
-        # 处理逻辑符号
-        logic_ops = {
-            r'\\forall': '∀', r'\\exists': '∃', r'\\rightarrow': '→',
-            r'\\leftarrow': '←', r'\\leftrightarrow': '↔', r'\\Rightarrow': '⇒',
-            r'\\Leftarrow': '⇐', r'\\Leftrightarrow': '⇔', r'\\land': '∧',
-            r'\\lor': '∨', r'\\lnot': '¬', r'\\oplus': '⊕', r'\\otimes': '⊗'
-        }
-
-        for latex, symbol in logic_ops.items():
-            content = content.replace(latex, symbol)
-
-        # 处理集合符号
-        set_ops = {
-            r'\\in': '∈', r'\\notin': '∉', r'\\ni': '∋', r'\\subset': '⊂',
-            r'\\subseteq': '⊆', r'\\cup': '∪', r'\\cap': '∩', r'\\emptyset': '∅',
-            r'\\mathbb\{N\}': 'ℕ', r'\\mathbb\{Z\}': 'ℤ', r'\\mathbb\{Q\}': 'ℚ',
-            r'\\mathbb\{R\}': 'ℝ', r'\\mathbb\{C\}': 'ℂ'
-        }
+        if '_' in content:
+            content = re.sub(
+                r'_\{?([^}\s]+)\}?',
+                r'_\1',
+                content
+            )
 
-        for latex, symbol in set_ops.items():
-            content = content.replace(latex, symbol)
+        # 处理希腊字母、数学运算符、逻辑符号和集合符号：单次扫描替换
+        if '\\\\' in content:
+            content = _LATEX_SYMBOL_RE.sub(lambda m: _LATEX_SYMBOLS[m.group(0)], content)
 
         return content
     
     def _process_task_lists(self, content: str) -> str:
         """处理任务列表支持"""
+        if '[' not in content:
+            return content
         
         # 匹配任务列表项，保留原始格式
         content = re.sub(
@@ -1615,6 +1709,8 @@ class MdToOfficeConverter(BaseConverter):
     
     def _process_footnotes(self, content: str) -> str:
         """处理脚注支持"""
+        if '[^' not in content:
+            return content
         
         # 收集所有脚注定义
         footnote_pattern = r'\[\^([^\]]+)\]:\s*(.+?)(?=\n\[\^|\n\n|\Z)'
@@ -1665,22 +1761,13 @@ class MdToOfficeConverter(BaseConverter):
                 else:
                     in_yaml = False
                     continue
-            if in_yaml:
+            # 没有冒号的行不可能是定义，直接跳过（绝大多数正文行）
+            if in_yaml or ':' not in line:
                 continue
-            # 跳过表格/标题/列表/引用/代码围栏等行
-            if (
-                line.lstrip().startswith('|')
-                or line.lstrip().startswith('#')
-                or re.match(r'^\s*([-*+]|\d+\.)\s', line)
-                or line.lstrip().startswith('>')
-                or stripped.startswith('```')
-            ):
+            # 跳过表格/标题/列表/引用/代码围栏等行：一次元组前缀判断代替逐个 startswith
+            if stripped.startswith(_DEFINITION_SKIP_PREFIXES) or _LIST_ITEM_RE.match(line):
                 continue
-            lines[i] = re.sub(
-                r'^([^:\n]+):\s*(.+)$',
-                r'- **\1**: \2',
-                line
-            )
+            lines[i] = _DEFINITION_LINE_RE.sub(r'- **\1**: \2', line)
         return '\n'.join(lines)
     
     def _process_abbreviations(self, content: str) -> str:
@@ -1721,14 +1808,13 @@ class MdToOfficeConverter(BaseConverter):
 
             # Decide whether to use the advanced template feature
             use_advanced_template = (
-                self.template_path and
-                Path(self.template_path).exists() and
+                self._has_template() and
                 _win32com_available()
             )
 
             # 记录模板使用状态
             if self.template_path:
-                if Path(self.template_path).exists():
+                if self._has_template():
                     self.logger.info(f"模板文件有效: {self.template_path}")
                 else:
                     self.logger.error(f"模板文件不存在: {self.template_path}")
@@ -1818,7 +1904,7 @@ class MdToOfficeConverter(BaseConverter):
                 ]
                 
                 # 如果没有提供模板，创建一个简单的参考文档来控制字体
-                if not (self.template_path and Path(self.template_path).exists()):
+                if not self._has_template():
                     # 创建一个简单的参考文档来强制设置字体
                     self.logger.info("未提供DOCX模板，创建简单参考文档")
                     
@@ -2042,13 +2128,12 @@ class MdToOfficeConverter(BaseConverter):
         try:
             import zipfile
             import shutil
-            import re
         except ImportError as e:
             self.logger.warning(f"注入缺失段落样式失败（缺少依赖）: {e}")
             return
 
         # pandoc 默认引用、但用户模板可能缺失的段落样式
-        candidates = ['Compact', 'FirstParagraph']
+        candidates = [b'Compact', b'FirstParagraph']
 
         tmp_path = str(docx_path) + '.style.tmp.docx'
         try:
@@ -2065,41 +2150,43 @@ class MdToOfficeConverter(BaseConverter):
                 if styles_data is None or doc_data is None:
                     return
 
-                styles_xml = styles_data.decode('utf-8')
-                existing_ids = set(re.findall(r'w:styleId="([^"]+)"', styles_xml))
+                existing_ids = set(_STYLE_ID_RE.findall(styles_data))
 
                 # 只注入 document.xml 实际引用且 styles.xml 中缺失的样式
-                referenced_in_doc = set(re.findall(r'w:pStyle w:val="([^"]+)"', doc_data.decode('utf-8')))
+                referenced_in_doc = set(_PSTYLE_REF_RE.findall(doc_data))
                 missing = [s for s in candidates if s in referenced_in_doc and s not in existing_ids]
                 if not missing:
                     return
 
-                inject_xml = ''
-                for sid in missing:
-                    inject_xml += (
-                        f'<w:style w:type="paragraph" w:customStyle="1" '
-                        f'w:styleId="{sid}">'
-                        f'<w:name w:val="{sid}"/>'
-                        f'<w:basedOn w:val="Normal"/>'
-                        f'<w:qFormat/>'
-                        f'</w:style>'
-                    )
-
-                if '</w:styles>' not in styles_xml:
+                inject_xml = b''.join(
+                    b'<w:style w:type="paragraph" w:customStyle="1" '
+                    b'w:styleId="' + sid + b'">'
+                    b'<w:name w:val="' + sid + b'"/>'
+                    b'<w:basedOn w:val="Normal"/>'
+                    b'<w:qFormat/>'
+                    b'</w:style>'
+                    for sid in missing
+                )
+
+                if b'</w:styles>' not in styles_data:
                     self.logger.warning("styles.xml 结构异常，无法注入段落样式")
                     return
 
-                styles_xml = styles_xml.replace('</w:styles>', inject_xml + '</w:styles>')
+                styles_data = styles_data.replace(b'</w:styles>', inject_xml + b'</w:styles>')
 
                 with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as zout:
                     for item in zin.infolist():
-                        data = zin.read(item.filename)
                         if item.filename == 'word/styles.xml':
-                            data = styles_xml.encode('utf-8')
+                            data = styles_data
+                        elif item.filename == 'word/document.xml':
+                            data = doc_data
+                        else:
+                            data = zin.read(item.filename)
                         zout.writestr(item, data)
 
             shutil.move(tmp_path, docx_path)
-            self.logger.info(f"注入了 {len(missing)} 个缺失的段落样式: {missing}")
+            missing_names = [sid.decode('ascii') for sid in missing]
+            self.logger.info(f"注入了 {len(missing)} 个缺失的段落样式: {missing_names}")
         except Exception as e:
             self.logger.warning(f"注入缺失段落样式失败: {e}")
             try:
@@ -2136,8 +2223,8 @@ class MdToOfficeConverter(BaseConverter):
             heading_counts = {}
             def add_anchor_to_heading(match):
                 level, title = len(match.group(1)), match.group(2).strip()
-                base_id = re.sub(r'[^\w\s-]', '', title).strip().lower()
-                base_id = re.sub(r'[\s-]+', '-', base_id)
+                base_id = _ANCHOR_STRIP_RE.sub('', title).strip().lower()
+                base_id = _ANCHOR_SEP_RE.sub('-', base_id)
                 count = heading_counts.get(base_id, 0)
                 heading_counts[base_id] = count + 1
                 anchor_id = f"{base_id}-{count}" if count > 0 else base_id
@@ -2181,11 +2268,11 @@ class MdToOfficeConverter(BaseConverter):
         toc_lines = ['<nav class="toc"><ul>']
         heading_counts = {}
         for line in content.splitlines():
-            match = re.match(r'^(#+)\s+(.*)', line)
+            match = _TOC_HEADING_RE.match(line)
             if match:
                 level, title = len(match.group(1)), match.group(2).strip()
-                base_id = re.sub(r'[^\w\s-]', '', title).strip().lower()
-                base_id = re.sub(r'[\s-]+', '-', base_id)
+                base_id = _ANCHOR_STRIP_RE.sub('', title).strip().lower()
+                base_id = _ANCHOR_SEP_RE.sub('-', base_id)
                 count = heading_counts.get(base_id, 0)
                 heading_counts[base_id] = count + 1
                 anchor_id = f"{base_id}-{count}" if count > 0 else base_id
@@ -2235,17 +2322,17 @@ class MdToOfficeConverter(BaseConverter):
             # 3. 确保列表前有空行以便Pandoc正确识别
             lines = processed_content.splitlines()
             new_processed_lines = []
-            list_markers = ("- ", "* ", "+ ")
+            list_markers = _LIST_MARKERS
             
             for i, current_line_text in enumerate(lines):
                 stripped_line = current_line_text.lstrip()
-                is_list_item = any(stripped_line.startswith(marker) for marker in list_markers)
+                is_list_item = stripped_line.startswith(list_markers)
 
                 if is_list_item:
                     if i > 0:
                         previous_line_text = lines[i-1]
                         stripped_previous_line = previous_line_text.lstrip()
-                        is_previous_list_item = any(stripped_previous_line.startswith(marker) for marker in list_markers)
+                        is_previous_list_item = stripped_previous_line.startswith(list_markers)
                         
                         if previous_line_text.strip() and not is_previous_list_item:
                             new_processed_lines.append("")
@@ -2257,7 +2344,7 @@ class MdToOfficeConverter(BaseConverter):
             # 确保处理后的内容以换行符结尾
             if original_content.endswith('\n') and not processed_content.endswith('\n'):
                 processed_content += '\n'
-            elif new_processed_lines and any(new_processed_lines[-1].lstrip().startswith(marker) for marker in list_markers) and not processed_content.endswith('\n'):
+            elif new_processed_lines and new_processed_lines[-1].lstrip().startswith(list_markers) and not processed_content.endswith('\n'):
                 processed_content += '\n'
 
             # 如果内容没有变化，直接返回原文件路径
@@ -2341,6 +2428,41 @@ class MdToOfficeConverter(BaseConverter):
             self.logger.error(f"模板处理失败: {e}")
             return content_path
     
+    @staticmethod
+    def _link_or_copy(src: Path, dst: Path) -> None:
+        """同一文件系统上建立硬链接，跨设备等无法链接时回退为复制"""
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+    
+    def _png_link_target(self, png_path: Path, md_dir: Path, temp_files: List[str]) -> str:
+        """
+        计算Markdown图片链接中使用的PNG路径（始终使用正斜杠）
+        
+        Args:
+            png_path: PNG文件路径
+            md_dir: Markdown文件所在目录
+            temp_files: 临时文件列表，需要把PNG放到Markdown目录时追加
+            
+        Returns:
+            str: 相对于Markdown目录的PNG路径
+        """
+        if png_path.parent == md_dir:
+            return png_path.name
+        try:
+            return png_path.relative_to(md_dir).as_posix()
+        except ValueError:
+            # 如果无法计算相对路径，把文件放到Markdown目录（同一文件系统上用硬链接，不复制内容）
+            target_png = md_dir / png_path.name
+            self._link_or_copy(png_path, target_png)
+            temp_files.append(str(target_png))
+            return target_png.name
+    
     def _process_plantuml_file_links(self, content: str, md_dir: Path) -> tuple[str, List[str]]:
         """
         处理Markdown中的PlantUML文件链接，将其转换为PNG图片链接
@@ -2354,9 +2476,13 @@ class MdToOfficeConverter(BaseConverter):
         """
         temp_files = []
         
+        # 快速排除：没有任何Markdown链接的文档无需正则扫描
+        if '](' not in content:
+            return content, temp_files
+        
         # 匹配PlantUML文件链接的正则表达式
         # 支持 ![alt](path.puml), ![alt](path.plantuml), ![alt](path.pu)
-        plantuml_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+\.(?:puml|plantuml|pu))\)', re.IGNORECASE)
+        plantuml_pattern = _PLANTUML_LINK_RE
         
         def replace_plantuml_link(match):
             alt_text = match.group(1)
@@ -2390,22 +2516,15 @@ class MdToOfficeConverter(BaseConverter):
                 
                 if existing_png:
                     # 使用已存在的PNG文件
-                    try:
-                        relative_png_path = existing_png.relative_to(md_dir)
-                    except ValueError:
-                        # 如果无法计算相对路径，复制文件到Markdown目录
-                        import shutil
-                        target_png = md_dir / f"{puml_stem}.png"
-                        shutil.copy2(existing_png, target_png)
-                        relative_png_path = target_png.name
-                        temp_files.append(str(target_png))
-                    
+                    relative_png_path = self._png_link_target(existing_png, md_dir, temp_files)
                     new_link = f"![{alt_text}]({relative_png_path})"
                     self.logger.info(f"使用已存在的PNG文件: {puml_path} -> {relative_png_path}")
                     return new_link
                 
-                # 如果没有现成的PNG文件，尝试转换
-                plantuml_converter = PlantUMLConverter(str(self.output_dir))
+                # 如果没有现成的PNG文件，尝试转换（转换器在本实例内只创建一次）
+                if self._plantuml_converter is None:
+                    self._plantuml_converter = PlantUMLConverter(str(self.output_dir))
+                plantuml_converter = self._plantuml_converter
                 
                 # 转换PlantUML文件为PNG
                 result = plantuml_converter.convert(str(full_puml_path))
@@ -2417,15 +2536,7 @@ class MdToOfficeConverter(BaseConverter):
                         temp_files.append(str(png_path))
                         
                         # 计算相对于Markdown文件的PNG路径
-                        try:
-                            relative_png_path = png_path.relative_to(md_dir)
-                        except ValueError:
-                            # 如果无法计算相对路径，复制文件到Markdown目录
-                            import shutil
-                            target_png = md_dir / f"{puml_stem}.png"
-                            shutil.copy2(png_path, target_png)
-                            relative_png_path = target_png.name
-                            temp_files.append(str(target_png))
+                        relative_png_path = self._png_link_target(png_path, md_dir, temp_files)
                         
                         # 返回新的图片链接
                         new_link = f"![{alt_text}]({relative_png_path})"
@@ -2462,7 +2573,7 @@ class MdToOfficeConverter(BaseConverter):
             def add_anchor_to_heading(match):
                 level = len(match.group(1))
                 title = match.group(2)
-                anchor_id = re.sub(r'[^\w\s-]', '', title).strip()
+                anchor_id = _ANCHOR_STRIP_RE.sub('', title).strip()
                 anchor_id = re.sub(r'[\s_-]+', '-', anchor_id).lower()
                 return f'<h{level} id="{anchor_id}">{title}</h{level}>'
             
@@ -2552,19 +2663,18 @@ class MdToOfficeConverter(BaseConverter):
             
             # 定义各种列表格式的正则表达式
             # 1. 非标准符号列表：可选空白 + 非标准符号 + 空格 + 内容
-            non_standard_list_pattern = re.compile(r'^(\s*)[•◦▪▫‣]\s+(.+)$')
+            non_standard_list_pattern = _NON_STANDARD_LIST_RE
             
             # 2. 数字编号列表：可选空白 + 数字 + 点 + 空格 + 内容
-            numbered_list_pattern = re.compile(r'^(\s*)(\d+)\.\s+(.+)$')
+            numbered_list_pattern = _NUMBERED_LIST_RE
             
             # 3. 标准列表标记
-            standard_list_markers = ('- ', '* ', '+ ')
+            standard_list_markers = _LIST_MARKERS
             
             # 4. 表格中的HTML列表（处理表格内的非标准符号）
             def process_table_lists(line):
                 # 匹配表格行中的 <br>• 格式
-                table_list_pattern = re.compile(r'(<br>\s*)[•◦▪▫‣](\s+)')
-                return table_list_pattern.sub(r'\1-\2', line)
+                return _TABLE_LIST_RE.sub(r'\1-\2', line)
             
             for i, line in enumerate(lines):
                 original_line = line
@@ -2590,7 +2700,7 @@ class MdToOfficeConverter(BaseConverter):
                         
                         # 如果前一行不是空行且不是列表项，添加空行
                         if (prev_stripped and 
-                            not any(prev_line.lstrip().startswith(marker) for marker in standard_list_markers) and
+                            not prev_line.lstrip().startswith(standard_list_markers) and
                             not non_standard_list_pattern.match(prev_line) and
                             not numbered_list_pattern.match(prev_line)):
                             processed_lines.append("")
@@ -2613,7 +2723,7 @@ class MdToOfficeConverter(BaseConverter):
                         
                         # 如果前一行不是空行且不是列表项，添加空行
                         if (prev_stripped and 
-                            not any(prev_line.lstrip().startswith(marker) for marker in standard_list_markers) and
+                            not prev_line.lstrip().startswith(standard_list_markers) and
                             not non_standard_list_pattern.match(prev_line) and
                             not numbered_list_pattern.match(prev_line)):
                             processed_lines.append("")
@@ -2658,14 +2768,14 @@ class MdToOfficeConverter(BaseConverter):
             processed_lines = []
             
             # 标准列表标记
-            list_markers = ('- ', '* ', '+ ')
+            list_markers = _LIST_MARKERS
             
             for i, line in enumerate(lines):
                 current_line = line
                 stripped_line = line.lstrip()
                 
                 # 检查当前行是否为列表项
-                is_current_list_item = any(stripped_line.startswith(marker) for marker in list_markers)
+                is_current_list_item = stripped_line.startswith(list_markers)
                 
                 if is_current_list_item and i > 0:
                     # 获取前一行
@@ -2674,7 +2784,7 @@ class MdToOfficeConverter(BaseConverter):
                     prev_line_stripped_left = prev_line.lstrip()
                     
                     # 检查前一行是否为列表项
-                    is_prev_list_item = any(prev_line_stripped_left.startswith(marker) for marker in list_markers)
+                    is_prev_list_item = prev_line_stripped_left.startswith(list_markers)
                     
                     # 如果前一行不是空行且不是列表项，则需要添加空行
                     if prev_stripped and not is_prev_list_item:
@@ -2716,12 +2826,6 @@ class MdToOfficeConverter(BaseConverter):
         - 绝对不改变表格内容，只调整格式
         """
         try:
-            # 匹配pipe table格式的表格
-            table_pattern = re.compile(
-                r'(\|[^\n]+\|\n\|[-:\s|]+\|\n(?:\|[^\n]+\|\n?)*)',
-                re.MULTILINE
-            )
-            
             def get_display_width(text):
                 """计算文本的显示宽度（中文字符宽度为2，英文字符宽度为1）"""
                 width = 0
@@ -2841,11 +2945,10 @@ class MdToOfficeConverter(BaseConverter):
                 
                 return '\n'.join(result_lines)
             
-            # 替换所有表格
-            optimized_content = table_pattern.sub(optimize_table, content)
+            # 替换所有表格；subn 同时返回表格数量，无需再 findall 扫描一遍
+            optimized_content, table_count = _PIPE_TABLE_RE.subn(optimize_table, content)
             
             # 记录优化的表格数量
-            table_count = len(table_pattern.findall(content))
             if table_count > 0:
                 self.logger.info(f"优化了 {table_count} 个表格的列宽分配")
             
@@ -2861,6 +2964,9 @@ class MdToOfficeConverter(BaseConverter):
         - 块级代码块：```language
         - 行内代码：`code`
         """
+        if '`' not in content:
+            return content
+
         # 处理行内代码 `code`
         def replace_inline_code(match):
             code_content = match.group(1)
@@ -2896,6 +3002,8 @@ class MdToOfficeConverter(BaseConverter):
 
     def _process_strikethrough(self, content: str) -> str:
         """处理删除线语法：~~text~~"""
+        if '~~' not in content:
+            return content
 
         # 处理删除线 ~~text~~
         def replace_strikethrough(match):
@@ -2914,19 +3022,23 @@ class MdToOfficeConverter(BaseConverter):
             text = match.group(1)
             return f"^{text}^"
 
-        content = re.sub(r'\^([^^]+)\^', replace_superscript, content)
+        if '^' in content:
+            content = re.sub(r'\^([^^]+)\^', replace_superscript, content)
 
         # 处理下标 ~text~
         def replace_subscript(match):
             text = match.group(1)
             return f"~{text}~"
 
-        content = re.sub(r'~([^~]+)~', replace_subscript, content)
+        if '~' in content:
+            content = re.sub(r'~([^~]+)~', replace_subscript, content)
 
         return content
 
     def _process_keyboard_keys(self, content: str) -> str:
         """处理键盘按键语法：<kbd>key</kbd>"""
+        if '<kbd>' not in content:
+            return content
 
         # 处理 <kbd>key</kbd> 标签
         def replace_keyboard_key(match):
@@ -2943,18 +3055,12 @@ class MdToOfficeConverter(BaseConverter):
         支持 ---, ***, ___, * * *, - - -, _ _ _
         """
 
-        # 匹配各种水平线格式
-        horizontal_rule_pattern = re.compile(
-            r'^(\s*)(-\s*-\s*-|\*\s*\*\s*\*|_\s*_\s_*)\s*$',
-            re.MULTILINE
-        )
-
         def replace_hr(match):
             indent = match.group(1)
             hr_chars = match.group(2).strip()[0]  # 获取第一个字符 (-, *, 或 _)
             return f"{indent}***\n"
 
-        content = horizontal_rule_pattern.sub(replace_hr, content)
+        content = _HORIZONTAL_RULE_RE.sub(replace_hr, content)
 
         return content
 
@@ -1,14 +1,21 @@
 from typing import List, Optional, Dict, Tuple
 from collections import Counter
+from itertools import accumulate, islice
+import bisect
+import heapq
 import os
 import unicodedata
 from .base_converter import BaseConverter
 from .dep_check import lib_available, lib_error, command_available, ensure_pymupdf
 import re
+import hashlib
+import logging
 import subprocess
 import tempfile
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 
 # ─────────────────────────────────────────
@@ -32,18 +39,47 @@ def _safe_import(name: str):
 fitz = None
 pypdf = None
 pytesseract = None
+tesserocr = None
 convert_from_path = None
 docx2txt = None
 pd = None
 tabulate = None
 Presentation = None
 html2text = None
+SelectolaxParser = None
 psutil_mod = None
 
 # 各功能是否可用的缓存标志（按需探测，缺失不影响其他功能）
 _flags_resolved = False
 
 
+def _load_selectolax_parser():
+    # selectolax 1.0 起默认使用 lexbor 后端，旧版本只有 modest 后端
+    return (getattr(_safe_import("selectolax.lexbor"), "LexborHTMLParser", None)
+            or getattr(_safe_import("selectolax.parser"), "HTMLParser", None))
+
+
+# 模块级依赖变量 -> (dep_check 库名, 导入函数)，按此顺序解析
+_DEPENDENCY_LOADERS = {
+    "fitz": ("PyMuPDF", lambda: _safe_import("fitz")),
+    "pypdf": ("pypdf", lambda: _safe_import("pypdf")),
+    "pytesseract": ("pytesseract", lambda: _safe_import("pytesseract")),
+    # 可选：直接调用 libtesseract，PIL 图像在内存中传递，不落临时文件
+    "tesserocr": ("tesserocr", lambda: _safe_import("tesserocr")),
+    "convert_from_path": ("pdf2image", lambda: getattr(_safe_import("pdf2image"), "convert_from_path", None)),
+    "docx2txt": ("docx2txt", lambda: _safe_import("docx2txt")),
+    "pd": ("pandas", lambda: _safe_import("pandas")),
+    "tabulate": ("tabulate", lambda: _safe_import("tabulate")),
+    "Presentation": ("python-pptx", lambda: getattr(_safe_import("pptx"), "Presentation", None)),
+    "html2text": ("html2text", lambda: _safe_import("html2text")),
+    # 可选：基于 C 解析器的 HTML 提取，大文件比 html2text 快一个数量级
+    "SelectolaxParser": ("selectolax", _load_selectolax_parser),
+    "psutil_mod": ("psutil", lambda: _safe_import("psutil")),
+}
+# 可选的加速库：缺失时有其他实现兜底，静默探测
+_OPTIONAL_LIBS = frozenset({"tesserocr", "selectolax"})
+
+
 def _resolve_dependencies():
     """按需解析所有依赖（仅在第一次被调用时执行）"""
     global _flags_resolved
@@ -51,34 +87,60 @@ def _resolve_dependencies():
         return
     _flags_resolved = True
 
-    global fitz, pypdf, pytesseract, convert_from_path
-    global docx2txt, pd, tabulate, Presentation, html2text, psutil_mod
-
-    if lib_available("PyMuPDF"):
-        fitz = _safe_import("fitz")
-    else:
-        # 首次自动下载 PyMuPDF（带 C 扩展，无法内置到 vendor）
-        ok, msg = ensure_pymupdf()
-        if ok:
-            fitz = _safe_import("fitz")
-    if lib_available("pypdf"):
-        pypdf = _safe_import("pypdf")
-    if lib_available("pytesseract"):
-        pytesseract = _safe_import("pytesseract")
-    if lib_available("pdf2image"):
-        convert_from_path = _safe_import("pdf2image").convert_from_path
-    if lib_available("docx2txt"):
-        docx2txt = _safe_import("docx2txt")
-    if lib_available("pandas"):
-        pd = _safe_import("pandas")
-    if lib_available("tabulate"):
-        tabulate = _safe_import("tabulate")
-    if lib_available("python-pptx"):
-        Presentation = _safe_import("pptx").Presentation
-    if lib_available("html2text"):
-        html2text = _safe_import("html2text")
-    if lib_available("psutil"):
-        psutil_mod = _safe_import("psutil")
+    module_globals = globals()
+    for name, (lib_name, load) in _DEPENDENCY_LOADERS.items():
+        if lib_available(lib_name, quiet=lib_name in _OPTIONAL_LIBS):
+            module_globals[name] = load()
+        elif name == "fitz":
+            # 首次自动下载 PyMuPDF（带 C 扩展，无法内置到 vendor）
+            ok, msg = ensure_pymupdf()
+            if ok:
+                module_globals[name] = load()
+
+
+def _available_dependencies() -> Tuple[str, ...]:
+    """已解析出的可用依赖变量名，交给进程池子进程沿用"""
+    _resolve_dependencies()
+    module_globals = globals()
+    return tuple(name for name in _DEPENDENCY_LOADERS if module_globals[name] is not None)
+
+
+def _init_pool_worker(available: Tuple[str, ...], log_level: int) -> None:
+    """
+    进程池子进程初始化。
+    spawn 启动（Windows/macOS）的子进程不继承父进程状态：日志在这里配置，
+    依赖直接按父进程的解析结果导入，不再探测，也绝不在子进程中自动安装。
+    """
+    global _flags_resolved
+    # 根 logger 已有 handler（fork 继承）时 basicConfig 不做任何事
+    logging.basicConfig(level=log_level,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if _flags_resolved:
+        return
+    _flags_resolved = True
+    module_globals = globals()
+    for name in available:
+        module_globals[name] = _DEPENDENCY_LOADERS[name][1]()
+
+
+# tesseract 命令是否可运行（进程内只探测一次）
+_tesseract_ok: Optional[bool] = None
+
+
+def _probe_tesseract() -> bool:
+    """运行一次 `tesseract --version` 并缓存结果，避免每个转换器实例都 fork 子进程"""
+    global _tesseract_ok
+    if _tesseract_ok is None:
+        try:
+            subprocess.run(["tesseract", "--version"],
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          timeout=10,
+                          check=True)
+            _tesseract_ok = True
+        except (subprocess.SubprocessError, FileNotFoundError, OSError):
+            _tesseract_ok = False
+    return _tesseract_ok
 
 
 # 便捷标志（首次使用后才会被解析）
@@ -112,11 +174,52 @@ def _html2text_available() -> bool:
     return html2text is not None
 
 
+def _selectolax_available() -> bool:
+    _resolve_dependencies()
+    return SelectolaxParser is not None
+
+
+def _html_available() -> bool:
+    """selectolax 或 html2text 任一可用即可处理 HTML"""
+    return _selectolax_available() or _html2text_available()
+
+
 def _pdf_available() -> bool:
     """只要 PyMuPDF 或 pypdf 三件套之一就够"""
     return _fitz_available() or _pypdf_available()
 
 
+# 扩展名 -> 文件类型，同时也是 Office -> Markdown 支持的输入扩展名
+_EXT_TO_TYPE = {
+    '.pdf': 'pdf',
+    '.docx': 'word', '.doc': 'word',
+    '.xlsx': 'excel', '.xls': 'excel', '.xlsm': 'excel',
+    '.pptx': 'powerpoint', '.ppt': 'powerpoint',
+    '.html': 'html', '.htm': 'html',
+}
+_SUPPORTED_EXTENSIONS = frozenset(_EXT_TO_TYPE)
+
+# selectolax 提取 HTML 时的标签分类
+_HTML_SKIP_TAGS = frozenset({'script', 'style', 'head', 'noscript', 'template', 'iframe', 'svg', '-comment'})
+_HTML_BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'header', 'footer', 'main', 'nav', 'aside',
+    'figure', 'figcaption', 'form', 'dl', 'dt', 'dd', 'address', 'tr',
+})
+_HTML_WS_RE = re.compile(r'\s+')
+# 连续的换行（中间可夹只含空格/制表符的行），一次扫描同时完成清理空白行和压缩空行
+_BLANK_LINES_RE = re.compile(r'\n(?:[ \t]*\n)+')
+# Markdown表格：只含空白/短横线/冒号的单元格，以及分隔行中的单个对齐段
+_TABLE_FILLER_CELL_RE = re.compile(r'^[\s\-:]+$')
+_TABLE_SEPARATOR_SEGMENT_RE = re.compile(r'^:?-+:?$')
+_TABLE_SEPARATOR_ROW_RE = re.compile(r'^\|[\s\-:]+\|[\s\-:]+\|')
+
+# 需要清理的字符：除 \t \n \r 外的控制字符，以及无法编码为 UTF-8 的孤立代理项
+_UNCLEAN_CHARS_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff]')
+_UNCLEAN_CHARS_TABLE = dict.fromkeys(
+    [c for c in range(0x20) if c not in (0x09, 0x0a, 0x0d)] + list(range(0xD800, 0xE000))
+)
+
+
 class OfficeToMdConverter(BaseConverter):
     """
     Office 文档到 Markdown 转换器
@@ -129,6 +232,9 @@ class OfficeToMdConverter(BaseConverter):
         super().__init__(output_dir, **kwargs)
         self.poppler_path = kwargs.get('poppler_path')
         self.tesseract_cmd = kwargs.get('tesseract_cmd')
+        self.max_workers = kwargs.get('max_workers') or max(1, (os.cpu_count() or 2) // 2)
+        # 本次 convert() 的转换时间戳，同一批文件共用，避免逐文件 strftime
+        self._batch_ts: Optional[str] = None
         self._check_dependencies()
 
     def _check_dependencies(self):
@@ -154,27 +260,21 @@ class OfficeToMdConverter(BaseConverter):
         if not _pptx_available():
             self.logger.warning("python-pptx未安装，PPTX转换将跳过")
 
-        if not _html2text_available():
-            self.logger.warning("html2text未安装，HTML转换将跳过")
+        if not _html_available():
+            self.logger.warning("html2text/selectolax均未安装，HTML转换将跳过")
 
         if psutil_mod is None:
             self.logger.info("psutil未安装，批量并行处理功能不可用，将使用串行处理")
 
-        try:
-            subprocess.run(["tesseract", "--version"],
-                          stdout=subprocess.PIPE,
-                          stderr=subprocess.PIPE,
-                          check=True)
-        except (subprocess.SubprocessError, FileNotFoundError):
+        if not _probe_tesseract():
             self.logger.info("tesseract未安装，扫描版PDF的OCR功能不可用")
 
     def convert(self, input_path: str) -> List[str]:
-        supported_extensions = ['.pdf', '.docx', '.doc', '.xlsx', '.xls', '.xlsm',
-                              '.pptx', '.ppt', '.html', '.htm']
-
-        if not self._is_valid_input(input_path, supported_extensions):
+        if not self._is_valid_input(input_path, _SUPPORTED_EXTENSIONS):
             raise ValueError(f"无效的输入文件或目录: {input_path}")
 
+        self._batch_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
         output_files = []
         skipped_reasons = []
 
@@ -186,15 +286,12 @@ class OfficeToMdConverter(BaseConverter):
             else:
                 output_files.append(result)
         else:
-            office_files = self._get_files_by_extension(input_path, supported_extensions)
+            office_files = self._get_files_by_extension(input_path, _SUPPORTED_EXTENSIONS)
             if not office_files:
                 raise ValueError(f"目录中未找到支持的Office文件: {input_path}")
 
-            for office_file in office_files:
-                result = self._convert_single_file(office_file)
-                if result:
-                    output_files.append(result)
-                # 批量模式：跳过缺依赖的文件是正常的，不阻断其他文件
+            # 批量模式：跳过缺依赖的文件是正常的，不阻断其他文件
+            output_files = self._convert_files(office_files)
 
         # 单文件模式下如果有跳过原因且无输出，抛出明确错误
         if not output_files and skipped_reasons:
@@ -202,6 +299,43 @@ class OfficeToMdConverter(BaseConverter):
 
         return output_files
 
+    def _convert_files(self, office_files: List[str]) -> List[str]:
+        """
+        批量转换目录中的文件。
+        多文件且 psutil 可用时用进程池并行：依赖只在父进程解析一次，子进程直接沿用；
+        按完成顺序收集，单个大 PDF 不会阻塞其他已完成的小文件，返回时恢复输入顺序。
+        子进程崩溃（段错误、被 OOM 杀掉）会使进程池失效（BrokenProcessPool），
+        此时未完成的文件回退串行处理，不会无限等待丢失的任务。
+        """
+        results: Dict[int, Optional[str]] = {}
+        workers = min(self.max_workers, len(office_files))
+        if workers > 1 and psutil_mod is not None:
+            initargs = (_available_dependencies(), logging.getLogger().getEffectiveLevel())
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                                         initargs=initargs) as executor:
+                    futures = {
+                        executor.submit(self._convert_single_file, office_file): index
+                        for index, office_file in enumerate(office_files)
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            results[futures[future]] = future.result()
+                        except BrokenProcessPool as e:
+                            self.logger.warning(f"进程池已失效，停止收集并行结果: {e}")
+                            break
+                        except Exception as e:
+                            self.logger.warning(f"并行转换 {office_files[futures[future]]} 失败，稍后串行重试: {e}")
+            except Exception as e:
+                self.logger.warning(f"并行转换失败: {e}")
+            if len(results) < len(office_files):
+                self.logger.warning(f"剩余 {len(office_files) - len(results)} 个文件回退到串行处理")
+
+        for index, office_file in enumerate(office_files):
+            if index not in results:
+                results[index] = self._convert_single_file(office_file)
+        return [results[index] for index in range(len(office_files)) if results[index]]
+
     def _convert_single_file(self, file_path: str) -> Optional[str]:
         self._last_skip_reason = None
         file_path_obj = Path(file_path)
@@ -265,6 +399,10 @@ class OfficeToMdConverter(BaseConverter):
         deps = type_to_check.get(file_type, ())
         missing = [d for d in deps if not lib_available(d)]
 
+        if file_type == 'html' and _selectolax_available():
+            # selectolax 可替代 html2text
+            return []
+
         if file_type == 'pdf':
             primary_ok = 'PyMuPDF' not in missing
             fallback_ok = not ('pypdf' in missing or 'pytesseract' in missing or 'pdf2image' in missing)
@@ -293,20 +431,7 @@ class OfficeToMdConverter(BaseConverter):
         return detailed
 
     def _get_file_type(self, file_path: Path) -> Optional[str]:
-        suffix = file_path.suffix.lower()
-
-        if suffix in ['.pdf']:
-            return 'pdf'
-        elif suffix in ['.docx', '.doc']:
-            return 'word'
-        elif suffix in ['.xlsx', '.xls', '.xlsm']:
-            return 'excel'
-        elif suffix in ['.pptx', '.ppt']:
-            return 'powerpoint'
-        elif suffix in ['.html', '.htm']:
-            return 'html'
-        else:
-            return None
+        return _EXT_TO_TYPE.get(file_path.suffix.lower())
 
     # ─────────────────────────────────────────────
     # PDF 提取 - PyMuPDF 智能转换
@@ -432,6 +557,7 @@ class OfficeToMdConverter(BaseConverter):
                 if page_tables:
                     total_tables_found += len(page_tables)
                     self.logger.info(f"第 {page_idx+1} 页识别到 {len(page_tables)} 个表格")
+                table_index = self._build_table_index(page_tables)
 
                 for span_info in page_spans:
                     text = span_info["text"]
@@ -441,7 +567,7 @@ class OfficeToMdConverter(BaseConverter):
                         continue
 
                     # 落在任何一张表格 bbox 内的 span 跳过 —— 避免和表格输出重复
-                    if any(self._bbox_inside_rect(bbox, t["bbox"]) for t in page_tables if t.get("bbox")):
+                    if self._bbox_in_any_table(bbox, table_index):
                         continue
 
                     text = self._clean_text(text)
@@ -467,7 +593,8 @@ class OfficeToMdConverter(BaseConverter):
                     if rendered:
                         md_lines.append(f"\n{rendered}\n")
 
-                extracted_images_md = ""
+                # 片段按顺序收集，最后一次 join，避免每张图片都复制一遍已累积的字符串
+                extracted_images_md = []
 
                 # 嵌入位图提取；同时收集"是否需要保底渲染"的信号
                 image_block_count = 0
@@ -504,9 +631,9 @@ class OfficeToMdConverter(BaseConverter):
                                 caption = self._generate_image_caption(image_info, page_idx + 1, img_idx + 1)
 
                                 if image_info.get("is_chart"):
-                                    extracted_images_md += f"\n> 📊 {caption}\n![{caption}]({relative_path})\n\n"
+                                    extracted_images_md.append(f"\n> 📊 {caption}\n![{caption}]({relative_path})\n\n")
                                 else:
-                                    extracted_images_md += f"\n![{caption}]({relative_path})\n\n"
+                                    extracted_images_md.append(f"\n![{caption}]({relative_path})\n\n")
 
                                 self.logger.info(f"提取图片: {image_name} ({image_info.get('size_str', 'unknown')})")
                             except Exception as img_e:
@@ -566,7 +693,7 @@ class OfficeToMdConverter(BaseConverter):
                                 self.logger.info(
                                     f"渲染页面快照: {render_filename}（{snapshot_reason}）"
                                 )
-                                extracted_images_md += (
+                                extracted_images_md.append(
                                     f"\n> **Page {page_idx+1} Snapshot**\n\n"
                                     f"![Page {page_idx+1} Render]({relative_path})\n\n"
                                 )
@@ -574,7 +701,7 @@ class OfficeToMdConverter(BaseConverter):
                             self.logger.warning(f"渲染第 {page_idx+1} 页失败: {render_e}")
 
                 if extracted_images_md:
-                    md_lines.append(f"\n## 提取的图片\n\n{extracted_images_md}")
+                    md_lines.append("\n## 提取的图片\n\n" + "".join(extracted_images_md))
 
             if total_tables_found > 0:
                 self.logger.info(f"全文共识别到 {total_tables_found} 个表格")
@@ -708,7 +835,7 @@ class OfficeToMdConverter(BaseConverter):
 
         try:
             reader = pypdf.PdfReader(pdf_path)
-            text = ""
+            parts = []
 
             metadata = {}
             if reader.metadata:
@@ -717,20 +844,27 @@ class OfficeToMdConverter(BaseConverter):
                     if v and k in ['/Title', '/Author', '/Subject', '/Creator', '/Producer']
                 }
 
+            # 逐页累计正文长度，扫描版判断不必再对拼接后的全文做 strip
+            total_text_len = 0
             for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    page_text = self._clean_text(page_text)
-                    text += page_text + "\n\n"
+                page_text = self._pypdf_page_text(page)
+                if not page_text:
+                    continue
+                stripped_len = len(page_text.strip())
+                if stripped_len:
+                    parts.append(self._clean_text(page_text))
+                    parts.append("\n\n")
+                    total_text_len += stripped_len
 
             if metadata:
-                formatted_meta = self._format_pypdf_metadata(metadata)
-                text = formatted_meta + "\n" + text
+                parts[:0] = [self._format_pypdf_metadata(metadata), "\n"]
 
-            if len(text.strip()) < 100:
+            text = "".join(parts)
+
+            if total_text_len < 100:
                 self.logger.info(f"{pdf_path.name} 可能是扫描版PDF，尝试使用OCR...")
                 ocr_result = self._ocr_pdf(pdf_path)
-                if ocr_result and len(ocr_result.strip()) > len(text.strip()):
+                if ocr_result and len(ocr_result.strip()) > total_text_len:
                     text = ocr_result
 
             return self._convert_to_markdown(text) if text else ""
@@ -739,6 +873,16 @@ class OfficeToMdConverter(BaseConverter):
             self.logger.error(f"处理 {pdf_path} 时出错: {str(e)}")
             return ""
 
+    def _pypdf_page_text(self, page) -> str:
+        """
+        以 plain 模式提取页面文本：Markdown 输出不需要 layout 模式的坐标排版计算。
+        旧版 pypdf 不支持 extraction_mode 参数时退回默认调用。
+        """
+        try:
+            return page.extract_text(extraction_mode="plain")
+        except TypeError:
+            return page.extract_text()
+
     def _format_pypdf_metadata(self, metadata: Dict) -> str:
         lines = ["\n## 文档信息\n\n"]
         lines.append("| 属性 | 值 |\n")
@@ -765,17 +909,11 @@ class OfficeToMdConverter(BaseConverter):
         size_counts = Counter(font_sizes)
         body_size = size_counts.most_common(1)[0][0]
 
-        unique_sizes = sorted(set(font_sizes), reverse=True)
+        # 只需要比正文大的前5个字号，取 top-k 即可，不必对全部字号排序；
+        # 结果按级别 1..5 顺序插入，_detect_heading_level 直接按插入顺序遍历
+        heading_sizes = heapq.nlargest(5, (s for s in size_counts if s > body_size))
 
-        thresholds = {}
-        heading_sizes = [s for s in unique_sizes if s > body_size]
-
-        for i, size in enumerate(heading_sizes):
-            level = i + 1
-            if level <= 5:
-                thresholds[level] = size
-
-        return thresholds
+        return {level: size for level, size in enumerate(heading_sizes, 1)}
 
     def _detect_heading_level(self, spans: List[Dict], heading_thresholds: Dict[int, float]) -> Optional[int]:
         if not spans or not heading_thresholds:
@@ -791,15 +929,10 @@ class OfficeToMdConverter(BaseConverter):
         if len(text.split()) < 2 and not any_bold:
             return None
 
-        for level in sorted(heading_thresholds.keys()):
-            if max_size >= heading_thresholds[level]:
-                if level == 1 and not any_bold and max_size < heading_thresholds.get(1, 999) * 1.1:
-                    pass
+        for level, threshold in heading_thresholds.items():
+            if max_size >= threshold:
                 return level
 
-        if any_bold and max_size >= list(heading_thresholds.values())[-1] if heading_thresholds else False:
-            return max(heading_thresholds.keys())
-
         return None
 
     def _is_bold_span(self, span: Dict) -> bool:
@@ -814,32 +947,28 @@ class OfficeToMdConverter(BaseConverter):
         if page_count < 3:
             return {}
 
+        # 以 (文本, 纵坐标) 元组计数，无需为每个文本块拼接再拆分字符串键
         text_position_map = Counter()
 
-        for page_idx, page_spans in enumerate(all_page_spans):
+        for page_spans in all_page_spans:
             for span_info in page_spans:
                 text = span_info["text"].strip()
                 if len(text) > 100:
                     continue
-                if re.match(r'^\d+$', text):
+                # 纯数字（页码）不参与统计；isdecimal 与 \d 的字符范围一致
+                if text.isdecimal():
                     continue
 
-                bbox = span_info["bbox"]
-                y_pos = round(bbox[1], 0)
-                key = f"{text}||{y_pos}"
-                text_position_map[key] += 1
+                text_position_map[(text, round(span_info["bbox"][1], 0))] += 1
 
         header_footer_texts = {}
         threshold = max(3, page_count * 0.4)
 
-        for key, count in text_position_map.items():
+        for (text, _), count in text_position_map.items():
             if count >= threshold:
-                text = key.split("||")[0]
                 header_footer_texts[text] = count
 
         if page_heights:
-            header_zone = set()
-            footer_zone = set()
             for page_idx, page_spans in enumerate(all_page_spans):
                 if page_idx >= len(page_heights):
                     break
@@ -865,14 +994,41 @@ class OfficeToMdConverter(BaseConverter):
         if not header_footer_texts:
             return False
 
-        stripped = text.strip()
-        if stripped in header_footer_texts:
-            return True
-
-        for hf_text in header_footer_texts:
-            if stripped == hf_text:
+        # 字典成员判断即为逐项相等比较，无需再线性遍历一遍
+        return text.strip() in header_footer_texts
+
+    def _build_table_index(self, page_tables: List[Dict]) -> Tuple[List[float], List[Tuple], List[float]]:
+        """
+        按上边界排序本页表格的 bbox，供 _bbox_in_any_table 二分查找
+
+        Returns:
+            (上边界列表, 排序后的 bbox 列表, 前缀最大下边界列表)
+        """
+        rects = sorted(
+            (tuple(t["bbox"]) for t in page_tables if t.get("bbox") and len(t["bbox"]) == 4),
+            key=lambda r: r[1]
+        )
+        return [r[1] for r in rects], rects, list(accumulate((r[3] for r in rects), max))
+
+    def _bbox_in_any_table(self, bbox: Tuple, table_index: Tuple, margin: float = 1.0) -> bool:
+        """
+        判断 bbox 是否落在本页任意一张表格内
+
+        只检查上边界不低于 bbox 的表格（二分定位），并在前面所有表格的下边界都不够低时提前结束，
+        每个文本块不必与整页表格逐个比较
+        """
+        tops, rects, max_bottoms = table_index
+        if not rects:
+            return False
+        try:
+            top, bottom = bbox[1], bbox[3]
+        except Exception:
+            return False
+        i = bisect.bisect_right(tops, top + margin) - 1
+        while i >= 0 and max_bottoms[i] + margin >= bottom:
+            if self._bbox_inside_rect(bbox, rects[i], margin):
                 return True
-
+            i -= 1
         return False
 
     def _bbox_inside_rect(self, bbox: Tuple, rect: Tuple, margin: float = 1.0) -> bool:
@@ -907,8 +1063,8 @@ class OfficeToMdConverter(BaseConverter):
         # 补齐列数（pymupdf 偶尔返回不齐）
         max_cols = max(len(r) for r in cleaned_rows)
         for r in cleaned_rows:
-            while len(r) < max_cols:
-                r.append("")
+            if len(r) < max_cols:
+                r.extend([""] * (max_cols - len(r)))
 
         if max_cols == 0:
             return ""
@@ -918,9 +1074,8 @@ class OfficeToMdConverter(BaseConverter):
         out_lines.append("| " + " | ".join(cleaned_rows[0]) + " |")
         # 分隔行
         out_lines.append("| " + " | ".join(["---"] * max_cols) + " |")
-        # 数据行
-        for r in cleaned_rows[1:]:
-            out_lines.append("| " + " | ".join(r) + " |")
+        # 数据行：生成器直接喂给 extend，不再复制 cleaned_rows[1:]
+        out_lines.extend("| " + " | ".join(r) + " |" for r in islice(cleaned_rows, 1, None))
 
         return "\n".join(out_lines)
 
@@ -976,12 +1131,11 @@ class OfficeToMdConverter(BaseConverter):
         return f"图片 {page_num}-{img_num}"
 
     def _clean_text(self, text: str) -> str:
-        try:
-            text = text.encode('utf-8', errors='ignore').decode('utf-8')
-            text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t\r')
-        except Exception:
-            text = text.encode('ascii', errors='ignore').decode('ascii')
-        return text
+        # 快速路径：绝大多数数字版 PDF 文本不含需要清理的字符，直接返回避免整段复制
+        if not _UNCLEAN_CHARS_RE.search(text):
+            return text
+        # 代理项本身就是码位，和控制字符一起在一次 translate 中删除
+        return text.translate(_UNCLEAN_CHARS_TABLE)
 
     def _detect_language_for_ocr(self, image) -> str:
         try:
@@ -1005,19 +1159,34 @@ class OfficeToMdConverter(BaseConverter):
             if self.tesseract_cmd:
                 pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
 
-            images = convert_from_path(pdf_path, poppler_path=self.poppler_path)
+            # 灰度 PNG + 300 DPI：Tesseract 的最佳输入，数据量约为彩色 PPM 的一半；
+            # thread_count 让 poppler 并行渲染多页
+            images = convert_from_path(
+                pdf_path,
+                dpi=300,
+                fmt='png',
+                grayscale=True,
+                thread_count=max(1, (os.cpu_count() or 2) // 2),
+                poppler_path=self.poppler_path,
+            )
             text_parts = []
             detected_lang = None
+            api = None
 
-            for i, image in enumerate(images):
-                self.logger.info(f"正在OCR第 {i+1}/{len(images)} 页...")
+            try:
+                for i, image in enumerate(images):
+                    self.logger.info(f"正在OCR第 {i+1}/{len(images)} 页...")
 
-                if detected_lang is None:
-                    detected_lang = self._detect_language_for_ocr(image)
-                    self.logger.info(f"检测到OCR语言: {detected_lang}")
+                    if detected_lang is None:
+                        detected_lang = self._detect_language_for_ocr(image)
+                        self.logger.info(f"检测到OCR语言: {detected_lang}")
+                        api = self._open_tesserocr_api(detected_lang)
 
-                text = pytesseract.image_to_string(image, lang=detected_lang)
-                text_parts.append(text)
+                    text = self._ocr_image(image, detected_lang, api)
+                    text_parts.append(text)
+            finally:
+                if api is not None:
+                    api.End()
 
             combined_text = "\n\n".join(text_parts)
 
@@ -1029,6 +1198,55 @@ class OfficeToMdConverter(BaseConverter):
             self.logger.error(f"OCR处理失败: {str(e)}")
             return ""
 
+    def _open_tesserocr_api(self, lang: str):
+        """
+        打开 tesserocr 的 PyTessBaseAPI 实例。
+        tesserocr 不可用或初始化失败（如缺少 tessdata）时返回 None，回退到 pytesseract。
+        """
+        if tesserocr is None:
+            return None
+        try:
+            return tesserocr.PyTessBaseAPI(lang=lang)
+        except Exception as e:
+            self.logger.info(f"tesserocr初始化失败，回退到pytesseract: {e}")
+            return None
+
+    def _ocr_image(self, image, lang: str, api=None) -> str:
+        """
+        OCR 单页图像：优先走 tesserocr 内存接口，否则使用 pytesseract（会写临时文件）。
+        结果按页面像素哈希缓存在 output_dir/.ocr_cache/ 下，重复转换同一页面时直接复用。
+        """
+        cache_file = self._ocr_cache_file(image, lang)
+        if cache_file is not None and cache_file.is_file():
+            try:
+                return cache_file.read_text(encoding='utf-8')
+            except OSError:
+                pass
+
+        if api is not None:
+            api.SetImage(image)
+            text = api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(image, lang=lang)
+
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(text, encoding='utf-8')
+            except OSError as e:
+                self.logger.debug(f"写入OCR缓存失败: {e}")
+        return text
+
+    def _ocr_cache_file(self, image, lang: str) -> Optional[Path]:
+        """根据页面图像内容与 OCR 语言计算缓存文件路径，哈希失败时返回 None"""
+        try:
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(f"{lang}|{image.mode}|{image.size}".encode('utf-8'))
+            hasher.update(image.tobytes())
+        except Exception:
+            return None
+        return Path(self.output_dir) / '.ocr_cache' / f"{hasher.hexdigest()}.txt"
+
     def _merge_split_table_cells(self, text: str) -> str:
         lines = text.split('\n')
         if not lines:
@@ -1055,19 +1273,19 @@ class OfficeToMdConverter(BaseConverter):
         if len(lines) < 2:
             return []
 
+        # 每行只判定一次：原先同一行会作为 line、next_line 以及区域扩展时被重复判定
+        is_row = [self._is_definitive_table_row(line.strip()) for line in lines]
+
         regions = []
         i = 0
         while i < len(lines) - 1:
-            line = lines[i].strip()
-            next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
-
-            if self._is_definitive_table_row(line) and self._is_definitive_table_row(next_line):
-                pipe_count = line.count('|')
-                next_pipe_count = next_line.count('|')
+            if is_row[i] and is_row[i + 1]:
+                pipe_count = lines[i].count('|')
+                next_pipe_count = lines[i + 1].count('|')
                 if abs(pipe_count - next_pipe_count) <= 1:
                     start = i
                     end = i + 2
-                    while end < len(lines) and self._is_definitive_table_row(lines[end].strip()):
+                    while end < len(lines) and is_row[end]:
                         end += 1
                     if end - start >= 2:
                         regions.append((start, end))
@@ -1098,7 +1316,7 @@ class OfficeToMdConverter(BaseConverter):
             if avg_len > 60:
                 return False
 
-            non_empty = sum(1 for c in cells if c and not re.match(r'^[\s\-:]+$', c))
+            non_empty = sum(1 for c in cells if c and not _TABLE_FILLER_CELL_RE.match(c))
             if non_empty == 0:
                 return False
 
@@ -1143,8 +1361,10 @@ class OfficeToMdConverter(BaseConverter):
         return merged_lines
 
     def _is_table_separator(self, line: str) -> bool:
-        separator_pattern = r'^\|[\s\-:]+\|[\s\-:]+\|'
-        return bool(re.match(separator_pattern, line)) or line.strip() == '---' or line.strip() == '---'
+        # 表格分隔行必须以 | 开头：先做前缀判断，其余行只需比较是否为 ---
+        if line.startswith('|'):
+            return _TABLE_SEPARATOR_ROW_RE.match(line) is not None
+        return line.strip() == '---'
 
     def _looks_like_table_row(self, line: str) -> bool:
         if not line.startswith('|') and not line.endswith('|'):
@@ -1162,8 +1382,8 @@ class OfficeToMdConverter(BaseConverter):
         if len(cells1) != len(cells2):
             return False
 
-        non_empty_count1 = sum(1 for c in cells1 if c and not re.match(r'^[\s\-:]+$', c))
-        non_empty_count2 = sum(1 for c in cells2 if c and not re.match(r'^[\s\-:]+$', c))
+        non_empty_count1 = sum(1 for c in cells1 if c and not _TABLE_FILLER_CELL_RE.match(c))
+        non_empty_count2 = sum(1 for c in cells2 if c and not _TABLE_FILLER_CELL_RE.match(c))
 
         return non_empty_count2 > non_empty_count1 * 0.5
 
@@ -1173,7 +1393,7 @@ class OfficeToMdConverter(BaseConverter):
 
         merged_cells = []
         for c1, c2 in zip(cells1, cells2):
-            if c2 and not re.match(r'^[\s\-:]+$', c2):
+            if c2 and not _TABLE_FILLER_CELL_RE.match(c2):
                 if c1:
                     merged_cells.append(f"{c1} {c2}")
                 else:
@@ -1208,16 +1428,25 @@ class OfficeToMdConverter(BaseConverter):
             return "## Excel内容提取失败\n\n需安装相关库: pip install pandas tabulate openpyxl"
 
         try:
-            xls = pd.ExcelFile(excel_path)
-            md_text = ""
-
-            for sheet_name in xls.sheet_names:
-                df = pd.read_excel(excel_path, sheet_name=sheet_name)
-                md_text += f"## Sheet: {sheet_name}\n\n"
-                md_table = df.to_markdown(index=False)
-                md_text += md_table + "\n\n"
-
-            return md_text
+            # sheet_name=None 一次解析整个工作簿，避免逐表重复打开和解析
+            # 装有 python-calamine 时使用其 Rust 引擎，比 openpyxl 快数倍
+            engine = 'calamine' if lib_available("python-calamine", quiet=True) else None
+            try:
+                sheets = pd.read_excel(excel_path, sheet_name=None, engine=engine)
+            except ValueError as e:
+                # pandas < 2.2 不认识 calamine 引擎（Unknown engine），回退默认引擎重读
+                if engine is None:
+                    raise
+                self.logger.debug(f"calamine 引擎不可用，改用默认引擎读取 {excel_path}: {e}")
+                sheets = pd.read_excel(excel_path, sheet_name=None)
+            parts = []
+
+            for sheet_name, df in sheets.items():
+                parts.append(f"## Sheet: {sheet_name}\n\n")
+                parts.append(df.to_markdown(index=False))
+                parts.append("\n\n")
+
+            return "".join(parts)
 
         except ImportError as e:
             if "openpyxl" in str(e):
@@ -1241,18 +1470,23 @@ class OfficeToMdConverter(BaseConverter):
 
         try:
             prs = Presentation(pptx_path)
-            md_text = ""
+            parts = []
 
             for i, slide in enumerate(prs.slides):
-                md_text += f"## 幻灯片 {i+1}\n\n"
+                parts.append(f"## 幻灯片 {i+1}\n\n")
 
                 for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        md_text += f"{shape.text}\n\n"
+                    # has_text_frame 是 BaseShape 上的廉价判断，图片/图表等直接跳过；
+                    # text_frame.text 保留段内软换行（<a:br>）和域文本（页码、日期等）
+                    if not shape.has_text_frame:
+                        continue
+                    text = shape.text_frame.text
+                    if text.strip():
+                        parts.append(f"{text}\n\n")
 
-                md_text += "---\n\n"
+                parts.append("---\n\n")
 
-            return md_text
+            return "".join(parts)
 
         except Exception as e:
             self.logger.error(f"处理PowerPoint文档 {pptx_path} 时出错: {str(e)}")
@@ -1260,13 +1494,15 @@ class OfficeToMdConverter(BaseConverter):
 
     def _extract_text_from_html(self, html_path: Path) -> str:
         _resolve_dependencies()
-        if html2text is None:
-            self.logger.error("html2text库未安装，无法处理HTML文件")
-            return "## HTML内容提取失败\n\n需安装html2text库: pip install html2text"
+        if not _html_available():
+            self.logger.error("selectolax和html2text库均未安装，无法处理HTML文件")
+            return "## HTML内容提取失败\n\n需安装selectolax或html2text库: pip install selectolax 或 pip install html2text"
 
         try:
             with open(html_path, "r", encoding="utf-8") as f:
                 html_content = f.read()
+            if SelectolaxParser is not None:
+                return self._html_to_md_with_selectolax(html_content)
             h = html2text.HTML2Text()
             h.ignore_links = False
             md_text = h.handle(html_content)
@@ -1275,6 +1511,89 @@ class OfficeToMdConverter(BaseConverter):
             self.logger.error(f"处理HTML文档 {html_path} 时出错: {str(e)}")
             return ""
 
+    def _html_to_md_with_selectolax(self, html_content: str) -> str:
+        """用 selectolax 解析 HTML，再遍历 DOM 树生成 Markdown"""
+        tree = SelectolaxParser(html_content)
+        root = tree.body or tree.root
+        if root is None:
+            return ""
+        md_text = self._html_children_to_md(root)
+        # 块级元素之间的空白文本节点会留下只含空格的行：清掉这些行并把空行压缩为最多一行
+        md_text = _BLANK_LINES_RE.sub(lambda m: '\n' * min(m.group().count('\n'), 2), md_text)
+        return md_text.strip() + "\n"
+
+    def _html_children_to_md(self, node) -> str:
+        return "".join(self._html_node_to_md(child) for child in node.iter(include_text=True))
+
+    def _html_node_to_md(self, node) -> str:
+        tag = node.tag
+
+        if tag == '-text':
+            return _HTML_WS_RE.sub(' ', node.text(deep=False))
+        if tag in _HTML_SKIP_TAGS:
+            return ""
+        if tag == 'br':
+            return "  \n"
+        if tag == 'hr':
+            return "\n\n---\n\n"
+        if tag == 'img':
+            src = node.attributes.get('src')
+            return f"![{node.attributes.get('alt') or ''}]({src})" if src else ""
+        if tag == 'pre':
+            code = node.text(deep=True).strip('\n')
+            return f"\n\n```\n{code}\n```\n\n"
+        if tag == 'code':
+            code = node.text(deep=True)
+            return f"`{code}`" if code else ""
+        if tag in ('ul', 'ol'):
+            return self._html_list_to_md(node, ordered=(tag == 'ol'))
+        if tag == 'table':
+            rows = [
+                [self._html_children_to_md(cell).strip() for cell in tr.iter() if cell.tag in ('th', 'td')]
+                for tr in node.css('tr')
+            ]
+            table_md = self._render_table_to_md([row for row in rows if row])
+            return f"\n\n{table_md}\n\n" if table_md else ""
+
+        inner = self._html_children_to_md(node)
+
+        if len(tag) == 2 and tag[0] == 'h' and tag[1] in '123456':
+            text = inner.strip()
+            return f"\n\n{'#' * int(tag[1])} {text}\n\n" if text else ""
+        if tag in ('strong', 'b'):
+            text = inner.strip()
+            return f"**{text}**" if text else ""
+        if tag in ('em', 'i'):
+            text = inner.strip()
+            return f"*{text}*" if text else ""
+        if tag == 'a':
+            text = inner.strip()
+            href = node.attributes.get('href')
+            return f"[{text}]({href})" if href and text else text
+        if tag == 'blockquote':
+            # 多个段落之间只保留一个空行，引用中段落间隔为单独一行 ">"
+            lines = _BLANK_LINES_RE.sub('\n\n', inner.strip()).split('\n')
+            return "\n\n" + "\n".join(f"> {line}".rstrip() for line in lines) + "\n\n"
+        if tag in _HTML_BLOCK_TAGS:
+            text = inner.strip()
+            return f"\n\n{text}\n\n" if text else ""
+        return inner
+
+    def _html_list_to_md(self, node, ordered: bool) -> str:
+        lines = []
+        index = 1
+        for item in node.iter():
+            if item.tag != 'li':
+                continue
+            content = re.sub(r'\n{2,}', '\n', self._html_children_to_md(item).strip())
+            marker = f"{index}." if ordered else "-"
+            index += 1
+            first, *rest = content.split('\n')
+            lines.append(f"{marker} {first}")
+            # 嵌套列表等后续行缩进到列表项内容下
+            lines.extend(f"   {line}" if line else "" for line in rest)
+        return "\n\n" + "\n".join(lines) + "\n\n" if lines else ""
+
     def _convert_to_markdown(self, text: str) -> str:
         md_text = text
 
@@ -1352,37 +1671,11 @@ class OfficeToMdConverter(BaseConverter):
         if not cleaned:
             return False
         segments = cleaned.split('|')
-        return all(re.match(r'^:?-+:?$', seg) for seg in segments)
+        return all(_TABLE_SEPARATOR_SEGMENT_RE.match(seg) for seg in segments)
 
     def _preserve_code_blocks(self, text: str) -> str:
-        lines = text.split('\n')
-        result_lines = []
-        i = 0
-        in_code_block = False
-
-        while i < len(lines):
-            line = lines[i]
-
-            if line.strip().startswith('```'):
-                result_lines.append(line)
-                in_code_block = not in_code_block
-                i += 1
-                continue
-
-            if not in_code_block:
-                if self._is_indented_code_block(line):
-                    result_lines.append(line)
-                else:
-                    result_lines.append(line)
-            else:
-                result_lines.append(line)
-
-            i += 1
-
-        return '\n'.join(result_lines)
-
-    def _is_indented_code_block(self, line: str) -> bool:
-        return line.startswith('    ') or line.startswith('\t')
+        # 围栏代码块与缩进代码块都原样保留；逐行拆分再拼接只会复制出一份同样的全文
+        return text
 
     def _preserve_inline_code(self, text: str) -> str:
         return text
@@ -1424,35 +1717,26 @@ class OfficeToMdConverter(BaseConverter):
 
         output_file = output_path / f"{file_name}.md"
 
-        try:
-            md_text = md_text.encode('utf-8', errors='ignore').decode('utf-8')
-            md_text = ''.join(char for char in md_text if ord(char) >= 32 or char in '\n\t\r')
-        except Exception as e:
-            self.logger.warning(f"文本清理时出错: {e}，将使用替换策略")
-            md_text = md_text.encode('ascii', errors='ignore').decode('ascii')
+        md_text = self._clean_text(md_text)
 
+        converted_date = self._batch_ts or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         header = f"""---
 title: {file_name} Document
 source_file: {file_path.name}
 file_type: {file_type}
-converted_date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+converted_date: {converted_date}
 ---
 
 """
         md_text = header + md_text
 
+        # 一次编码、一次写入，绕过文本模式的 TextIOWrapper；换行保持为 \n，不做平台转换
+        # errors='replace' 保证编码不会失败，无需再退回 ASCII
         try:
-            with open(output_file, 'w', encoding='utf-8', errors='replace') as f:
-                f.write(md_text)
+            output_file.write_bytes(md_text.encode('utf-8', errors='replace'))
         except Exception as e:
             self.logger.error(f"保存文件时出错: {e}")
-            try:
-                with open(output_file, 'w', encoding='ascii', errors='replace') as f:
-                    f.write(md_text)
-                self.logger.warning(f"使用ASCII编码保存文件: {output_file}")
-            except Exception as e2:
-                self.logger.error(f"使用ASCII编码保存文件也失败: {e2}")
-                raise e2
+            raise
 
         self.logger.info(f"已保存到 {output_file}")
         return str(output_file)
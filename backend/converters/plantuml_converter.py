@@ -1,5 +1,7 @@
 from typing import List, Optional, Dict, Any
 import os
+import atexit
+import shlex
 import subprocess
 import tempfile
 import shutil
@@ -8,8 +10,97 @@ from pathlib import Path
 from dataclasses import dataclass, field
 import re
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from .base_converter import BaseConverter
+from .dep_check import find_command
+
+
+# 依赖检查结果跨实例缓存，避免每次构造转换器都启动 java/dot 子进程
+# (java命令, JAR路径) -> (检查时间, DependencyStatus)
+_DEPENDENCY_CACHE: Dict[tuple, tuple] = {}
+_DEPENDENCY_CACHE_TTL = 300  # 缓存有效期（秒）
+_DEPENDENCY_CACHE_LOCK = threading.Lock()
+
+# (配置的JAR路径, PLANTUML_JAR环境变量) -> 找到的JAR路径
+_JAR_PATH_CACHE: Dict[tuple, str] = {}
+
+# 与进程状态无关的JAR候选路径，导入时计算一次（当前目录可能变化，仍在查找时获取）
+_HOME_PLANTUML_JAR = os.path.join(os.path.expanduser('~'), '.plantuml', 'plantuml.jar')
+_PROJECT_TOOLS_PLANTUML_JAR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'tools', 'plantuml.jar')
+)
+
+# 版本探测输出解析
+_JAVA_VERSION_RE = re.compile(r'version "([^"]+)"')
+_PLANTUML_VERSION_RE = re.compile(r'PlantUML version ([\d\.]+)')
+_GRAPHVIZ_VERSION_RE = re.compile(r'dot - graphviz version ([\d\.]+)')
+# -pipe 模式下 PlantUML 对语法错误输出的报告以单独一行 ERROR 开头
+_PIPE_ERROR_RE = re.compile(rb'^ERROR\r?$', re.MULTILINE)
+
+
+def _probe_version(command: List[str], pattern: re.Pattern, timeout: int = 10) -> tuple[bool, Optional[str]]:
+    """
+    运行版本探测命令并从输出中提取版本号
+    
+    stderr合并到stdout，只解码一次输出（java和dot把版本信息写到stderr）
+    
+    Args:
+        command: 版本探测命令
+        pattern: 预编译的版本号正则，第1组为版本号
+        timeout: 超时时间（秒）
+        
+    Returns:
+        tuple[bool, Optional[str]]: (命令是否成功, 版本号；未能解析时为"未知版本")
+    """
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            timeout=timeout
+        )
+    except Exception:
+        return False, None
+    
+    if result.returncode != 0:
+        return False, None
+    
+    version_match = pattern.search(result.stdout)
+    return True, version_match.group(1) if version_match else "未知版本"
+
+
+
+def _find_first_file(paths: List[str]) -> Optional[str]:
+    """
+    按顺序返回第一个存在的文件路径
+    
+    同一父目录下的候选路径只做一次 os.scandir，复用目录项信息判断是否为文件
+    
+    Args:
+        paths: 候选文件路径列表（按优先级排列）
+        
+    Returns:
+        Optional[str]: 第一个存在的文件路径，均不存在返回None
+    """
+    dir_files: Dict[str, frozenset] = {}
+    for path in paths:
+        parent, name = os.path.split(os.path.abspath(path))
+        parent_key = os.path.normcase(parent)
+        if parent_key not in dir_files:
+            try:
+                with os.scandir(parent) as entries:
+                    dir_files[parent_key] = frozenset(
+                        os.path.normcase(entry.name) for entry in entries if entry.is_file()
+                    )
+            except OSError:
+                dir_files[parent_key] = frozenset()
+        if os.path.normcase(name) in dir_files[parent_key]:
+            return path
+    return None
 
 
 @dataclass
@@ -22,6 +113,13 @@ class PlantUMLConfig:
     java_options: List[str] = field(default_factory=list)
     graphviz_dot_path: Optional[str] = None
     timeout: int = 60  # 转换超时时间（秒）
+    max_workers: Optional[int] = None  # 目录批量转换的并发数，默认 min(文件数, CPU 核数)
+    pipe_mode: bool = False  # 单文件转换复用常驻的 -pipe JVM 进程
+    nbthread: Optional[str] = 'auto'  # -nbthread 渲染线程数，None 表示不传；布局主要耗在 Graphviz，收益视图而定
+    nometadata: bool = True  # -nometadata 不在PNG中嵌入图源元数据
+    jvm_profile: str = 'auto'  # 未指定java_options时按运行方式调优JVM参数：'auto' 或 'none'
+    incremental: bool = True  # 输出PNG比源文件新时跳过转换
+    cds_archive: Optional[str] = None  # AppCDS归档文件（java -XX:ArchiveClassesAtExit 生成），存在时用于加速启动
 
 
 @dataclass
@@ -40,18 +138,182 @@ class DependencyStatus:
         return self.java_available and bool(self.plantuml_jar_path)
 
 
+class _PipedPlantUML:
+    """
+    常驻的 PlantUML -pipe 进程
+    
+    JVM 只启动一次：每次把一张图的源码写入 stdin，从 stdout 读回图片字节，
+    图片之间以 -pipedelimitor 指定的分隔行隔开。进程异常或超时后会被关闭，
+    下次调用时自动重启。
+    
+    stderr 合并到 stdout：PlantUML 在写出图片之前输出错误报告，
+    合并后错误报告与对应的图片在同一个流里按顺序到达，不存在跨流的先后竞争。
+    """
+    
+    DELIMITER = b'___MARKDOWN_HUB_PLANTUML_END___'
+    # 图片起始标记，之前的内容是 stderr 诊断信息（错误报告、JVM 启动提示等）
+    IMAGE_SIGNATURES = (b'\x89PNG', b'<?xml', b'<svg')
+    
+    def __init__(self, command: List[str]):
+        self._command = command + ['-pipe', '-pipedelimitor', self.DELIMITER.decode('ascii')]
+        self._process: Optional[subprocess.Popen] = None
+        self._chunks: Optional[queue.Queue] = None
+        self._lock = threading.Lock()
+    
+    def _start(self) -> None:
+        self._process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        self._chunks = queue.Queue()
+        # 后台线程持续读取 stdout，主线程按超时从队列取数据（Windows 管道不支持 select）
+        reader = threading.Thread(
+            target=self._read_stdout, args=(self._process.stdout, self._chunks), daemon=True
+        )
+        reader.start()
+    
+    @staticmethod
+    def _read_stdout(stream, chunks: queue.Queue) -> None:
+        while True:
+            data = stream.read1(65536) if hasattr(stream, 'read1') else stream.read(65536)
+            chunks.put(data)
+            if not data:
+                return
+    
+    def render(self, source: str, charset: str, timeout: float) -> Optional[bytes]:
+        """
+        渲染一张图
+        
+        Args:
+            source: 只包含一个 @startuml...@enduml 的源码
+            charset: 源码编码
+            timeout: 超时时间（秒）
+            
+        Returns:
+            Optional[bytes]: 图片字节，失败或语法错误返回None
+        """
+        with self._lock:
+            try:
+                if self._process is None or self._process.poll() is not None:
+                    self._start()
+                
+                if not source.endswith('\n'):
+                    source += '\n'
+                self._process.stdin.write(source.encode(charset))
+                self._process.stdin.flush()
+                
+                marker = self.DELIMITER + b'\n'
+                buffer = bytearray()
+                deadline = time.monotonic() + timeout
+                while True:
+                    index = buffer.find(marker)
+                    if index >= 0:
+                        if len(buffer) > index + len(marker):
+                            # 分隔符之后不应再有数据，说明输入被拆成了多张图，状态已不可信
+                            self.close()
+                        return self._strip_diagnostics(bytes(buffer[:index]).rstrip(b'\r\n'))
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"PlantUML -pipe 渲染超时 ({timeout}秒)")
+                    data = self._chunks.get(timeout=remaining)
+                    if not data:
+                        raise RuntimeError("PlantUML -pipe 进程意外退出")
+                    buffer.extend(data)
+            except Exception:
+                self.close()
+                raise
+    
+    @classmethod
+    def _strip_diagnostics(cls, payload: bytes) -> Optional[bytes]:
+        """
+        去掉图片前的诊断文本；语法错误时 PlantUML 仍会输出一张错误图，此时返回None，
+        由调用方改用命令行方式转换并报告失败
+        """
+        starts = [i for i in (payload.find(sig) for sig in cls.IMAGE_SIGNATURES) if i >= 0]
+        start = min(starts) if starts else len(payload)
+        if _PIPE_ERROR_RE.search(payload, 0, start):
+            return None
+        return (payload[start:] if starts else payload) or None
+    
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            process.wait(timeout=5)
+        except Exception:
+            process.kill()
+
+
+# 进程内共享的常驻 -pipe 进程：命令行 -> _PipedPlantUML
+# 同一进程中按请求新建的转换器实例复用同一个已预热的JVM，而不是每个实例各启动一个
+_SHARED_PIPES: Dict[tuple, _PipedPlantUML] = {}
+_SHARED_PIPES_LOCK = threading.Lock()
+
+
+def _get_shared_pipe(command: List[str]) -> _PipedPlantUML:
+    """获取（必要时创建）与命令行对应的共享 -pipe 进程"""
+    key = tuple(command)
+    with _SHARED_PIPES_LOCK:
+        pipe = _SHARED_PIPES.get(key)
+        if pipe is None:
+            pipe = _SHARED_PIPES[key] = _PipedPlantUML(command)
+        return pipe
+
+
+def shutdown_plantuml_pipes() -> None:
+    """关闭所有共享的 -pipe JVM 进程（解释器退出时自动调用）"""
+    with _SHARED_PIPES_LOCK:
+        pipes = list(_SHARED_PIPES.values())
+        _SHARED_PIPES.clear()
+    for pipe in pipes:
+        pipe.close()
+
+
+atexit.register(shutdown_plantuml_pipes)
+
+
 class PlantUMLConverter(BaseConverter):
     """
     PlantUML到PNG转换器
     继承BaseConverter，专门处理PlantUML文件转换
     """
     
-    # 支持的文件扩展名
-    SUPPORTED_EXTENSIONS = ['.puml', '.plantuml', '.pu']
+    # 支持的文件扩展名（小写，匹配前先把扩展名转为小写）
+    SUPPORTED_EXTENSIONS = frozenset({'.puml', '.plantuml', '.pu'})
     
     # PlantUML JAR文件名
     PLANTUML_JAR_NAME = 'plantuml.jar'
     
+    # 单次JVM调用批量处理的最大文件数，避免命令行超出Windows长度限制
+    BATCH_CHUNK_SIZE = 100
+    
+    # 转换失败时解码的错误输出末尾字节数
+    ERROR_TAIL_BYTES = 8192
+    
+    # 常见错误模式，合并为一个正则一次扫描，取输出中最先出现的错误对应的提示
+    _ERROR_MESSAGES = {
+        'syntax': '语法错误',
+        'graphviz': 'Graphviz未安装或未找到',
+        'oom': '内存不足，请增加Java堆内存',
+        'not_found': '文件未找到',
+        'access': '文件访问权限不足',
+    }
+    _ERROR_RE = re.compile(
+        r'(?P<syntax>Syntax error)'
+        r'|(?P<graphviz>Cannot find Graphviz)'
+        r'|(?P<oom>OutOfMemoryError)'
+        r'|(?P<not_found>FileNotFoundException)'
+        r'|(?P<access>AccessDeniedException)',
+        re.IGNORECASE
+    )
+    
     # 默认配置
     DEFAULT_CONFIG = {
         'dpi': 300,
@@ -66,7 +328,8 @@ class PlantUMLConverter(BaseConverter):
         # 过滤PlantUMLConfig支持的参数
         plantuml_config_keys = {
             'dpi', 'format', 'charset', 'plantuml_jar_path', 
-            'java_options', 'graphviz_dot_path', 'timeout'
+            'java_options', 'graphviz_dot_path', 'timeout', 'max_workers', 'pipe_mode',
+            'nbthread', 'nometadata', 'jvm_profile', 'cds_archive', 'incremental'
         }
         
         # 合并默认配置，只包含PlantUMLConfig支持的参数
@@ -81,9 +344,32 @@ class PlantUMLConverter(BaseConverter):
         self._dependency_status: Optional[DependencyStatus] = None
         self._jar_path_cache: Optional[str] = None
         
+        # 常驻 -pipe 进程（pipe_mode 开启时按需获取，进程内共享）
+        self._pipe: Optional[_PipedPlantUML] = None
+        
         # 检查依赖
         self._check_dependencies()
     
+    def __enter__(self) -> 'PlantUMLConverter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def close(self) -> None:
+        """
+        释放对共享 -pipe 进程的引用
+        
+        JVM 保持预热供后续转换器实例复用，解释器退出时由 shutdown_plantuml_pipes 统一关闭
+        """
+        self._pipe = None
+    
     def convert(self, input_path: str) -> List[str]:
         """
         转换PlantUML文件为PNG
@@ -111,19 +397,164 @@ class PlantUMLConverter(BaseConverter):
                 output_files.append(result)
         else:
             # 目录批量转换
-            plantuml_files = self._get_files_by_extension(input_path, self.SUPPORTED_EXTENSIONS)
-            for file_path in plantuml_files:
-                try:
-                    result = self._convert_single_file(file_path)
-                    if result:
-                        output_files.append(result)
-                except Exception as e:
-                    self.logger.error(f"转换文件 {file_path} 失败: {e}")
-                    continue
+            plantuml_files = list(self._iter_plantuml_files(input_path))
+            
+            # 增量模式下输出已是最新的文件不再交给JVM
+            results: Dict[str, str] = {}
+            if self.plantuml_config.incremental:
+                for file_path in plantuml_files:
+                    up_to_date = self._get_up_to_date_output(file_path)
+                    if up_to_date:
+                        results[file_path] = up_to_date
+            pending = [file_path for file_path in plantuml_files if file_path not in results]
+            
+            # 先在一次JVM调用中批量转换，未能批量生成的文件再逐文件并发转换
+            if len(pending) > 1:
+                results.update(self._convert_files_batch(pending))
+            remaining = [file_path for file_path in pending if file_path not in results]
+            if remaining:
+                results.update(self._convert_files_parallel(remaining))
+            output_files = [results[file_path] for file_path in plantuml_files if file_path in results]
         
         self.logger.info(f"PlantUML转换完成，共生成 {len(output_files)} 个文件")
         return output_files
     
+    def _iter_plantuml_files(self, directory: str):
+        """
+        遍历目录下的PlantUML文件（不递归子目录，输出文件按文件名平铺到输出目录）
+        
+        Args:
+            directory: 目录路径
+            
+        Yields:
+            str: PlantUML文件路径
+        """
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if (entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in self.SUPPORTED_EXTENSIONS):
+                    yield entry.path
+    
+    def _convert_files_batch(self, plantuml_files: List[str]) -> Dict[str, str]:
+        """
+        在一次JVM调用中批量转换多个PlantUML文件，摊薄JVM启动开销
+        
+        批量模式无法使用-filename强制输出文件名，@startuml带名称的图会生成其他文件名；
+        这些文件以及所在批次渲染失败的文件不会出现在返回结果中，由调用方回退到逐文件转换
+        
+        Args:
+            plantuml_files: PlantUML文件路径列表
+            
+        Returns:
+            Dict[str, str]: 输入文件路径 -> 输出文件路径
+        """
+        results: Dict[str, str] = {}
+        # 批量输出先写入输出目录下的私有临时目录，再按原文件名移入输出目录：
+        # 带名称的图生成的其他文件名随临时目录一起清理，不会残留或被误认成其他文件的输出
+        work_dir = tempfile.mkdtemp(prefix='.plantuml_batch_', dir=self.output_dir)
+        # 预处理后的临时文件保留原文件名，保证输出PNG与原文件同名
+        source_dir = os.path.join(work_dir, 'src')
+        batch_output_dir = os.path.join(work_dir, 'out')
+        os.makedirs(source_dir)
+        os.makedirs(batch_output_dir)
+        
+        try:
+            input_files = [self._preprocess_plantuml_file(file_path, source_dir) for file_path in plantuml_files]
+            
+            # 始终显式传入文件列表：把目录交给PlantUML会连同 .md/.txt/.java 等文件里的
+            # @startuml 一起渲染，同名输出会覆盖 .puml 的结果
+            succeeded: List[str] = []
+            for start in range(0, len(input_files), self.BATCH_CHUNK_SIZE):
+                end = start + self.BATCH_CHUNK_SIZE
+                # 返回非零或超时的批次不收取输出：语法错误时PlantUML照样写出错误图，
+                # 超时被杀时PNG可能只写了一半，这些文件交由逐文件转换（会检查返回码）
+                if self._execute_plantuml_batch(input_files[start:end], os.path.abspath(batch_output_dir)):
+                    succeeded.extend(plantuml_files[start:end])
+            
+            for file_path in succeeded:
+                expected_output = Path(self._generate_output_path(file_path, '.png'))
+                generated = os.path.join(batch_output_dir, expected_output.name)
+                try:
+                    os.replace(generated, expected_output)
+                except OSError:
+                    continue
+                self.logger.info("PlantUML转换成功: %s", expected_output)
+                results[file_path] = str(expected_output)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        missing = len(plantuml_files) - len(results)
+        if missing:
+            self.logger.info(f"批量转换未生成 {missing} 个文件的预期输出，改为逐文件转换")
+        return results
+    
+    def _execute_plantuml_batch(self, input_files: List[str], output_dir: str) -> bool:
+        """
+        在单个JVM进程中转换多个PlantUML文件
+        
+        Args:
+            input_files: 输入PlantUML文件路径列表
+            output_dir: 输出目录（绝对路径）
+            
+        Returns:
+            bool: 命令是否成功返回（部分文件失败时也可能返回False）
+        """
+        command = self._build_plantuml_base_command()
+        command.extend(['-o', output_dir])
+        command.extend(input_files)
+        
+        try:
+            result = subprocess.run(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=self.plantuml_config.timeout * len(input_files)
+            )
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"PlantUML批量转换超时: {len(input_files)} 个文件")
+            return False
+        except Exception as e:
+            self.logger.error(f"执行PlantUML批量命令失败: {e}")
+            return False
+        
+        if result.returncode != 0:
+            error_msg = self._parse_plantuml_error(self._decode_error_tail(result.stderr))
+            self.logger.warning(f"PlantUML批量转换存在失败 (返回码: {result.returncode}): {error_msg}")
+            return False
+        return True
+    
+    def _convert_files_parallel(self, plantuml_files: List[str]) -> Dict[str, str]:
+        """
+        并发转换多个PlantUML文件
+        
+        每个文件都由独立的java子进程渲染，线程在等待子进程时会释放GIL，
+        因此使用线程池即可让多个JVM同时运行
+        
+        Args:
+            plantuml_files: PlantUML文件路径列表
+            
+        Returns:
+            Dict[str, str]: 输入文件路径 -> 成功生成的输出文件路径
+        """
+        if not plantuml_files:
+            return {}
+        
+        max_workers = self.plantuml_config.max_workers or (os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, len(plantuml_files)))
+        
+        def convert(file_path: str) -> Optional[str]:
+            try:
+                return self._convert_single_file(file_path)
+            except Exception as e:
+                self.logger.error(f"转换文件 {file_path} 失败: {e}")
+                return None
+        
+        # executor.map 按输入顺序返回结果，无需维护 future -> 文件 的映射表
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outputs = list(executor.map(convert, plantuml_files))
+        
+        return {file_path: output for file_path, output in zip(plantuml_files, outputs) if output}
+    
     def _convert_single_file(self, file_path: str) -> Optional[str]:
         """
         转换单个PlantUML文件
@@ -135,16 +566,26 @@ class PlantUMLConverter(BaseConverter):
             Optional[str]: 输出文件路径，失败返回None
         """
         try:
-            input_file = Path(file_path)
-            output_file = Path(self._generate_output_path(file_path, '.png'))
+            # 热路径上只使用字符串路径，避免逐文件构造Path对象
+            output_file = self._generate_output_path(file_path, '.png')
+            
+            if self.plantuml_config.incremental:
+                up_to_date = self._get_up_to_date_output(file_path, output_file)
+                if up_to_date:
+                    return up_to_date
             
-            self.logger.info(f"开始转换PlantUML文件: {input_file} -> {output_file}")
+            self.logger.info("开始转换PlantUML文件: %s -> %s", file_path, output_file)
+            
+            if self.plantuml_config.pipe_mode:
+                result = self._convert_via_pipe(file_path, output_file)
+                if result:
+                    return result
             
             # 预处理PlantUML文件，添加中文字体支持
             preprocessed_file = self._preprocess_plantuml_file(file_path)
             
             # 执行转换
-            success = self._execute_plantuml_command(preprocessed_file, str(output_file))
+            success = self._execute_plantuml_command(preprocessed_file, output_file)
             
             # 清理临时文件
             if preprocessed_file != file_path:
@@ -153,47 +594,132 @@ class PlantUMLConverter(BaseConverter):
                 except:
                     pass
             
-            if success:
-                # 验证并修复输出文件名
-                actual_output_file = self._verify_and_fix_output_filename(input_file, output_file)
-                
-                if actual_output_file and actual_output_file.exists():
-                    self.logger.info(f"PlantUML转换成功: {actual_output_file}")
-                    return str(actual_output_file)
-                else:
-                    self.logger.error(f"PlantUML转换后未找到输出文件: {input_file}")
-                    return None
-            else:
-                self.logger.error(f"PlantUML转换失败: {input_file}")
+            if not success:
+                self.logger.error(f"PlantUML转换失败: {file_path}")
                 return None
+            
+            # -filename 已指定输出文件名，正常情况下一次stat即可确认
+            if os.path.isfile(output_file):
+                self.logger.info("PlantUML转换成功: %s", output_file)
+                return output_file
+            
+            # 输出文件名与期望不符时才扫描输出目录并修复
+            actual_output_file = self._verify_and_fix_output_filename(Path(file_path), Path(output_file))
+            if actual_output_file:
+                self.logger.info("PlantUML转换成功: %s", actual_output_file)
+                return str(actual_output_file)
+            
+            self.logger.error(f"PlantUML转换后未找到输出文件: {file_path}")
+            return None
                 
         except Exception as e:
             self._handle_conversion_error(e, file_path)
             return None
     
-    def _check_dependencies(self) -> DependencyStatus:
+    def _get_up_to_date_output(self, file_path: str, output_file: Optional[str] = None) -> Optional[str]:
+        """
+        输出文件存在且不比源文件旧时返回输出路径（只需两次stat），否则返回None
+        
+        Args:
+            file_path: PlantUML文件路径
+            output_file: 输出文件路径，默认按输入文件名生成
+            
+        Returns:
+            Optional[str]: 可直接复用的输出文件路径
+        """
+        if output_file is None:
+            output_file = self._generate_output_path(file_path, '.png')
+        try:
+            if os.stat(output_file).st_mtime < os.stat(file_path).st_mtime:
+                return None
+        except OSError:
+            return None
+        self.logger.debug("输出已是最新，跳过转换: %s", output_file)
+        return output_file
+    
+    def _convert_via_pipe(self, file_path: str, output_file: str) -> Optional[str]:
+        """
+        通过常驻的 -pipe JVM 转换单个文件，省去每个文件的JVM启动
+        
+        管道模式下 !include 的相对路径不再以源文件目录为基准，且一次只能读回一张图，
+        因此含 !include 或多个 @startuml 的文件返回None，交由命令行方式处理
+        
+        Returns:
+            Optional[str]: 输出文件路径，不适用或失败返回None
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            self.logger.warning(f"读取PlantUML文件失败: {e}")
+            return None
+        
+        if '!include' in content or content.count('@startuml') != 1:
+            return None
+        
+        if self._needs_font_preprocessing(content):
+            content = self._build_preprocessed_content(content)
+        
+        if self._pipe is None:
+            self._pipe = _get_shared_pipe(self._build_plantuml_base_command(long_lived=True))
+        
+        try:
+            image = self._pipe.render(content, self.plantuml_config.charset, self.plantuml_config.timeout)
+        except Exception as e:
+            self.logger.warning(f"PlantUML管道模式转换失败，改用命令行方式: {e}")
+            return None
+        
+        if not image or (self.plantuml_config.format == 'png' and not image.startswith(b'\x89PNG')):
+            self.logger.warning(f"PlantUML管道模式未返回有效图片，改用命令行方式: {file_path}")
+            return None
+        
+        with open(output_file, 'wb') as f:
+            f.write(image)
+        self.logger.info("PlantUML转换成功: %s", output_file)
+        return output_file
+    
+    def _check_dependencies(self, force_refresh: bool = False) -> DependencyStatus:
         """
         检查PlantUML转换依赖
         
+        检查结果按JAR路径在进程内缓存（有效期 _DEPENDENCY_CACHE_TTL 秒），
+        同一进程内新建的转换器直接复用，不再重复启动子进程
+        
+        Args:
+            force_refresh: 忽略实例和进程级缓存，重新检查
+            
         Returns:
             DependencyStatus: 依赖检查结果
         """
-        if self._dependency_status is not None:
+        if self._dependency_status is not None and not force_refresh:
             return self._dependency_status
         
-        self.logger.info("检查PlantUML转换依赖...")
-        
-        # 检查Java
-        java_available, java_version = self._check_java_availability()
-        
         # 检查PlantUML JAR
         plantuml_jar_path = self._get_plantuml_jar_path()
+        cache_key = ('java', plantuml_jar_path)
+        
+        if not force_refresh:
+            with _DEPENDENCY_CACHE_LOCK:
+                cached = _DEPENDENCY_CACHE.get(cache_key)
+            if cached and time.monotonic() - cached[0] < _DEPENDENCY_CACHE_TTL:
+                self._dependency_status = cached[1]
+                return self._dependency_status
+        
+        self.logger.info("检查PlantUML转换依赖...")
+        
         plantuml_version = None
         if plantuml_jar_path:
-            plantuml_version = self._get_plantuml_version(plantuml_jar_path)
-        
-        # 检查Graphviz
-        graphviz_available, graphviz_version = self._check_graphviz_availability()
+            # 检查Java
+            java_available, java_version = self._check_java_availability()
+            if java_available:
+                plantuml_version = self._get_plantuml_version(plantuml_jar_path)
+            
+            # 检查Graphviz
+            graphviz_available, graphviz_version = self._check_graphviz_availability()
+        else:
+            # 没有JAR包转换无法进行，只看命令是否存在，不再启动版本探测子进程
+            java_available, java_version = find_command('java') is not None, None
+            graphviz_available, graphviz_version = find_command('dot') is not None, None
         
         self._dependency_status = DependencyStatus(
             java_available=java_available,
@@ -204,6 +730,9 @@ class PlantUMLConverter(BaseConverter):
             graphviz_version=graphviz_version
         )
         
+        with _DEPENDENCY_CACHE_LOCK:
+            _DEPENDENCY_CACHE[cache_key] = (time.monotonic(), self._dependency_status)
+        
         # 记录依赖状态
         self._log_dependency_status(self._dependency_status)
         
@@ -211,25 +740,9 @@ class PlantUMLConverter(BaseConverter):
     
     def _check_java_availability(self) -> tuple[bool, Optional[str]]:
         """检查Java是否可用"""
-        try:
-            result = subprocess.run(
-                ['java', '-version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                # Java版本信息通常在stderr中
-                version_output = result.stderr or result.stdout
-                version_match = re.search(r'version "([^"]+)"', version_output)
-                version = version_match.group(1) if version_match else "未知版本"
-                return True, version
-            else:
-                return False, None
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+        if find_command('java') is None:
             return False, None
+        return _probe_version(['java', '-version'], _JAVA_VERSION_RE)
     
     def _get_plantuml_jar_path(self) -> Optional[str]:
         """
@@ -248,6 +761,13 @@ class PlantUMLConverter(BaseConverter):
         if self._jar_path_cache:
             return self._jar_path_cache
         
+        env_path = os.environ.get('PLANTUML_JAR')
+        cache_key = (self.plantuml_config.plantuml_jar_path, env_path)
+        cached_path = _JAR_PATH_CACHE.get(cache_key)
+        if cached_path and os.path.isfile(cached_path):
+            self._jar_path_cache = cached_path
+            return cached_path
+        
         search_paths = []
         
         # 1. 配置文件指定路径
@@ -255,7 +775,6 @@ class PlantUMLConverter(BaseConverter):
             search_paths.append(self.plantuml_config.plantuml_jar_path)
         
         # 2. 环境变量
-        env_path = os.environ.get('PLANTUML_JAR')
         if env_path:
             search_paths.append(env_path)
         
@@ -263,70 +782,34 @@ class PlantUMLConverter(BaseConverter):
         search_paths.append(os.path.join(os.getcwd(), self.PLANTUML_JAR_NAME))
         
         # 4. 系统PATH中查找
-        system_jar = shutil.which('plantuml.jar')
+        system_jar = find_command('plantuml.jar')
         if system_jar:
             search_paths.append(system_jar)
         
         # 5. 用户主目录
-        home_path = os.path.join(os.path.expanduser('~'), '.plantuml', self.PLANTUML_JAR_NAME)
-        search_paths.append(home_path)
-        
         # 6. 项目目录下的tools文件夹
-        project_tools_path = os.path.join(os.path.dirname(__file__), '..', '..', 'tools', self.PLANTUML_JAR_NAME)
-        search_paths.append(os.path.abspath(project_tools_path))
+        search_paths.extend((_HOME_PLANTUML_JAR, _PROJECT_TOOLS_PLANTUML_JAR))
         
         # 查找JAR文件
-        for path in search_paths:
-            if os.path.isfile(path):
-                self._jar_path_cache = path
-                self.logger.info(f"找到PlantUML JAR: {path}")
-                return path
+        path = _find_first_file(search_paths)
+        if path:
+            self._jar_path_cache = path
+            _JAR_PATH_CACHE[cache_key] = path
+            self.logger.info(f"找到PlantUML JAR: {path}")
+            return path
         
         self.logger.warning(f"未找到PlantUML JAR包，搜索路径: {search_paths}")
         return None
     
     def _get_plantuml_version(self, jar_path: str) -> Optional[str]:
         """获取PlantUML版本信息"""
-        try:
-            result = subprocess.run(
-                ['java', '-jar', jar_path, '-version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout or result.stderr
-                # 提取版本号
-                version_match = re.search(r'PlantUML version ([\d\.]+)', output)
-                return version_match.group(1) if version_match else "未知版本"
-            
-        except Exception:
-            pass
-        
-        return None
+        return _probe_version(['java', '-jar', jar_path, '-version'], _PLANTUML_VERSION_RE)[1]
     
     def _check_graphviz_availability(self) -> tuple[bool, Optional[str]]:
         """检查Graphviz是否可用"""
-        try:
-            result = subprocess.run(
-                ['dot', '-V'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                # Graphviz版本信息通常在stderr中
-                version_output = result.stderr or result.stdout
-                version_match = re.search(r'dot - graphviz version ([\d\.]+)', version_output)
-                version = version_match.group(1) if version_match else "未知版本"
-                return True, version
-            else:
-                return False, None
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+        if find_command('dot') is None:
             return False, None
+        return _probe_version(['dot', '-V'], _GRAPHVIZ_VERSION_RE)
     
     def _execute_plantuml_command(self, input_file: str, output_file: str) -> bool:
         """
@@ -343,26 +826,26 @@ class PlantUMLConverter(BaseConverter):
             # 构建命令
             command = self._build_plantuml_command(input_file, output_file)
             
-            self.logger.debug(f"执行PlantUML命令: {' '.join(command)}")
+            # 逐文件调用的热路径：仅在DEBUG开启时才拼接命令行
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("执行PlantUML命令: %s", shlex.join(command))
             
-            # 执行命令
-            # 当使用shell=True时，需要将命令转换为字符串
-            command_str = ' '.join(command)
+            # 执行命令（列表形式直接传参，不经过shell，路径无需转义）
+            # 成功时输出无用，stdout直接丢弃；stderr保留原始字节，仅失败时解码末尾部分
             result = subprocess.run(
-                command_str,
-                capture_output=True,
-                text=True,
-                timeout=self.plantuml_config.timeout,
-                shell=True
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=self.plantuml_config.timeout
             )
             
             if result.returncode == 0:
                 return True
             else:
-                error_msg = self._parse_plantuml_error(result.stderr or result.stdout)
+                error_output = self._decode_error_tail(result.stderr)
+                error_msg = self._parse_plantuml_error(error_output)
                 self.logger.error(f"PlantUML转换失败 (返回码: {result.returncode}): {error_msg}")
-                self.logger.debug(f"标准输出: {result.stdout}")
-                self.logger.debug(f"标准错误: {result.stderr}")
+                self.logger.debug("标准错误: %s", error_output)
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -376,6 +859,34 @@ class PlantUMLConverter(BaseConverter):
         """
         构建PlantUML命令行参数
         
+        Returns:
+            List[str]: 命令行参数列表
+        """
+        command = self._build_plantuml_base_command()
+        
+        # 强制指定输出文件名，防止PlantUML使用@startuml后的标题作为文件名
+        # 获取期望的输出文件名（不含路径）
+        expected_filename = os.path.basename(output_file)
+        expected_basename = os.path.splitext(expected_filename)[0]
+        
+        # 使用-filename参数强制指定输出文件名
+        command.extend(['-filename', expected_basename])
+        
+        # 输出目录
+        command.extend(['-o', os.path.dirname(output_file)])
+        
+        # 输入文件
+        command.append(input_file)
+        
+        return command
+    
+    def _build_plantuml_base_command(self, long_lived: bool = False) -> List[str]:
+        """
+        构建PlantUML命令的公共部分（Java选项、JAR包、输出格式、编码、Graphviz路径）
+        
+        Args:
+            long_lived: 是否为常驻的 -pipe 进程，决定默认JVM调优参数
+            
         Returns:
             List[str]: 命令行参数列表
         """
@@ -387,13 +898,10 @@ class PlantUMLConverter(BaseConverter):
         else:
             # 默认Java选项
             command.extend(['-Xmx1024m', '-Djava.awt.headless=true'])
+            command.extend(self._jvm_tuning_options(long_lived))
         
-        # 添加JAR包 (使用引号包围路径以处理空格)
-        jar_path = self._dependency_status.plantuml_jar_path
-        if ' ' in jar_path:
-            command.extend(['-jar', f'"{jar_path}"'])
-        else:
-            command.extend(['-jar', jar_path])
+        # 添加JAR包
+        command.extend(['-jar', self._dependency_status.plantuml_jar_path])
         
         # 添加PlantUML选项
         command.extend([
@@ -401,32 +909,45 @@ class PlantUMLConverter(BaseConverter):
             f'-charset', self.plantuml_config.charset,  # 字符编码
         ])
         
+        # 同一文件/批次中的多张图由JVM内部多线程渲染
+        if self.plantuml_config.nbthread:
+            command.extend(['-nbthread', str(self.plantuml_config.nbthread)])
+        
+        # 不嵌入图源元数据，减小输出体积
+        if self.plantuml_config.nometadata:
+            command.append('-nometadata')
+        
         # 如果指定了Graphviz路径
         if self.plantuml_config.graphviz_dot_path:
             command.extend(['-graphvizdot', self.plantuml_config.graphviz_dot_path])
         
-        # 强制指定输出文件名，防止PlantUML使用@startuml后的标题作为文件名
-        # 获取期望的输出文件名（不含路径）
-        expected_filename = os.path.basename(output_file)
-        expected_basename = os.path.splitext(expected_filename)[0]
+        return command
+    
+    def _jvm_tuning_options(self, long_lived: bool) -> List[str]:
+        """
+        按运行方式返回默认JVM调优参数
         
-        # 使用-filename参数强制指定输出文件名
-        command.extend(['-filename', expected_basename])
+        一次性的命令行转换只运行几秒，只用C1编译器并使用串行GC以缩短预热；
+        常驻的 -pipe 进程运行时间长，保留完整JIT并使用吞吐量优先的ParallelGC
         
-        # 输出目录 (使用引号包围路径以处理空格)
-        output_dir = os.path.dirname(output_file)
-        if ' ' in output_dir:
-            command.extend(['-o', f'"{output_dir}"'])
-        else:
-            command.extend(['-o', output_dir])
+        Args:
+            long_lived: 是否为常驻进程
+            
+        Returns:
+            List[str]: JVM参数列表
+        """
+        if self.plantuml_config.jvm_profile == 'none':
+            return []
         
-        # 输入文件 (使用引号包围路径以处理空格)
-        if ' ' in input_file:
-            command.append(f'"{input_file}"')
+        if long_lived:
+            options = ['-XX:+UseParallelGC']
         else:
-            command.append(input_file)
+            options = ['-XX:TieredStopAtLevel=1', '-XX:+UseSerialGC']
         
-        return command
+        cds_archive = self.plantuml_config.cds_archive
+        if cds_archive and os.path.isfile(cds_archive):
+            options.append(f'-XX:SharedArchiveFile={cds_archive}')
+        return options
     
     def _verify_and_fix_output_filename(self, input_file: Path, expected_output_file: Path) -> Optional[Path]:
         """
@@ -447,7 +968,7 @@ class PlantUMLConverter(BaseConverter):
         
         # 如果期望的文件已经存在，直接返回
         if expected_output_file.exists():
-            self.logger.debug(f"输出文件名正确: {expected_output_file}")
+            self.logger.debug("输出文件名正确: %s", expected_output_file)
             return expected_output_file
         
         # 查找输出目录中所有PNG文件
@@ -504,38 +1025,37 @@ class PlantUMLConverter(BaseConverter):
         
         return None
     
-    def _preprocess_plantuml_file(self, file_path: str) -> str:
+    def _preprocess_plantuml_file(self, file_path: str, temp_dir: Optional[str] = None) -> str:
         """
         预处理PlantUML文件，添加中文字体支持
         
         Args:
             file_path: 原始PlantUML文件路径
+            temp_dir: 预处理文件的存放目录；指定时保留原文件名（批量转换依赖输出名与原文件一致）
             
         Returns:
             str: 预处理后的文件路径（如果不需要预处理则返回原路径）
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                raw = f.read()
             
-            # 检查是否已经包含字体配置
-            has_font_config = any(keyword in content for keyword in [
-                'skinparam defaultFontName', 
-                'skinparam defaultFontSize',
-                'skinparam sequence',
-                '!define FONTFAMILY'
-            ])
-            
-            # 检查是否包含中文
-            has_chinese = re.search(r'[\u4e00-\u9fff]', content)
+            # 纯ASCII文件不可能含中文，直接在bytes上判断，省去整文件解码
+            if raw.isascii():
+                return file_path
+            # 与文本模式读取保持一致：统一换行符
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             # 如果包含中文但没有字体配置，则添加中文字体支持
-            if has_chinese and not has_font_config:
-                self.logger.info(f"检测到中文内容，添加中文字体支持: {file_path}")
+            if self._needs_font_preprocessing(content):
+                self.logger.info("检测到中文内容，添加中文字体支持: %s", file_path)
                 
                 # 创建临时文件
-                temp_dir = tempfile.gettempdir()
-                temp_file = os.path.join(temp_dir, f"plantuml_preprocessed_{os.path.basename(file_path)}")
+                if temp_dir:
+                    temp_file = os.path.join(temp_dir, os.path.basename(file_path))
+                else:
+                    temp_file = os.path.join(tempfile.gettempdir(),
+                                             f"plantuml_preprocessed_{os.path.basename(file_path)}")
                 
                 # 构建预处理内容
                 preprocessed_content = self._build_preprocessed_content(content)
@@ -553,6 +1073,24 @@ class PlantUMLConverter(BaseConverter):
             self.logger.warning(f"预处理PlantUML文件失败，使用原文件: {e}")
             return file_path
     
+    def _needs_font_preprocessing(self, content: str) -> bool:
+        """内容包含中文且没有字体配置时需要添加中文字体支持"""
+        if content.isascii():
+            return False
+        
+        # 检查是否已经包含字体配置
+        has_font_config = any(keyword in content for keyword in [
+            'skinparam defaultFontName', 
+            'skinparam defaultFontSize',
+            'skinparam sequence',
+            '!define FONTFAMILY'
+        ])
+        
+        # 检查是否包含中文
+        has_chinese = re.search(r'[\u4e00-\u9fff]', content)
+        
+        return bool(has_chinese) and not has_font_config
+    
     def _build_preprocessed_content(self, original_content: str) -> str:
         """
         构建预处理后的PlantUML内容，添加中文字体支持
@@ -581,6 +1119,12 @@ skinparam defaultFontSize 12"""
         
         return '\n'.join(processed_lines)
     
+    def _decode_error_tail(self, error_bytes: Optional[bytes]) -> str:
+        """只解码错误输出的末尾部分，错误信息通常在最后，避免解码冗长的进度日志"""
+        if not error_bytes:
+            return ""
+        return error_bytes[-self.ERROR_TAIL_BYTES:].decode('utf-8', errors='replace')
+    
     def _parse_plantuml_error(self, error_output: str) -> str:
         """
         解析PlantUML错误输出，提供友好的错误信息
@@ -594,18 +1138,9 @@ skinparam defaultFontSize 12"""
         if not error_output:
             return "未知错误"
         
-        # 常见错误模式
-        error_patterns = {
-            r'Syntax error': '语法错误',
-            r'Cannot find Graphviz': 'Graphviz未安装或未找到',
-            r'OutOfMemoryError': '内存不足，请增加Java堆内存',
-            r'FileNotFoundException': '文件未找到',
-            r'AccessDeniedException': '文件访问权限不足',
-        }
-        
-        for pattern, friendly_msg in error_patterns.items():
-            if re.search(pattern, error_output, re.IGNORECASE):
-                return f"{friendly_msg}: {error_output.strip()}"
+        match = self._ERROR_RE.search(error_output)
+        if match:
+            return f"{self._ERROR_MESSAGES[match.lastgroup]}: {error_output.strip()}"
         
         return error_output.strip()
     
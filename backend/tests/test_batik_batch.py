@@ -0,0 +1,66 @@
+import os
+import subprocess
+
+import pytest
+
+from converters import batik_converter
+from converters.batik_converter import BatikConverter, BatikDependencyStatus
+
+
+def _fake_batch_run(timeout):
+    """模拟 Batik 批量命令：为每个输入写出同名PNG，超时时最后一个只写了一半"""
+    def run(command, **kwargs):
+        output_dir = command[command.index('-d') + 1]
+        for path in command[command.index('-d') + 2:]:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            with open(os.path.join(output_dir, stem + '.png'), 'wb') as f:
+                f.write(b'\x89PNG partial' if timeout else b'\x89PNG complete image')
+        if timeout:
+            raise subprocess.TimeoutExpired(command, kwargs.get('timeout'))
+        return subprocess.CompletedProcess(command, 0, '', '')
+    return run
+
+
+@pytest.fixture
+def converter(tmp_path, monkeypatch):
+    def check_dependencies(self, force_refresh=False):
+        self._dependency_status = BatikDependencyStatus(
+            java_available=True, java_version=None,
+            batik_jar_path='batik-all.jar', batik_lib_path='batik-lib')
+        return self._dependency_status
+
+    monkeypatch.setattr(BatikConverter, '_check_dependencies', check_dependencies)
+    monkeypatch.setattr(BatikConverter, '_find_native_renderer', lambda self: None)
+    monkeypatch.setattr(BatikConverter, '_build_batik_base_command', lambda self: ['java', '-jar', 'batik-all.jar'])
+    return BatikConverter(str(tmp_path / 'out'), cache_dir=str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def svg_files(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    files = []
+    for name in ('a', 'b', 'c'):
+        path = source / f'{name}.svg'
+        path.write_text(f'<svg xmlns="http://www.w3.org/2000/svg"><text>{name}</text></svg>')
+        files.append(str(path))
+    return files
+
+
+def test_timed_out_batch_discards_outputs(converter, svg_files, tmp_path, monkeypatch):
+    monkeypatch.setattr(batik_converter.subprocess, 'run', _fake_batch_run(timeout=True))
+
+    results = converter._convert_files_batch(svg_files, str(tmp_path / 'src'))
+
+    assert results == {}
+    assert not any(name.endswith('.png') for name in os.listdir(converter.output_dir))
+    assert not os.path.isdir(tmp_path / 'cache') or not os.listdir(tmp_path / 'cache')
+
+
+def test_successful_batch_caches_outputs(converter, svg_files, tmp_path, monkeypatch):
+    monkeypatch.setattr(batik_converter.subprocess, 'run', _fake_batch_run(timeout=False))
+
+    results = converter._convert_files_batch(svg_files, str(tmp_path / 'src'))
+
+    assert sorted(results) == sorted(svg_files)
+    assert len(os.listdir(tmp_path / 'cache')) == len(svg_files)
@@ -0,0 +1,41 @@
+import pytest
+
+from converters import office_to_md
+from converters.office_to_md import OfficeToMdConverter
+
+
+class _FakeFrame:
+    def to_markdown(self, index=False):
+        return "| a |\n|---|\n| 1 |"
+
+
+class _OldPandas:
+    """模拟 pandas < 2.2：不认识 calamine 引擎"""
+
+    def __init__(self):
+        self.engines = []
+
+    def read_excel(self, path, sheet_name=None, engine=None):
+        self.engines.append(engine)
+        if engine == 'calamine':
+            raise ValueError("Unknown engine: calamine")
+        return {"Sheet1": _FakeFrame()}
+
+
+@pytest.fixture
+def old_pandas(monkeypatch):
+    fake = _OldPandas()
+    monkeypatch.setattr(office_to_md, '_flags_resolved', True)
+    monkeypatch.setattr(office_to_md, 'pd', fake)
+    monkeypatch.setattr(office_to_md, 'tabulate', object())
+    monkeypatch.setattr(office_to_md, 'lib_available', lambda name, quiet=False: True)
+    return fake
+
+
+def test_unknown_calamine_engine_falls_back_to_default(tmp_path, old_pandas):
+    converter = OfficeToMdConverter(str(tmp_path))
+
+    text = converter._extract_text_from_excel(tmp_path / "book.xlsx")
+
+    assert old_pandas.engines == ['calamine', None]
+    assert text.startswith("## Sheet: Sheet1\n\n| a |")
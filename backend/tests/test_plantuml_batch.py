@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+import pytest
+
+from converters import plantuml_converter
+from converters.plantuml_converter import DependencyStatus, PlantUMLConverter
+
+
+def _fake_batch_run(returncode):
+    """模拟 PlantUML 批量命令：为每个输入写出同名PNG（与语法错误时照样写出错误图一致）"""
+    def run(command, **kwargs):
+        output_dir = command[command.index('-o') + 1]
+        for path in command[command.index('-o') + 2:]:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            with open(os.path.join(output_dir, stem + '.png'), 'wb') as f:
+                f.write(b'\x89PNG error image')
+        return subprocess.CompletedProcess(command, returncode, b'', b'Error line 2 in file: x.puml')
+    return run
+
+
+@pytest.fixture
+def converter(tmp_path, monkeypatch):
+    def check_dependencies(self, force_refresh=False):
+        self._dependency_status = DependencyStatus(
+            java_available=True, java_version=None, plantuml_jar_path='plantuml.jar',
+            plantuml_version=None, graphviz_available=False, graphviz_version=None)
+        return self._dependency_status
+
+    monkeypatch.setattr(PlantUMLConverter, '_check_dependencies', check_dependencies)
+    out_dir = tmp_path / 'out'
+    out_dir.mkdir()
+    return PlantUMLConverter(str(out_dir), incremental=False)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    src_dir = tmp_path / 'src'
+    src_dir.mkdir()
+    paths = []
+    for name in ('a', 'b'):
+        path = src_dir / f'{name}.puml'
+        path.write_text('@startuml\nA -> B\n@enduml\n', encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def test_failed_batch_outputs_are_not_harvested(converter, sources, monkeypatch):
+    monkeypatch.setattr(plantuml_converter.subprocess, 'run', _fake_batch_run(returncode=1))
+
+    assert converter._convert_files_batch(sources) == {}
+    assert not any(name.endswith('.png') for name in os.listdir(converter.output_dir))
+
+
+def test_successful_batch_outputs_are_harvested(converter, sources, monkeypatch):
+    monkeypatch.setattr(plantuml_converter.subprocess, 'run', _fake_batch_run(returncode=0))
+
+    results = converter._convert_files_batch(sources)
+
+    assert sorted(results) == sorted(sources)
+    assert all(os.path.isfile(path) for path in results.values())